@@ -0,0 +1,148 @@
+import csv
+import io
+import json
+import time
+from histogram import LogHistogram
+from persistence import atomic_write_text
+
+
+def _round(value):
+    return round(value, 2) if value is not None else None
+
+
+class _ProjectorAvailability:
+    """Rolling up/down aggregates for a single config key."""
+
+    __slots__ = ('state', 'since', 'paused', 'up_seconds', 'down_seconds', 'outage_seconds', 'outages', 'flaps',
+                 'time_to_recover')
+
+    def __init__(self):
+        self.state = None  # None (not seen yet), True (up) or False (down)
+        self.since = None
+        self.paused = False
+        self.up_seconds = 0.0
+        self.down_seconds = 0.0
+        self.outage_seconds = 0.0  # Down time of the current outage, pauses excluded
+        self.outages = 0
+        self.flaps = 0
+        self.time_to_recover = LogHistogram(min_value=0.1, max_value=7 * 86400.0)
+
+    def accrue(self, now):
+        """Adds the time since the last update to the current state, unless paused."""
+        if self.state is not None and not self.paused:
+            elapsed = now - self.since
+            if self.state:
+                self.up_seconds += elapsed
+            else:
+                self.down_seconds += elapsed
+                self.outage_seconds += elapsed
+        self.since = now
+
+
+class AvailabilityLedger:
+    """
+    Records up/down transitions of each configured projector and keeps compact aggregates.
+
+    Per key it keeps uptime, outage and flap counts, and a fixed-size histogram of
+    time-to-recover, so memory stays bounded however long the launcher runs.
+    A flap is a projector going down again after it had recovered. A paused key (its
+    projector is left closed on purpose, e.g. because its monitor is off) counts as
+    neither up nor down until it is marked again.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._keys = {}
+
+    def _stats(self, key):
+        stats = self._keys.get(key)
+        if stats is None:
+            stats = self._keys[key] = _ProjectorAvailability()
+        return stats
+
+    def mark(self, key, is_up, now=None):
+        """Records the current state of `key`; only transitions change the counters."""
+        now = self._clock() if now is None else now
+        stats = self._stats(key)
+        stats.accrue(now)
+        stats.paused = False
+        if stats.state is is_up:
+            return
+
+        if stats.state is False:
+            stats.time_to_recover.record(stats.outage_seconds)
+        if not is_up:
+            stats.outages += 1
+            stats.outage_seconds = 0.0
+            if stats.state is True and stats.outages > 1:
+                stats.flaps += 1
+        stats.state = is_up
+
+    def pause(self, key, now=None):
+        """Stops counting time for `key` until the next mark(); an ongoing outage carries on after it."""
+        now = self._clock() if now is None else now
+        stats = self._stats(key)
+        stats.accrue(now)
+        stats.paused = True
+
+    def observe(self, found, missing, paused=(), now=None):
+        """Records the result of a missing-projector check. `paused` keys were skipped on purpose."""
+        now = self._clock() if now is None else now
+        for key in found:
+            self.mark(key, True, now)
+        for key in missing:
+            self.mark(key, False, now)
+        for key in paused:
+            self.pause(key, now)
+
+    def summary(self, now=None):
+        """Returns one row of aggregates per key."""
+        now = self._clock() if now is None else now
+        rows = []
+        for key, stats in sorted(self._keys.items()):
+            up, down = stats.up_seconds, stats.down_seconds
+            if stats.state is True and not stats.paused:
+                up += now - stats.since
+            elif stats.state is False and not stats.paused:
+                down += now - stats.since
+            observed = up + down
+            ttr = stats.time_to_recover
+            rows.append({
+                'key': key,
+                'state': 'paused' if stats.paused else 'up' if stats.state else 'down',
+                'uptime_pct': round(100.0 * up / observed, 3) if observed else None,
+                'downtime_s': round(down, 1),
+                'outages': stats.outages,
+                'flaps': stats.flaps,
+                'ttr_p50_s': _round(ttr.percentile(50)),
+                'ttr_p95_s': _round(ttr.percentile(95)),
+                'ttr_p99_s': _round(ttr.percentile(99)),
+                'ttr_max_s': _round(ttr.max),
+            })
+        return rows
+
+    def export_json(self, path, now=None):
+        atomic_write_text(path, json.dumps(self.summary(now), indent=4))
+
+    def export_csv(self, path, now=None):
+        rows = self.summary(now)
+        buffer = io.StringIO()
+        if rows:
+            writer = csv.DictWriter(buffer, fieldnames=list(rows[0].keys()), lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(rows)
+        atomic_write_text(path, buffer.getvalue())
+
+    def print_summary(self, titles=None, now=None):
+        rows = self.summary(now)
+        if not rows:
+            return
+        print("\n📈 Projector availability:")
+        for row in rows:
+            name = (titles or {}).get(row['key'], row['key'])
+            uptime = f"{row['uptime_pct']:.2f}%" if row['uptime_pct'] is not None else "n/a"
+            line = f"  → {name}: {uptime} up, {row['outages']} outages, {row['flaps']} flaps"
+            if row['ttr_p50_s'] is not None:
+                line += (f", time-to-recover p50 {row['ttr_p50_s']:.1f}s / p95 {row['ttr_p95_s']:.1f}s"
+                         f" / p99 {row['ttr_p99_s']:.1f}s")
+            print(line)
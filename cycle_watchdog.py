@@ -0,0 +1,171 @@
+import queue
+import threading
+import time
+
+
+class CycleAbandoned(BaseException):
+    """
+    Raised inside a cycle the watchdog has given up on, at its next phase() call, so it
+    unwinds instead of carrying on next to its replacement. A BaseException, so the cycle's
+    own `except Exception` handlers don't swallow it.
+    """
+
+
+class _Job:
+    __slots__ = ('func', 'args', 'done', 'result', 'error')
+
+    def __init__(self, func, args):
+        self.func = func
+        self.args = args
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class CycleWatchdog:
+    """
+    Runs each monitor cycle on a worker thread and makes sure it keeps moving.
+
+    The cycle reports where it is with phase(name); each call is also a heartbeat. If the
+    current phase runs longer than its budget (`budgets[name]`, else `default_budget`), or
+    the whole cycle runs longer than `cycle_budget`, run() stops waiting: it records the
+    stall, calls `on_stall(phase)` so the caller can rebuild what that phase was using,
+    and leaves the stuck worker behind (a thread can't be killed). The next run() starts
+    a new worker; the old one gets CycleAbandoned as soon as it reaches another phase.
+    The worker is kept between cycles, so per-thread connections (WMI) are reused;
+    `initializer` runs once at the start of every worker (COM initialization).
+
+    A phase that stalled is backed off: for `backoff` seconds, doubling with every further
+    stall up to `max_backoff`, attempt() returns False for it and the cycle does without it,
+    so a call that hangs for good costs one abandoned thread per back-off period instead of
+    one per cycle. A cycle that gets through the phase again clears its back-off.
+    """
+
+    def __init__(self, budgets=None, default_budget=20.0, cycle_budget=180.0, on_stall=None,
+                 initializer=None, poll_interval=0.25, backoff=60.0, max_backoff=900.0, clock=time.monotonic):
+        self.budgets = budgets or {}
+        self.default_budget = default_budget
+        self.cycle_budget = cycle_budget
+        self.on_stall = on_stall
+        self.initializer = initializer
+        self.poll_interval = poll_interval
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.stalls = {}  # phase -> count
+        self.last_stall = None  # (phase, seconds)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._generation = 0
+        self._jobs = None
+        self._phase = None
+        self._phase_started = None
+        self._entered = set()  # Phases the running cycle has reached
+        self._backed_off = {}  # phase -> (retry at, consecutive stalls)
+
+    def phase(self, name):
+        """Marks the start of phase `name` of the running cycle. A no-op outside a watched cycle."""
+        generation = getattr(self._local, 'generation', None)
+        if generation is None:
+            return
+        if generation != self._generation:
+            raise CycleAbandoned(f"cycle abandoned by the watchdog (reached '{name}')")
+        with self._lock:
+            self._phase, self._phase_started = name, self.clock()
+            self._entered.add(name)
+
+    def attempt(self, name):
+        """
+        Like phase(), but returns False without entering `name` while that phase is backed off
+        after a stall; the caller then does without it (cached data, or skips the work).
+        """
+        with self._lock:
+            backed_off = self._backed_off.get(name)
+        if backed_off is not None and self.clock() < backed_off[0]:
+            return False
+        self.phase(name)
+        return True
+
+    def current_phase(self):
+        with self._lock:
+            return self._phase
+
+    def _work(self, generation, jobs):
+        self._local.generation = generation
+        if self.initializer:
+            self.initializer()
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            try:
+                job.result = job.func(*job.args)
+            except BaseException as e:
+                job.error = e
+            job.done.set()
+
+    def _start_worker(self):
+        self._generation += 1
+        self._jobs = queue.Queue()
+        threading.Thread(target=self._work, args=(self._generation, self._jobs),
+                         name=f"monitor cycle {self._generation}", daemon=True).start()
+
+    def run(self, func, *args):
+        """
+        Runs func(*args) on the worker. Returns (True, result), or (False, None) if the
+        cycle stalled and was abandoned. Exceptions raised by `func` are re-raised here.
+        """
+        if self._jobs is None:
+            self._start_worker()
+        job = _Job(func, args)
+        started = self.clock()
+        with self._lock:
+            self._phase, self._phase_started = "start", started
+            self._entered = set()
+        self._jobs.put(job)
+        while not job.done.wait(self.poll_interval):
+            now = self.clock()
+            with self._lock:
+                phase, phase_elapsed = self._phase, now - self._phase_started
+            budget = self.budgets.get(phase, self.default_budget)
+            if phase_elapsed > budget:
+                self._abandon(phase, phase_elapsed, f"phase budget {budget:g}s")
+                return False, None
+            if now - started > self.cycle_budget:
+                self._abandon(phase, now - started, f"cycle budget {self.cycle_budget:g}s")
+                return False, None
+        with self._lock:
+            for phase in self._entered:
+                self._backed_off.pop(phase, None)
+        if job.error is not None:
+            raise job.error
+        return True, job.result
+
+    def _abandon(self, phase, elapsed, budget):
+        self.stalls[phase] = self.stalls.get(phase, 0) + 1
+        self.last_stall = (phase, elapsed)
+        with self._lock:
+            consecutive = self._backed_off.get(phase, (None, 0))[1] + 1
+            delay = min(self.backoff * 2 ** (consecutive - 1), self.max_backoff)
+            self._backed_off[phase] = (self.clock() + delay, consecutive)
+        print(f"\n🐶 Watchdog: monitor cycle stuck in '{phase}' for {elapsed:.1f}s ({budget}) - "
+              f"abandoning it and restarting; '{phase}' is skipped for the next {delay:g}s.")
+        jobs, self._jobs = self._jobs, None
+        self._generation += 1  # The stuck worker is now stale, whatever it does next
+        jobs.put(None)
+        if self.on_stall:
+            try:
+                self.on_stall(phase)
+            except Exception as e:
+                print(f"  ⚠️ Watchdog recovery for '{phase}' failed: {e}")
+
+    def stop(self):
+        """Lets the current worker exit once it is idle."""
+        if self._jobs is not None:
+            self._jobs.put(None)
+            self._jobs = None
+
+    def print_summary(self):
+        if self.stalls:
+            stalls = ", ".join(f"{phase} x{count}" for phase, count in sorted(self.stalls.items()))
+            print(f"\n🐶 Watchdog recoveries: {stalls}")
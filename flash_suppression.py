@@ -0,0 +1,144 @@
+import ctypes
+from ctypes import wintypes
+
+# FlashWindowEx setup
+FLASHW_STOP = 0
+FLASHW_CAPTION = 1
+FLASHW_TRAY = 2
+FLASHW_ALL = 3
+
+# Window style / z-order constants (mirrors win32con, kept local so the
+# batching logic can be exercised without pywin32)
+GWL_EXSTYLE = -20
+WS_EX_TOOLWINDOW = 0x00000080
+WS_EX_APPWINDOW = 0x00040000
+HWND_TOP = 0
+HWND_BOTTOM = 1
+SWP_NOSIZE = 0x0001
+SWP_NOMOVE = 0x0002
+SWP_NOACTIVATE = 0x0010
+SWP_SHOWWINDOW = 0x0040
+
+Z_ORDER_FLAGS = SWP_NOMOVE | SWP_NOSIZE | SWP_NOACTIVATE
+
+
+class FLASHWINFO(ctypes.Structure):
+    _fields_ = [
+        ("cbSize", wintypes.UINT),
+        ("hwnd",   wintypes.HWND),
+        ("dwFlags", wintypes.DWORD),
+        ("uCount", wintypes.UINT),
+        ("dwTimeout", wintypes.DWORD),
+    ]
+
+
+class Win32WindowBackend:
+    """The user32 calls needed for flash suppression."""
+
+    def __init__(self):
+        user32 = ctypes.WinDLL("user32", use_last_error=True)
+        user32.IsWindow.argtypes = [wintypes.HWND]
+        user32.IsWindow.restype = wintypes.BOOL
+        user32.FlashWindowEx.argtypes = [ctypes.POINTER(FLASHWINFO)]
+        user32.FlashWindow.argtypes = [wintypes.HWND, wintypes.BOOL]
+        user32.GetWindowLongW.argtypes = [wintypes.HWND, ctypes.c_int]
+        user32.GetWindowLongW.restype = wintypes.LONG
+        user32.SetWindowLongW.argtypes = [wintypes.HWND, ctypes.c_int, wintypes.LONG]
+        user32.SetWindowLongW.restype = wintypes.LONG
+        user32.SetWindowPos.argtypes = [wintypes.HWND, wintypes.HWND, ctypes.c_int, ctypes.c_int,
+                                        ctypes.c_int, ctypes.c_int, wintypes.UINT]
+        user32.BeginDeferWindowPos.argtypes = [ctypes.c_int]
+        user32.BeginDeferWindowPos.restype = wintypes.HANDLE
+        user32.DeferWindowPos.argtypes = [wintypes.HANDLE, wintypes.HWND, wintypes.HWND, ctypes.c_int,
+                                          ctypes.c_int, ctypes.c_int, ctypes.c_int, wintypes.UINT]
+        user32.DeferWindowPos.restype = wintypes.HANDLE
+        user32.EndDeferWindowPos.argtypes = [wintypes.HANDLE]
+        user32.EndDeferWindowPos.restype = wintypes.BOOL
+        self.user32 = user32
+
+    def is_window(self, hwnd):
+        return bool(self.user32.IsWindow(hwnd))
+
+    def stop_flash(self, hwnd):
+        fwi = FLASHWINFO(ctypes.sizeof(FLASHWINFO), hwnd, FLASHW_STOP, 0, 0)
+        self.user32.FlashWindowEx(ctypes.byref(fwi))
+        self.user32.FlashWindow(hwnd, False)
+
+    def hide_from_taskbar(self, hwnd):
+        ex_style = self.user32.GetWindowLongW(hwnd, GWL_EXSTYLE)
+        new_ex = (ex_style & ~WS_EX_APPWINDOW) | WS_EX_TOOLWINDOW
+        if new_ex != ex_style:
+            self.user32.SetWindowLongW(hwnd, GWL_EXSTYLE, new_ex)
+
+    def set_z_order(self, hwnds, insert_after, flags):
+        """Applies the same z-order change to every window in a single DeferWindowPos batch."""
+        hdwp = self.user32.BeginDeferWindowPos(len(hwnds))
+        for hwnd in hwnds:
+            if hdwp:
+                hdwp = self.user32.DeferWindowPos(hdwp, hwnd, insert_after, 0, 0, 0, 0, flags)
+        if hdwp and self.user32.EndDeferWindowPos(hdwp):
+            return
+        # The batch fails as a whole if any window is gone; fall back to one call per window.
+        for hwnd in hwnds:
+            self.user32.SetWindowPos(hwnd, insert_after, 0, 0, 0, 0, flags)
+
+
+class FlashSuppressor:
+    """
+    Collects newly seen projector windows and suppresses their taskbar flash in one deferred batch.
+
+    `queue()` is cheap and can be called from the open path for every window it finds;
+    `flush()` then applies the style and z-order changes to all pending windows at once.
+    Windows that have already been handled are remembered and never processed twice.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else Win32WindowBackend()
+        self._pending = []
+        self._handled = set()
+
+    def queue(self, hwnd):
+        """Marks a window for suppression. Returns False if it is already handled or pending."""
+        if hwnd in self._handled or hwnd in self._pending:
+            return False
+        self._pending.append(hwnd)
+        return True
+
+    def mark_handled(self, hwnd):
+        """Records a window as already suppressed (e.g. by a previous launcher instance)."""
+        self._handled.add(hwnd)
+
+    def flush(self):
+        """Applies flash suppression to all pending windows. Returns the list of processed handles."""
+        backend = self.backend
+        # Forget handles of closed windows so a recycled hwnd is treated as new.
+        self._handled = {hwnd for hwnd in self._handled if backend.is_window(hwnd)}
+
+        hwnds = [hwnd for hwnd in self._pending if backend.is_window(hwnd)]
+        self._pending = []
+        if not hwnds:
+            return []
+
+        try:
+            # 1. Stop flashing and drop the windows from the taskbar
+            for hwnd in hwnds:
+                backend.stop_flash(hwnd)
+                try:
+                    backend.hide_from_taskbar(hwnd)
+                except Exception:
+                    pass  # Sometimes this fails, continue anyway
+
+            # 2. Re-order without activation so the shell doesn't treat them as attention requests
+            backend.set_z_order(hwnds, HWND_BOTTOM, Z_ORDER_FLAGS)
+            backend.set_z_order(hwnds, HWND_TOP, Z_ORDER_FLAGS | SWP_SHOWWINDOW)
+
+            # 3. Final flash suppression
+            for hwnd in hwnds:
+                backend.stop_flash(hwnd)
+
+            print(f"  🔇 Flash suppression applied to {len(hwnds)} window(s): {hwnds}")
+        except Exception as e:
+            print(f"  ⚠️ Flash suppression partially failed for {hwnds}: {e}")
+
+        self._handled.update(hwnds)
+        return hwnds
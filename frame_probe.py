@@ -0,0 +1,197 @@
+import base64
+import struct
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:  # The probe is optional; without NumPy it stays off
+    np = None
+
+PROGRAM = None  # Source key of the program output (the current program scene)
+
+OK = 'ok'
+BLACK = 'black'
+FROZEN = 'frozen'
+UNAVAILABLE = 'unavailable'
+
+MIN_INTERVAL = 5  # Seconds; caps the sample rate whatever the configuration says
+THUMBNAIL_SIZE = (32, 18)
+BLACK_MEAN = 10.0      # Mean luminance (0-255) below which a frame counts as black...
+BLACK_SPREAD = 4.0     # ...if it is also this uniform (standard deviation)
+FROZEN_DIFF = 0.5      # Mean absolute luminance change below which two samples are "the same frame"
+
+
+def decode_bmp(data):
+    """Decodes an uncompressed 24/32-bit BMP into a float32 luminance array (rows x columns)."""
+    if data[:2] != b'BM':
+        raise ValueError("not a BMP image")
+    offset = struct.unpack_from('<I', data, 10)[0]
+    width, height, _, bits, compression = struct.unpack_from('<iiHHI', data, 18)
+    if bits not in (24, 32) or compression not in (0, 3):
+        raise ValueError(f"unsupported BMP format ({bits} bpp, compression {compression})")
+    channels = bits // 8
+    rows = abs(height)
+    stride = (width * bits + 31) // 32 * 4
+    pixels = np.frombuffer(data, np.uint8, count=stride * rows, offset=offset).reshape(rows, stride)
+    pixels = pixels[:, :width * channels].reshape(rows, width, channels).astype(np.float32)
+    if height > 0:  # Bottom-up rows
+        pixels = pixels[::-1]
+    return pixels[..., 0] * 0.114 + pixels[..., 1] * 0.587 + pixels[..., 2] * 0.299
+
+
+def average_hash(luminance, size=8):
+    """64-bit average hash: the image averaged down to 8x8, one bit per cell brighter than the mean."""
+    rows, columns = luminance.shape
+    row_edges = np.linspace(0, rows, size + 1).astype(int)[:-1]
+    column_edges = np.linspace(0, columns, size + 1).astype(int)[:-1]
+    cells = np.add.reduceat(np.add.reduceat(luminance, row_edges, axis=0), column_edges, axis=1)
+    bits = (cells > cells.mean()).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+class _SourceState:
+    __slots__ = ('state', 'hash', 'luminance', 'unchanged_since')
+
+    def __init__(self):
+        self.state = OK
+        self.hash = None
+        self.luminance = None
+        self.unchanged_since = None
+
+
+class FrameProbe:
+    """
+    Checks that projected sources are actually moving, on its own thread and connection.
+
+    Every `interval` seconds, one RequestBatch asks OBS for a tiny BMP screenshot of each
+    source (the program output is resolved to the current program scene inside the batch).
+    A frame that is dark and uniform is reported as black; a source whose thumbnails stay
+    identical (same average hash, almost no pixel change) for `frozen_after` seconds is
+    reported as frozen. State changes are printed; status() gives the current state.
+    `gate`, if given, is asked before every sample and can skip it (load governor).
+    Note that a scene that legitimately shows a still image also reads as frozen.
+    """
+
+    def __init__(self, session_factory, sources, interval=30, frozen_after=120,
+                 thumbnail_size=THUMBNAIL_SIZE, gate=None, clock=time.monotonic):
+        self.session_factory = session_factory
+        self.sources = list(dict.fromkeys(sources))
+        self.interval = max(interval, MIN_INTERVAL)
+        self.frozen_after = frozen_after
+        self.thumbnail_size = thumbnail_size
+        self.gate = gate
+        self.clock = clock
+        self.session = None
+        self._states = {source: _SourceState() for source in self.sources}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Starts probing in the background. Returns False if NumPy isn't installed."""
+        if np is None:
+            print("ℹ️ Frame liveness probe disabled: numpy is not installed.")
+            return False
+        if self._thread and self._thread.is_alive():
+            return True
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="frame probe", daemon=True)
+        self._thread.start()
+        print(f"🎞️ Frame liveness probe started ({len(self.sources)} sources every {self.interval:g}s)")
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        if self.session:
+            self.session.close()
+
+    def status(self):
+        """Returns {source: state}; the program output is under PROGRAM."""
+        with self._lock:
+            return {source: state.state for source, state in self._states.items()}
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if self.gate and not self.gate():
+                continue
+            try:
+                self.sample_once()
+            except Exception as e:
+                print(f"  ⚠️ Frame probe sample failed: {e}")
+                if self.session:
+                    self.session.close()
+
+    def _build_batch(self):
+        width, height = self.thumbnail_size
+        screenshot = {"imageFormat": "bmp", "imageWidth": width, "imageHeight": height}
+        requests = []
+        if PROGRAM in self.sources:
+            requests.append({"requestType": "GetCurrentProgramScene",
+                             "outputVariables": {"programScene": "currentProgramSceneName"}})
+        for source in self.sources:
+            request = {"requestType": "GetSourceScreenshot", "requestData": dict(screenshot)}
+            if source is PROGRAM:
+                request["inputVariables"] = {"sourceName": "programScene"}
+            else:
+                request["requestData"]["sourceName"] = source
+            requests.append(request)
+        return requests
+
+    def sample_once(self):
+        """Takes one sample of every source and updates their states. Returns status()."""
+        if self.session is None:
+            self.session = self.session_factory()
+        results = self.session.call_batch(self._build_batch())
+        screenshots = [result for result in results if result.get("requestType") == "GetSourceScreenshot"]
+        now = self.clock()
+        for source, result in zip(self.sources, screenshots):
+            luminance = None
+            if result["requestStatus"]["result"]:
+                image = result["responseData"]["imageData"]
+                try:
+                    luminance = decode_bmp(base64.b64decode(image.split(",", 1)[-1]))
+                except ValueError as e:
+                    print(f"  ⚠️ Frame probe could not decode {self._name(source)}: {e}")
+            self._update(source, luminance, now)
+        return self.status()
+
+    def _update(self, source, luminance, now):
+        with self._lock:
+            state = self._states[source]
+            previous = state.state
+            if luminance is None:
+                state.state, state.hash, state.luminance, state.unchanged_since = UNAVAILABLE, None, None, None
+            else:
+                frame_hash = average_hash(luminance)
+                same = (state.luminance is not None and frame_hash == state.hash
+                        and state.luminance.shape == luminance.shape
+                        and float(np.abs(luminance - state.luminance).mean()) < FROZEN_DIFF)
+                if not same:
+                    state.unchanged_since = now
+                state.hash, state.luminance = frame_hash, luminance
+                if float(luminance.mean()) < BLACK_MEAN and float(luminance.std()) < BLACK_SPREAD:
+                    state.state = BLACK
+                elif now - state.unchanged_since >= self.frozen_after:
+                    state.state = FROZEN
+                else:
+                    state.state = OK
+            current = state.state
+        if current != previous:
+            self._report(source, previous, current)
+
+    def _name(self, source):
+        return "Program output" if source is PROGRAM else f"'{source}'"
+
+    def _report(self, source, previous, current):
+        name = self._name(source)
+        if current == BLACK:
+            print(f"\n⬛ Frame probe: {name} is showing a black frame.")
+        elif current == FROZEN:
+            print(f"\n🧊 Frame probe: {name} hasn't changed for {self.frozen_after:g}s - output may be frozen.")
+        elif current == UNAVAILABLE:
+            print(f"\n⚠️ Frame probe: no screenshot of {name} (source missing?).")
+        elif previous != OK:
+            print(f"\n✅ Frame probe: {name} is live again.")
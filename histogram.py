@@ -0,0 +1,73 @@
+import math
+
+
+class LogHistogram:
+    """
+    Fixed-size histogram with logarithmically spaced buckets.
+
+    Memory use is constant no matter how many values are recorded, so it can run
+    for weeks. Percentiles are accurate to the bucket width (~26% with the default
+    10 buckets per decade), which is plenty for latency and recovery-time reporting.
+    """
+
+    def __init__(self, min_value=0.001, max_value=86400.0, buckets_per_decade=10):
+        self.min_value = min_value
+        self.max_value = max_value
+        self.buckets_per_decade = buckets_per_decade
+        self._bucket_count = int(math.ceil(math.log10(max_value / min_value) * buckets_per_decade))
+        # [underflow, bucket 1..n, overflow]
+        self._counts = [0] * (self._bucket_count + 2)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        if value < self.min_value:
+            return 0
+        if value >= self.max_value:
+            return self._bucket_count + 1
+        return 1 + int(math.log10(value / self.min_value) * self.buckets_per_decade)
+
+    def _bucket_value(self, index):
+        if index == 0:
+            return self.min_value
+        if index == self._bucket_count + 1:
+            return self.max
+        # Geometric midpoint of the bucket
+        return self.min_value * 10 ** ((index - 0.5) / self.buckets_per_decade)
+
+    def record(self, value):
+        self._counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, p):
+        """Returns the approximate p-th percentile (0-100), or None if nothing was recorded."""
+        if not self.count:
+            return None
+        target = max(1, int(math.ceil(p / 100.0 * self.count)))
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            seen += bucket_count
+            if seen >= target:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean': self.mean(),
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+        }
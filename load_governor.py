@@ -0,0 +1,156 @@
+import time
+
+import psutil
+
+# OBS counts as under pressure when any of these is exceeded between two samples
+OBS_CPU_THRESHOLD = 85.0       # cpuUsage, percent
+SKIPPED_FRAMES_THRESHOLD = 0.005  # render or output frames skipped, fraction of frames in the interval
+FPS_DROP_THRESHOLD = 0.9       # activeFps below this fraction of the best rate seen
+
+# While throttled, a deferrable check only runs every N cycles. Checks not listed here
+# (OBS exited, projector windows missing) always run.
+DEFAULT_STRIDES = {
+    'monitor_power': 6,      # WMI query for monitor power states
+    'obs_monitor_list': 6,   # GetMonitorList
+    'frame_probe': 0,        # Screenshot sampling: paused entirely
+}
+
+# Priority the launcher drops to while OBS is under pressure (a nice value off Windows)
+LOWERED_PRIORITY = getattr(psutil, 'BELOW_NORMAL_PRIORITY_CLASS', 10)
+
+
+class LoadGovernor:
+    """
+    Decides how much work the supervisor may do, based on OBS's GetStats and its own CPU use.
+
+    OBS is under pressure when it uses a lot of CPU, skips render or output frames, or runs
+    below its usual frame rate. The supervisor is over budget when a check cost more than
+    `cycle_budget` seconds of its own CPU time. In either case the governor is throttled:
+    deferrable checks (see DEFAULT_STRIDES) are thinned out and, under OBS pressure, the
+    launcher's priority is lowered. Either condition only clears after `calm_samples` calm
+    samples or cycles in a row, so the checks don't flip on and off. Every change of
+    decision is printed.
+    """
+
+    def __init__(self, cycle_budget=0.05, strides=None, calm_samples=3, process=None, cpu_clock=time.process_time):
+        self.cycle_budget = cycle_budget
+        self.strides = DEFAULT_STRIDES if strides is None else strides
+        self.calm_samples = calm_samples
+        self.process = process
+        self.cpu_clock = cpu_clock
+        self.under_pressure = False
+        self.over_budget = False
+        self.last_cycle_cost = None
+        self.peak_fps = 0.0
+        self._previous = None
+        self._calm = 0
+        self._within_budget = 0
+        self._cycle_started = None
+        self._since_run = {}
+        self._original_priority = None
+
+    @property
+    def throttled(self):
+        return self.under_pressure or self.over_budget
+
+    # --- Per-cycle cost ---
+
+    def begin_cycle(self):
+        self._cycle_started = self.cpu_clock()
+
+    def end_cycle(self):
+        """Records the CPU time the supervisor spent since begin_cycle() and updates the budget state."""
+        if self._cycle_started is None:
+            return
+        self.last_cycle_cost = self.cpu_clock() - self._cycle_started
+        self._cycle_started = None
+        if self.last_cycle_cost > self.cycle_budget:
+            self._within_budget = 0
+            if not self.over_budget:
+                self.over_budget = True
+                print(f"  ⏱️ Governor: check took {self.last_cycle_cost * 1000:.0f} ms CPU "
+                      f"(budget {self.cycle_budget * 1000:.0f} ms) - thinning expensive checks.")
+        elif self.over_budget:
+            self._within_budget += 1
+            if self._within_budget >= self.calm_samples:
+                self.over_budget = False
+                print("  ⏱️ Governor: checks are back within budget.")
+
+    # --- OBS load ---
+
+    def observe_stats(self, stats):
+        """Feeds one GetStats response. Returns the reasons OBS is under pressure (empty when calm)."""
+        reasons = []
+        cpu = stats.get('cpuUsage', 0.0)
+        if cpu >= OBS_CPU_THRESHOLD:
+            reasons.append(f"OBS CPU {cpu:.0f}%")
+        fps = stats.get('activeFps', 0.0)
+        self.peak_fps = max(self.peak_fps, fps)
+        if self.peak_fps and fps < self.peak_fps * FPS_DROP_THRESHOLD:
+            reasons.append(f"{fps:.1f} fps (usually {self.peak_fps:.1f})")
+        previous = self._previous
+        if previous:
+            for kind in ('render', 'output'):
+                total = stats.get(f'{kind}TotalFrames', 0) - previous.get(f'{kind}TotalFrames', 0)
+                skipped = stats.get(f'{kind}SkippedFrames', 0) - previous.get(f'{kind}SkippedFrames', 0)
+                # Counters restart when OBS stops/starts an output
+                if total > 0 and skipped >= 0 and skipped / total >= SKIPPED_FRAMES_THRESHOLD:
+                    reasons.append(f"{kind} skipped {100.0 * skipped / total:.1f}% of frames")
+        self._previous = stats
+
+        if reasons:
+            self._calm = 0
+            if not self.under_pressure:
+                self.under_pressure = True
+                print(f"  🐌 Governor: OBS is under pressure ({', '.join(reasons)}) - deferring "
+                      f"{', '.join(sorted(self.strides))} checks and lowering launcher priority.")
+                self._lower_priority()
+        elif self.under_pressure:
+            self._calm += 1
+            if self._calm >= self.calm_samples:
+                self.under_pressure = False
+                print("  🏁 Governor: OBS load is back to normal - all checks resumed, priority restored.")
+                self._restore_priority()
+        return reasons
+
+    # --- Decisions ---
+
+    def allow(self, check):
+        """
+        Returns True if the deferrable `check` should run this cycle. Unthrottled, always;
+        throttled, once every `strides[check]` calls (never if the stride is 0).
+        """
+        if check not in self.strides or not self.throttled:
+            self._since_run[check] = 0
+            return True
+        stride = self.strides[check]
+        if not stride:
+            return False
+        since_run = self._since_run.get(check, 0) + 1
+        if since_run >= stride:
+            self._since_run[check] = 0
+            return True
+        self._since_run[check] = since_run
+        return False
+
+    def _lower_priority(self):
+        try:
+            process = self.process or psutil.Process()
+            if self._original_priority is None:
+                self._original_priority = process.nice()
+            process.nice(LOWERED_PRIORITY)
+        except (psutil.Error, OSError) as e:
+            print(f"  ⚠️ Governor: could not lower launcher priority: {e}")
+
+    def _restore_priority(self):
+        if self._original_priority is None:
+            return
+        try:
+            (self.process or psutil.Process()).nice(self._original_priority)
+        except (psutil.Error, OSError) as e:
+            print(f"  ⚠️ Governor: could not restore launcher priority: {e}")
+        self._original_priority = None
+
+    def restore(self):
+        """Puts the launcher's priority back (on shutdown)."""
+        self._restore_priority()
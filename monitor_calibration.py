@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Monitor calibration for config.json.
+
+Fetches OBS's monitor list and the Windows monitor topology in one pass, matches them up
+(by geometry, then by position) and prints which OBS monitor index is which screen, with
+its PnP ID and the projectors configured on it. Nothing is interactive:
+
+    python monitor_calibration.py                        # show the monitor table
+    python monitor_calibration.py --flash                # also flash an identify projector on every screen
+    python monitor_calibration.py --write                # re-sync config.json with the current layout
+    python monitor_calibration.py --assign 3=1 --assign "5=2:TV Sala" --write
+
+--write records each projector's monitor PnP ID, and on later runs moves the coordinates
+of projectors whose monitor now sits somewhere else. --assign KEY=INDEX[:SOURCE] puts
+projector KEY on OBS monitor INDEX; SOURCE ("program" or a scene name) is required when
+KEY is new.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import win32con
+import win32gui
+
+from monitor_utils import get_all_monitor_details
+from persistence import atomic_write_json
+from obsStart import get_config_path, get_obs_projector_windows, is_obs_running, open_obs_connection, REQUEST_METRICS
+from ws_requests import RequestSession
+
+
+def _obs_rect(monitor):
+    x, y = monitor['monitorPositionX'], monitor['monitorPositionY']
+    return (x, y, x + monitor['monitorWidth'], y + monitor['monitorHeight'])
+
+
+def join_monitors(obs_monitors, os_monitors):
+    """
+    Pairs every OBS monitor with a Windows monitor. An exact rectangle match wins; otherwise
+    the same top-left corner (the sizes differ when OBS and Windows disagree on DPI scaling).
+    Returns one row per OBS monitor, in OBS index order.
+    """
+    os_rects = [((m['rect'].left, m['rect'].top, m['rect'].right, m['rect'].bottom), m) for m in os_monitors]
+    used = set()
+    rows = []
+    for index, monitor in enumerate(obs_monitors):
+        rect = _obs_rect(monitor)
+        match, os_monitor = None, None
+        for kind, same in (('geometry', lambda r: r == rect), ('position', lambda r: r[:2] == rect[:2])):
+            for i, (os_rect, candidate) in enumerate(os_rects):
+                if i not in used and same(os_rect):
+                    match, os_monitor = kind, candidate
+                    used.add(i)
+                    break
+            if match:
+                break
+        rows.append({
+            'index': index,
+            'name': monitor.get('monitorName', ''),
+            'rect': rect,
+            'pnp_id': os_monitor['pnp_id'] if os_monitor else None,
+            'is_active': os_monitor['is_active'] if os_monitor else None,
+            'match': match,
+        })
+    return rows
+
+
+def parse_assignment(text):
+    """Parses KEY=INDEX[:SOURCE] into (key, index, source or None)."""
+    try:
+        key, target = text.split("=", 1)
+        index, _, source = target.partition(":")
+        return key.strip(), int(index), source.strip() or None
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected KEY=INDEX[:SOURCE], got '{text}'")
+
+
+def _set_source(entry, source):
+    if source.lower() == "program":
+        entry.pop("scene", None)
+        entry.update(type="program", title="Program (Projector)")
+    else:
+        entry.update(type="scene", scene=source, title=f"Scene Projector ({source})")
+
+
+def patch_config(config, monitors, assignments=()):
+    """
+    Returns (new_config, changes) with `config` brought in line with the joined `monitors`
+    rows. `assignments` are parse_assignment() tuples. `config` itself is not modified.
+    """
+    config = json.loads(json.dumps(config))
+    by_pnp = {m['pnp_id']: m for m in monitors if m['pnp_id']}
+    by_position = {m['rect'][:2]: m for m in monitors}
+    changes = []
+
+    for key, index, source in assignments:
+        if not 0 <= index < len(monitors):
+            raise ValueError(f"--assign {key}={index}: OBS has no monitor {index} (0-{len(monitors) - 1})")
+        entry = config.get(key)
+        if entry is None:
+            if not source:
+                raise ValueError(f"--assign {key}={index}: projector {key} is new, so a source is required "
+                                 f"({key}={index}:program or {key}={index}:<scene name>)")
+            entry = config[key] = {}
+        if source:
+            _set_source(entry, source)
+        monitor = monitors[index]
+        entry["monitor_x"], entry["monitor_y"] = monitor['rect'][:2]
+        if monitor['pnp_id']:
+            entry["monitor_pnp_id"] = monitor['pnp_id']
+        changes.append(f"{key} ({entry['title']}) -> monitor {index} at {monitor['rect'][:2]}")
+
+    assigned = {key for key, _, _ in assignments}
+    for key, entry in config.items():
+        if key in assigned:
+            continue
+        position = (entry.get("monitor_x", 0), entry.get("monitor_y", 0))
+        moved = by_pnp.get(entry.get("monitor_pnp_id"))
+        if moved and moved['rect'][:2] != position:
+            entry["monitor_x"], entry["monitor_y"] = moved['rect'][:2]
+            changes.append(f"{key} ({entry.get('title', key)}): monitor {entry['monitor_pnp_id']} "
+                           f"moved from {position} to {moved['rect'][:2]}")
+            continue
+        here = by_position.get(position)
+        if here is None:
+            changes.append(f"{key} ({entry.get('title', key)}): ⚠️ no OBS monitor at {position} - use --assign")
+        elif here['pnp_id'] and entry.get("monitor_pnp_id") != here['pnp_id']:
+            entry["monitor_pnp_id"] = here['pnp_id']
+            changes.append(f"{key} ({entry.get('title', key)}): recorded monitor {here['pnp_id']}")
+    return config, changes
+
+
+def print_table(monitors, config):
+    print(f"\n{'idx':>3}  {'position':>13}  {'size':>9}  {'power':>5}  {'PnP ID':<28}  projectors")
+    for m in monitors:
+        left, top, right, bottom = m['rect']
+        keys = [f"{key} ({entry.get('title', key)})" for key, entry in config.items()
+                if (entry.get("monitor_x", 0), entry.get("monitor_y", 0)) == (left, top)]
+        power = {True: "on", False: "off", None: "?"}[m['is_active']]
+        pnp = m['pnp_id'] or ("(no match)" if m['match'] is None else "?")
+        if m['match'] == 'position':
+            pnp += " *"
+        print(f"{m['index']:>3}  {f'({left}, {top})':>13}  {f'{right - left}x{bottom - top}':>9}  {power:>5}  "
+              f"{pnp:<28}  {', '.join(keys) or '-'}")
+    if any(m['match'] == 'position' for m in monitors):
+        print("  * matched by position only: OBS and Windows report different sizes (DPI scaling)")
+
+
+def flash_monitors(session, monitors, seconds):
+    """Opens an identify projector on every OBS monitor at once, leaves them up for `seconds` and closes them."""
+    is_obs_running()  # Finds the OBS process, so only its windows are enumerated
+    before = {proj['hwnd'] for proj in get_obs_projector_windows()}
+    for m in monitors:
+        session.call("OpenVideoMixProjector", {
+            "videoMixType": "OBS_WEBSOCKET_VIDEO_MIX_TYPE_PROGRAM",
+            "monitorIndex": m['index'],
+        })
+    print(f"\n🔦 Identify projectors open on {len(monitors)} monitors for {seconds:g}s...")
+    time.sleep(seconds)
+    opened = [proj['hwnd'] for proj in get_obs_projector_windows() if proj['hwnd'] not in before]
+    for hwnd in opened:
+        win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
+    print(f"  Closed {len(opened)} identify projectors.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Match OBS monitors to screens and update config.json.")
+    parser.add_argument("--write", action="store_true", help="write the updated configuration to config.json")
+    parser.add_argument("--assign", action="append", default=[], type=parse_assignment, metavar="KEY=INDEX[:SOURCE]",
+                        help="put projector KEY on OBS monitor INDEX (SOURCE: 'program' or a scene name)")
+    parser.add_argument("--flash", action="store_true", help="flash an identify projector on every monitor")
+    parser.add_argument("--flash-seconds", type=float, default=3, help="how long identify projectors stay up (default: 3)")
+    parser.add_argument("--config", help="config.json to read and patch (default: the launcher's config)")
+    args = parser.parse_args(argv)
+
+    try:
+        session = RequestSession(open_obs_connection, open_obs_connection(), REQUEST_METRICS)
+    except Exception as e:
+        print(f"❌ Could not connect to OBS: {e}")
+        print("💡 Make sure OBS is running and the WebSocket server is enabled.")
+        return 1
+
+    try:
+        monitors = join_monitors(session.call("GetMonitorList")["monitors"], get_all_monitor_details())
+        config_path = args.config or get_config_path()
+        config = {}
+        if os.path.exists(config_path):
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+
+        print_table(monitors, config)
+        if args.flash:
+            flash_monitors(session, monitors, args.flash_seconds)
+
+        try:
+            new_config, changes = patch_config(config, monitors, args.assign)
+        except ValueError as e:
+            print(f"\n❌ {e}")
+            return 1
+        if changes:
+            print("\n📝 Changes:" if args.write else "\n📝 Changes (run with --write to save):")
+            for change in changes:
+                print(f"  {change}")
+        if args.write and new_config != config:
+            atomic_write_json(config_path, new_config)
+            print(f"✅ Saved {config_path}")
+        elif not changes:
+            print("\n✅ config.json matches the current monitor layout.")
+        return 0
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
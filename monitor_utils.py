@@ -1,4 +1,5 @@
 import ctypes
+import threading
 from ctypes import wintypes
 import wmi
 
@@ -51,21 +52,43 @@ user32.GetMonitorInfoW.restype = wintypes.BOOL
 user32.EnumDisplayDevicesW.argtypes = [wintypes.LPCWSTR, wintypes.DWORD, ctypes.POINTER(DISPLAY_DEVICEW), wintypes.DWORD]
 user32.EnumDisplayDevicesW.restype = wintypes.BOOL
 
-def _get_pnp_id(hmonitor):
-    """Internal function to retrieve PnPDeviceID for a given HMONITOR."""
+# Buffers and the enumeration callback are allocated once and reused on every call,
+# so the monitor loop doesn't create new ctypes objects each cycle.
+_lock = threading.Lock()
+_monitor_handles = []
+_monitor_info = MONITORINFOEXW()
+_display_device = DISPLAY_DEVICEW()
+_monitor_display_device = DISPLAY_DEVICEW()
+
+def _collect_handle(hMonitor, hdcMonitor, lprcMonitor, dwData):
+    _monitor_handles.append(hMonitor)
+    return True
+
+_COLLECT_HANDLE_PROC = MONITORENUMPROC(_collect_handle)
+
+def _enum_monitor_handles():
+    """Returns the HMONITORs of all display monitors, or None if enumeration failed. Call with _lock held."""
+    _monitor_handles.clear()
+    if not user32.EnumDisplayMonitors(None, None, _COLLECT_HANDLE_PROC, 0):
+        return None
+    handles = list(_monitor_handles)
+    _monitor_handles.clear()
+    return handles
+
+def _get_pnp_id(hmonitor, monitor_device_name=None):
+    """Internal function to retrieve PnPDeviceID for a given HMONITOR. Call with _lock held."""
     try:
-        monitor_info = MONITORINFOEXW()
-        if not user32.GetMonitorInfoW(hmonitor, ctypes.byref(monitor_info)):
-            return None
-        
-        monitor_device_name = monitor_info.szDevice
+        if monitor_device_name is None:
+            if not user32.GetMonitorInfoW(hmonitor, ctypes.byref(_monitor_info)):
+                return None
+            monitor_device_name = _monitor_info.szDevice
         
         iDevNum = 0
-        display_device = DISPLAY_DEVICEW()
+        display_device = _display_device
         while user32.EnumDisplayDevicesW(None, iDevNum, ctypes.byref(display_device), 0):
             if display_device.DeviceName == monitor_device_name:
                 jDevNum = 0
-                monitor_display_device = DISPLAY_DEVICEW()
+                monitor_display_device = _monitor_display_device
                 while user32.EnumDisplayDevicesW(display_device.DeviceName, jDevNum, ctypes.byref(monitor_display_device), EDD_GET_DEVICE_INTERFACE_NAME):
                     if monitor_display_device.DeviceID:
                         return monitor_display_device.DeviceID
@@ -75,8 +98,39 @@ def _get_pnp_id(hmonitor):
         return None
     return None
 
+def get_monitor_fingerprint():
+    """
+    Returns a string identifying the current monitor layout (device names and rects).
+    Cheap: only uses EnumDisplayMonitors/GetMonitorInfo, no WMI.
+    """
+    parts = []
+    with _lock:
+        monitor_handles = _enum_monitor_handles()
+        if monitor_handles is None:
+            return None
+        for hmon in monitor_handles:
+            if user32.GetMonitorInfoW(hmon, ctypes.byref(_monitor_info)):
+                r = _monitor_info.rcMonitor
+                parts.append(f"{_monitor_info.szDevice}:{r.left},{r.top},{r.right},{r.bottom}")
+    return ";".join(sorted(parts))
+
 # --- WMI and main logic ---
 
+# One WMI (COM) connection per thread, reused across calls. COM objects are bound to
+# the apartment of the thread that created them, so they can't be shared between threads.
+_wmi_local = threading.local()
+
+def _get_wmi_connection():
+    connection = getattr(_wmi_local, 'connection', None)
+    if connection is None:
+        connection = wmi.WMI(namespace=r"root\cimv2")
+        _wmi_local.connection = connection
+    return connection
+
+def reset_wmi_connection():
+    """Drops this thread's cached WMI connection; the next query opens a new one."""
+    _wmi_local.connection = None
+
 def get_all_monitor_details():
     """
     Retrieves a detailed list of all monitors, including their coordinates, PNP ID, and power state. 
@@ -96,40 +150,38 @@ def get_all_monitor_details():
         ]
     """
     monitors_details = []
-    monitor_handles = []
 
     # 1. Enumerate monitors to get handles and rects
-    def callback(hMonitor, hdcMonitor, lprcMonitor, dwData):
-        monitor_handles.append(hMonitor)
-        return True
-    
-    if not user32.EnumDisplayMonitors(None, None, MONITORENUMPROC(callback), 0):
+    with _lock:
+        monitor_handles = _enum_monitor_handles()
+    if monitor_handles is None:
         return []
 
     # 2. Get WMI monitor statuses
     wmi_statuses = {}
     try:
-        w = wmi.WMI(namespace=r"root\cimv2")
-        for monitor in w.Win32_DesktopMonitor():
+        w = _get_wmi_connection()
+        for monitor in w.Win32_DesktopMonitor(["PNPDeviceID", "Availability"]):
             # Availability=3 means "Running/Full Power"
             wmi_statuses[monitor.PNPDeviceID] = (monitor.Availability == 3)
     except Exception:
-        # WMI might fail, so we proceed without statuses
-        pass
+        # WMI might fail, so we proceed without statuses and reconnect next time
+        reset_wmi_connection()
 
     # 3. Combine all information
-    for hmon in monitor_handles:
-        info = MONITORINFOEXW()
-        if user32.GetMonitorInfoW(hmon, ctypes.byref(info)):
-            pnp_id = _get_pnp_id(hmon)
-            is_active = wmi_statuses.get(pnp_id, True) # Default to True if WMI fails or monitor not found
-
-            monitors_details.append({
-                'hMonitor': hmon,
-                'rect': info.rcMonitor,
-                'pnp_id': pnp_id,
-                'is_active': is_active
-            })
+    with _lock:
+        for hmon in monitor_handles:
+            if user32.GetMonitorInfoW(hmon, ctypes.byref(_monitor_info)):
+                r = _monitor_info.rcMonitor
+                pnp_id = _get_pnp_id(hmon, _monitor_info.szDevice)
+                is_active = wmi_statuses.get(pnp_id, True) # Default to True if WMI fails or monitor not found
+
+                monitors_details.append({
+                    'hMonitor': hmon,
+                    'rect': RECT(r.left, r.top, r.right, r.bottom),
+                    'pnp_id': pnp_id,
+                    'is_active': is_active
+                })
             
     return monitors_details
 
@@ -6,30 +6,61 @@ import win32con
 import win32api
 import win32process
 import psutil
+import pythoncom
 import ctypes
-from ctypes import wintypes
 from obsws_python import ReqClient
 import json
 import sys
-from monitor_utils import get_all_monitor_details
+import argparse
+import threading
+import hashlib
+from monitor_utils import get_all_monitor_details, get_monitor_fingerprint
+from flash_suppression import FlashSuppressor
+from scene_catalog import SceneCatalog
+from persistence import WarmState
+from availability import AvailabilityLedger
+from reconciler import plan_actions, format_plan, title_matches, OPEN, MOVE, CLOSE, SKIP, MONITOR_OFF
+from process_supervisor import SupervisedProcess
+from ws_requests import RequestSession, RequestMetrics
+from frame_probe import FrameProbe, PROGRAM
+from load_governor import LoadGovernor
+from projector_registry import ProjectorRegistry
+from window_discovery import WindowDiscovery
+from startup_pipeline import StartupPipeline, StageFailed, FAILED
+from obs_restore import MonitorLayoutCache, obs_config_dir, write_projector_layout
+from cycle_watchdog import CycleWatchdog
 
 
 # --- Global State for Graceful Shutdown ---
 SHUTDOWN_REQUESTED = False
 OBS_PROCESS = None
-OBSBOT_PROCESS = None
 WEBSOCKET_CLIENT = None
+# Set to cut the wait between monitor checks short (scene collection switch, shutdown)
+RECHECK_REQUESTED = threading.Event()
+SCENE_CATALOG = SceneCatalog(on_collection_changed=RECHECK_REQUESTED.set)
+WARM_STATE = None  # WarmState, created in main() once the config directory is known
+REGISTRY = None  # ProjectorRegistry (config key <-> hwnd), created in main() on top of WARM_STATE
+AVAILABILITY = AvailabilityLedger()
+REQUEST_METRICS = RequestMetrics()
+GOVERNOR = LoadGovernor()
+# Last results of the deferrable checks, reused while the governor thins them out
+LAST_OBSERVED = {'monitors': None, 'obs_monitors': None}
+OBSBOT = None  # SupervisedProcess for OBSBOT Center, created in main()
+MONITOR_LAYOUT = None  # MonitorLayoutCache (OBS monitor list per monitor layout), created in main()
+FRAME_PROBE = None  # FrameProbe, started with monitor mode if FRAME_PROBE_INTERVAL > 0
 
 
 def shutdown_handler(ctrl_type):
     """Callback function to handle console events (like Ctrl+C, close, shutdown)."""
-    global SHUTDOWN_REQUESTED, WEBSOCKET_CLIENT, OBS_PROCESS, OBSBOT_PROCESS
+    global SHUTDOWN_REQUESTED, WEBSOCKET_CLIENT, OBS_PROCESS
     if SHUTDOWN_REQUESTED:
         return True
 
     print(f"\n🚨 Shutdown signal received (Type: {ctrl_type}). Initiating shutdown...")
     SHUTDOWN_REQUESTED = True
+    RECHECK_REQUESTED.set()
     time.sleep(0.25)
+    report_availability()
 
     # 1. Close projector windows
     try:
@@ -49,6 +80,10 @@ def shutdown_handler(ctrl_type):
             WEBSOCKET_CLIENT.disconnect()
         except Exception as e:
             print(f"  ⚠️ Error disconnecting websocket: {e}")
+    SCENE_CATALOG.stop_events()
+    if FRAME_PROBE:
+        FRAME_PROBE.stop()
+    GOVERNOR.restore()
 
     # Give apps a moment to process projector/websocket closures before terminating
     print("  -> Allowing 2 seconds for applications to process closures...")
@@ -64,30 +99,13 @@ def shutdown_handler(ctrl_type):
             print("  -> OBS process terminated.")
         except Exception as e:
             print(f"  ⚠️ Error terminating OBS: {e}")
+    if WARM_STATE:
+        WARM_STATE.clear()
 
     # 4. Shutdown OBSBOT Center
-    print("  -> Initiating OBSBOT Center shutdown...")
-    is_obsbot_running()
-    if OBSBOT_PROCESS:
-        obsbot_hwnd = find_obsbot_main_window()
-        if obsbot_hwnd:
-            print("  -> Sending WM_CLOSE to OBSBOT Center window...")
-            win32gui.PostMessage(obsbot_hwnd, win32con.WM_CLOSE, 0, 0)
-            try:
-                OBSBOT_PROCESS.wait(timeout=8)
-                print("  -> OBSBOT Center process exited gracefully.")
-            except psutil.TimeoutExpired:
-                print("  -> OBSBOT Center did not exit gracefully, forcing termination.")
-                try:
-                    OBSBOT_PROCESS.terminate()
-                except psutil.NoSuchProcess:
-                    pass
-        else:
-            print("  -> OBSBOT Center window not found, forcing termination.")
-            try:
-                OBSBOT_PROCESS.terminate()
-            except psutil.NoSuchProcess:
-                pass
+    if OBSBOT:
+        print("  -> Initiating OBSBOT Center shutdown...")
+        OBSBOT.stop(close_window=close_obsbot_main_window)
 
     print("✅ Shutdown complete. Exiting.")
     return True
@@ -96,31 +114,30 @@ def shutdown_handler(ctrl_type):
 HOST = "localhost"
 PORT = 4455
 PASSWORD = "Marana7ha"
+WEBSOCKET_CONNECT_TIMEOUT = 5  # Seconds; per-request deadlines are in ws_requests.DEADLINES
 OBS_EXECUTABLE_PATH = r"C:\Program Files\obs-studio\bin\64bit\obs64.exe"  # Adjust path as needed
 OBS_DIRECTORY = r"C:\Program Files\obs-studio\bin\64bit"  # OBS installation directory
+OBS_STARTUP_TIMEOUT = 15  # Seconds to wait for the OBS main window after launching OBS
+OBSBOT_LAUNCH_PATH = r"C:\Users\Public\Desktop\OBSBOT Center.lnk"  # Override with --obsbot-path
 
 # Monitoring settings
 MONITOR_MODE = True  # Set to False for single run, True for continuous monitoring
 CHECK_INTERVAL = 10  # Check every 10 seconds
+AVAILABILITY_EXPORT_INTERVAL = 3600  # Rewrite availability.csv/.json every hour
 STARTUP_DELAY = 20   # Wait 30 seconds after startup before first check
+FRAME_PROBE_INTERVAL = 0  # Seconds between black/frozen frame checks, 0 = off (needs numpy); --frame-probe
+FRAME_PROBE_FROZEN_AFTER = 120  # Report a projected source as frozen after this long without change
+OBS_RESTORE_PROJECTORS = False  # Let OBS reopen the projectors itself at launch (edits OBS's config files); --obs-restore
+# Seconds a monitor check may spend in one phase before the watchdog abandons and restarts it
+WATCHDOG_PHASE_BUDGET = 20
+WATCHDOG_BUDGETS = {
+    'connect': 40,   # Up to two connection attempts with their timeouts
+    'execute': 30,   # Per action; opening a projector waits up to 8 s for its window
+}
+WATCHDOG_CYCLE_BUDGET = 180
 
 CONFIG = {}
 
-# FlashWindowEx setup
-FLASHW_STOP = 0
-FLASHW_CAPTION = 1
-FLASHW_TRAY = 2
-FLASHW_ALL = 3
-
-class FLASHWINFO(ctypes.Structure):
-    _fields_ = [
-        ("cbSize", wintypes.UINT),
-        ("hwnd",   wintypes.HWND),
-        ("dwFlags", wintypes.DWORD),
-        ("uCount", wintypes.UINT),
-        ("dwTimeout", wintypes.DWORD),
-    ]
-
 def get_config_path():
     """Returns the path to the configuration file in AppData."""
     app_data = os.getenv('APPDATA')
@@ -129,12 +146,68 @@ def get_config_path():
         os.makedirs(config_dir)
     return os.path.join(config_dir, "config.json")
 
+def get_state_path():
+    """Returns the path to the warm-restart state file, next to config.json."""
+    return os.path.join(os.path.dirname(get_config_path()), "state.json")
+
+def get_monitor_layout_path():
+    """Returns the path to the recorded OBS monitor list, next to config.json."""
+    return os.path.join(os.path.dirname(get_config_path()), "obs_monitors.json")
+
+def report_availability():
+    """Prints the projector availability summary and exports it next to config.json."""
+    titles = {key: config.get('title', key) for key, config in CONFIG.items()}
+    AVAILABILITY.print_summary(titles)
+    REQUEST_METRICS.print_summary()
+    WATCHDOG.print_summary()
+    export_availability()
+
+def get_export_request_path():
+    """Returns the path of the file that asks a running launcher to export availability now."""
+    return os.path.join(os.path.dirname(get_config_path()), "export_availability.request")
+
+def export_availability():
+    """Writes availability.csv and availability.json next to config.json."""
+    config_dir = os.path.dirname(get_config_path())
+    try:
+        AVAILABILITY.export_csv(os.path.join(config_dir, "availability.csv"))
+        AVAILABILITY.export_json(os.path.join(config_dir, "availability.json"))
+        return True
+    except Exception as e:
+        print(f"⚠️ Could not export availability report: {e}")
+        return False
+
+def request_availability_export():
+    """Asks the running launcher to export availability at its next check (--export-availability)."""
+    path = get_export_request_path()
+    with open(path, 'w', encoding='utf-8'):
+        pass
+    print(f"📨 Export requested; the running launcher writes availability.csv/.json to {os.path.dirname(path)} "
+          f"at its next check.")
+
+def export_availability_if_requested():
+    """Exports availability if `python obsStart.py --export-availability` asked for it. Returns True if it did."""
+    path = get_export_request_path()
+    if not os.path.exists(path):
+        return False
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+    if export_availability():
+        print(f"📈 Availability exported on request to {os.path.dirname(path)}")
+    return True
+
+def get_config_fingerprint():
+    """Returns a short hash of the loaded projector configuration."""
+    return hashlib.sha1(json.dumps(CONFIG, sort_keys=True).encode('utf-8')).hexdigest()
+
 def load_config():
     """Loads the configuration from the JSON file, or creates it if it doesn't exist."""
     global CONFIG
     config_path = get_config_path()
     # NOTE: The configuration now uses monitor coordinates (e.g., 0, 1920) to identify
-    # the target monitor. Use the obs_monitor_test.py script to find the correct coordinates.
+    # the target monitor. Use the monitor_calibration.py script to find and write the coordinates.
     default_config = {
         "2": {"title": "Program (Projector)", "type": "program", "monitor_x": 0, "monitor_y": 0},
         "3": {"title": "Scene Projector (Proiector)", "type": "scene", "monitor_x": 1920, "monitor_y": 0, "scene": "Proiector"},
@@ -164,173 +237,24 @@ VK_MENU = 0x12
 KEYEVENTF_EXTENDEDKEY = 0x0001
 KEYEVENTF_KEYUP = 0x0002
 
-
-def get_monitors_sorted():
-    """
-    Gets all display monitors and returns them sorted by their horizontal position.
-    """
-    monitors = []
-    MonitorEnumProc = ctypes.WINFUNCTYPE(
-        ctypes.c_int,
-        ctypes.c_ulong,
-        ctypes.c_ulong,
-        ctypes.POINTER(wintypes.RECT),
-        ctypes.c_double
-    )
-
-    class MONITORINFOEXW(ctypes.Structure):
-        _fields_ = [
-            ("cbSize", wintypes.DWORD),
-            ("rcMonitor", wintypes.RECT),
-            ("rcWork", wintypes.RECT),
-            ("dwFlags", wintypes.DWORD),
-            ("szDevice", wintypes.WCHAR * 32)
-        ]
-
-    def enum_proc(hMonitor, hdcMonitor, lprcMonitor, dwData):
-        info = MONITORINFOEXW()
-        info.cbSize = ctypes.sizeof(MONITORINFOEXW)
-        if ctypes.windll.user32.GetMonitorInfoW(hMonitor, ctypes.byref(info)):
-            monitors.append({
-                'hMonitor': hMonitor,
-                'rcMonitor': info.rcMonitor,
-                'szDevice': info.szDevice
-            })
-        return 1
-
-    # Enumerate all display monitors
-    ctypes.windll.user32.EnumDisplayMonitors(0, 0, MonitorEnumProc(enum_proc), 0)
-
-    # Sort monitors by their left coordinate
-    return sorted(monitors, key=lambda m: m['rcMonitor'].left)
-
-
-def get_monitor_index_from_coords(x, y, client):
-    """
-    Finds the OBS monitor index that corresponds to a given (x, y) coordinate.
-    """
-    try:
-        # Get the list of monitors from OBS
-        monitors = client.get_monitor_list().monitors
-
-        for i, monitor in enumerate(monitors):
-            if monitor.get('monitorPositionX') == x and monitor.get('monitorPositionY') == y:
-                print(f"  ✅ Found monitor index {i} for coordinates ({x}, {y})")
-                return i
-        
-        print(f"  ⚠️ No monitor found in OBS for coordinates ({x}, {y}). Falling back to primary.")
-        return 0 # Default to primary if not found
-        
-    except Exception as e:
-        print(f"  ❌ Error getting monitor index from OBS: {e}")
-        print("  Falling back to primary monitor (index 0).")
-        return 0
-
-
-
-def get_primary_monitor_rect():
-    """
-    Finds the rectangle of the primary display monitor.
-    """
-    MonitorEnumProc = ctypes.WINFUNCTYPE(ctypes.c_int, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(wintypes.RECT), ctypes.c_double)
-
-    class MONITORINFOEXW(ctypes.Structure):
-        _fields_ = [
-            ("cbSize", wintypes.DWORD),
-            ("rcMonitor", wintypes.RECT),
-            ("rcWork", wintypes.RECT),
-            ("dwFlags", wintypes.DWORD),
-            ("szDevice", wintypes.WCHAR * 32)
-        ]
-
-    primary_rect = None
-    def enum_proc(hMonitor, hdcMonitor, lprcMonitor, dwData):
-        nonlocal primary_rect
-        info = MONITORINFOEXW()
-        info.cbSize = ctypes.sizeof(MONITORINFOEXW)
-        if ctypes.windll.user32.GetMonitorInfoW(hMonitor, ctypes.byref(info)):
-            if info.dwFlags & 1: # MONITORINFOF_PRIMARY
-                primary_rect = info.rcMonitor
-                return 0 # Stop enumeration
-        return 1
-
-    ctypes.windll.user32.EnumDisplayMonitors(0, 0, MonitorEnumProc(enum_proc), 0)
-    return primary_rect
-
-def check_and_correct_projector_positions(client):
-    """
-    Verifies that projectors are on the correct monitor and closes them if they are misplaced.
-    """
-    print("\n\U0001f50d Verifying projector positions...")
-    
-    try:
-        obs_monitors = client.get_monitor_list().monitors
-    except Exception as e:
-        print(f"  \u26a0\ufe0f Could not get monitor list from OBS: {e}. Skipping position check.")
-        return
-
-    open_projectors = get_obs_projector_windows()
-    if not open_projectors:
-        return # Nothing to check
-
-    for config_key, config in CONFIG.items():
-        target_x = config.get('monitor_x')
-        target_y = config.get('monitor_y')
-
-        # Find the OBS monitor that matches the configured coordinates
-        target_monitor_geom = None
-        for monitor in obs_monitors:
-            if monitor.get('monitorPositionX') == target_x and monitor.get('monitorPositionY') == target_y:
-                target_monitor_geom = monitor
-                break
-        
-        if not target_monitor_geom:
-            print(f"  \u26a0\ufe0f No monitor found in OBS for coordinates ({target_x}, {target_y}) for '{config['title']}'.")
-            continue
-
-        # Find the corresponding window for this config entry
-        found_hwnd = None
-        for proj_window in open_projectors:
-            title_lower = proj_window['title'].lower()
-            is_match = False
-            if config["type"] == "program" and "program" in title_lower:
-                is_match = True
-            elif config["type"] == "scene":
-                scene_name = config["scene"].lower()
-                if scene_name in title_lower or scene_name.replace(" ", "") in title_lower.replace(" ", ""):
-                    is_match = True
-            
-            if is_match:
-                found_hwnd = proj_window['hwnd']
-                break
-        
-        if found_hwnd:
-            # We found the window, now check its position.
-            try:
-                window_rect = win32gui.GetWindowRect(found_hwnd)
-                window_center_x = (window_rect[0] + window_rect[2]) / 2
-                window_center_y = (window_rect[1] + window_rect[3]) / 2
-
-                # Check if the window's center is inside the target monitor's geometry
-                mon_x = target_monitor_geom['monitorPositionX']
-                mon_y = target_monitor_geom['monitorPositionY']
-                mon_width = target_monitor_geom['monitorWidth']
-                mon_height = target_monitor_geom['monitorHeight']
-
-                if not (mon_x <= window_center_x < mon_x + mon_width and \
-                        mon_y <= window_center_y < mon_y + mon_height):
-                    
-                    print(f"  \u26a0\ufe0f Misplaced projector detected: '{config['title']}' is not on the correct monitor.")
-                    print(f"  Closing '{config['title']}' so it can be reopened correctly.")
-                    win32gui.PostMessage(found_hwnd, win32con.WM_CLOSE, 0, 0)
-
-            except Exception as e:
-                print(f"  \u26a0\ufe0f Could not verify position for '{config['title']}': {e}")
-
+# Newly opened projectors are queued here and flash-suppressed together once per open batch
+FLASH_SUPPRESSOR = FlashSuppressor()
+# Finds OBS's and OBSBOT's windows by enumerating only their threads
+WINDOW_DISCOVERY = WindowDiscovery()
+# Runs monitor checks on a worker thread and restarts them when a phase hangs
+WATCHDOG = CycleWatchdog(WATCHDOG_BUDGETS, WATCHDOG_PHASE_BUDGET, WATCHDOG_CYCLE_BUDGET,
+                         on_stall=lambda phase: recover_from_stall(phase), initializer=pythoncom.CoInitialize)
 
 def is_obs_running():
     """Check if OBS is already running and store the process object."""
     global OBS_PROCESS
+    # Fast path: re-check the process we already know about instead of scanning all processes
+    if OBS_PROCESS is not None:
+        try:
+            if OBS_PROCESS.is_running() and OBS_PROCESS.status() in [psutil.STATUS_RUNNING, psutil.STATUS_SLEEPING]:
+                return True
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
     try:
         for proc in psutil.process_iter(['name', 'status']):
             proc_name = proc.info['name'].lower()
@@ -384,86 +308,55 @@ def focus_window(hwnd):
         print(f"⚠️ Could not focus window {hwnd}: {e}")
         return False
 
-def suppress_taskbar_flash_aggressive(hwnd, max_attempts=3):
-    """Aggressively suppress taskbar flash with multiple strategies"""
-    try:
-        for attempt in range(max_attempts):
-            try:
-                # Stop any current flashing immediately - multiple methods
-                fwi = FLASHWINFO(ctypes.sizeof(FLASHWINFO), hwnd, FLASHW_STOP, 0, 0)
-                ctypes.windll.user32.FlashWindowEx(ctypes.byref(fwi))
-                
-                # Alternative flash stop method
-                ctypes.windll.user32.FlashWindow(hwnd, False)
-                
-                # Change window extended styles to hide from taskbar
-                try:
-                    ex_style = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
-                    new_ex = (ex_style & ~win32con.WS_EX_APPWINDOW) | win32con.WS_EX_TOOLWINDOW
-                    win32gui.SetWindowLong(hwnd, win32con.GWL_EXSTYLE, new_ex)
-                except:
-                    pass  # Sometimes this fails, continue anyway
-                
-                # Force window position without activation to prevent flash
-                win32gui.SetWindowPos(
-                    hwnd, win32con.HWND_BOTTOM,
-                    0, 0, 0, 0,
-                    win32con.SWP_NOMOVE | win32con.SWP_NOSIZE | win32con.SWP_NOACTIVATE
-                )
-                
-                # Small delay
-                time.sleep(0.05)
-                
-                # Bring back to top without activation
-                win32gui.SetWindowPos(
-                    hwnd, win32con.HWND_TOP,
-                    0, 0, 0, 0,
-                    win32con.SWP_NOMOVE | win32con.SWP_NOSIZE | win32con.SWP_NOACTIVATE | win32con.SWP_SHOWWINDOW
-                )
-                
-                # Final flash suppression
-                fwi = FLASHWINFO(ctypes.sizeof(FLASHWINFO), hwnd, FLASHW_STOP, 0, 0)
-                ctypes.windll.user32.FlashWindowEx(ctypes.byref(fwi))
-                ctypes.windll.user32.FlashWindow(hwnd, False)
-                
-                if attempt == 0:
-                    print(f"  🔇 Flash suppression applied to window {hwnd}")
-                break
-                
-            except Exception as e:
-                if attempt < max_attempts - 1:
-                    time.sleep(0.1)
-                    continue
-                else:
-                    print(f"  ⚠️ Flash suppression partially failed for {hwnd}: {e}")
-                    
-    except Exception as e:
-        print(f"⚠️ Could not suppress flash for hwnd={hwnd}: {e}")
-
-def find_obs_main_window():
-    """Helper function to find the main OBS window handle."""
-    def callback(hwnd, extra):
-        if win32gui.IsWindowVisible(hwnd):
-            title = win32gui.GetWindowText(hwnd)
-            class_name = win32gui.GetClassName(hwnd)
-            if ("OBS" in title or "obs64" in title.lower()) and "Qt" in class_name:
-                extra.append(hwnd)
-        return True
-    hwnds = []
-    win32gui.EnumWindows(callback, hwnds)
-    return hwnds[0] if hwnds else None
+def obs_pid():
+    """PID of the OBS process, if it is known."""
+    return OBS_PROCESS.pid if OBS_PROCESS else None
+
+def find_obs_main_window(pid=None):
+    """Helper function to find the main OBS window handle among the windows of OBS (`pid`, default: the known OBS process)."""
+    for window in WINDOW_DISCOVERY.windows(pid or obs_pid()):
+        title = window['title']
+        if ("OBS" in title or "obs64" in title.lower()) and "Qt" in window['class'] and "Projector" not in title:
+            return window['hwnd']
+    return None
 
 def find_obsbot_main_window():
     """Helper function to find the main OBSBOT Center window handle."""
-    def callback(hwnd, extra):
-        if win32gui.IsWindowVisible(hwnd):
-            title = win32gui.GetWindowText(hwnd)
-            if "OBSBOT" in title and "Center" in title:
-                extra.append(hwnd)
-        return True
-    hwnds = []
-    win32gui.EnumWindows(callback, hwnds)
-    return hwnds[0] if hwnds else None
+    pid = OBSBOT.process.pid if OBSBOT and OBSBOT.process else None
+    for window in WINDOW_DISCOVERY.windows(pid):
+        if "OBSBOT" in window['title'] and "Center" in window['title']:
+            return window['hwnd']
+    return None
+
+def wait_for_obs_main_window(pid, timeout=OBS_STARTUP_TIMEOUT):
+    """Polls for the main window of the OBS process `pid` until it appears. Returns its handle or None."""
+    deadline = time.time() + timeout
+    while not SHUTDOWN_REQUESTED:
+        hwnd = find_obs_main_window(pid)
+        if hwnd or time.time() >= deadline:
+            return hwnd
+        time.sleep(0.25)
+    return None
+
+def prepare_obs_projector_restore():
+    """
+    Writes the configured projectors into OBS's own settings and scene collection, so OBS
+    opens them itself while it starts. Needs the OBS monitor list recorded for the current
+    monitor layout; without it (or if OBS's files can't be updated) the projectors are just
+    opened over the websocket. OBS must not be running.
+    """
+    obs_monitors = MONITOR_LAYOUT.lookup(get_monitor_fingerprint()) if MONITOR_LAYOUT else None
+    if not obs_monitors:
+        print("ℹ️ OBS restore: no OBS monitor list recorded for this monitor layout yet - projectors will be opened over the websocket.")
+        return False
+    try:
+        count, changed = write_projector_layout(obs_config_dir(), CONFIG, obs_monitors)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ OBS restore: could not update the OBS configuration: {e}")
+        return False
+    updated = f" (updated {', '.join(os.path.basename(path) for path in changed)})" if changed else ""
+    print(f"🗃️ OBS restore: OBS will open {count}/{len(CONFIG)} projectors itself{updated}")
+    return True
 
 def start_obs():
     """Start OBS if it's not already running"""
@@ -472,17 +365,18 @@ def start_obs():
         return True
 
     remove_obs_crash_sentinel()
+    if OBS_RESTORE_PROJECTORS:
+        prepare_obs_projector_restore()
     
     print("🚀 Starting OBS...")
     try:
-        subprocess.Popen([OBS_EXECUTABLE_PATH, "--disable-safe-mode"], cwd=OBS_DIRECTORY, shell=False)
+        obs = subprocess.Popen([OBS_EXECUTABLE_PATH, "--disable-safe-mode"], cwd=OBS_DIRECTORY, shell=False)
         print("✅ OBS started successfully")
         
         print("⏳ Waiting for OBS to initialize...")
-        time.sleep(4)
+        hwnd = wait_for_obs_main_window(obs.pid)
 
-        # Find and focus OBS main window
-        hwnd = find_obs_main_window()
+        # Focus OBS main window
         if hwnd:
             try:
                 if not focus_window(hwnd):
@@ -516,20 +410,24 @@ def start_obs():
         print(f"❌ Failed to start OBS: {e}")
         return False
 
-def connect_to_obs_websocket(max_retries=5):
-    """Connect to OBS WebSocket with retries and store the client."""
+def open_obs_connection():
+    return ReqClient(host=HOST, port=PORT, password=PASSWORD, timeout=WEBSOCKET_CONNECT_TIMEOUT)
+
+def connect_to_obs_websocket(max_retries=5, retry_delay=3):
+    """Connect to OBS WebSocket with retries and store a RequestSession for it."""
     global WEBSOCKET_CLIENT
     for attempt in range(max_retries):
         if SHUTDOWN_REQUESTED: return None
         try:
-            client = ReqClient(host=HOST, port=PORT, password=PASSWORD)
+            client = RequestSession(open_obs_connection, open_obs_connection(), REQUEST_METRICS, clock=time.perf_counter)
             print("✅ Connected to OBS WebSocket")
             WEBSOCKET_CLIENT = client
+            SCENE_CATALOG.start_events(HOST, PORT, PASSWORD, WEBSOCKET_CONNECT_TIMEOUT)
             return client
         except Exception as e:
             print(f"⏳ WebSocket connection attempt {attempt + 1}/{max_retries} failed: {e}")
             if attempt < max_retries - 1:
-                time.sleep(3)
+                time.sleep(retry_delay)
             else:
                 print("❌ Failed to connect to OBS WebSocket after all retries")
                 print("💡 Make sure OBS WebSocket server is enabled in OBS settings")
@@ -537,286 +435,426 @@ def connect_to_obs_websocket(max_retries=5):
                 return None
 
 def get_obs_projector_windows():
-    """Get all OBS projector windows with their handles"""
-    projectors = []
-    
-    def callback(hwnd, _):
-        if win32gui.IsWindowVisible(hwnd):
-            title = win32gui.GetWindowText(hwnd)
-            class_name = win32gui.GetClassName(hwnd)
-            
-            if ("Projector" in title and 
-                ("OBS" in title or "obs64" in class_name.lower() or "Qt" in class_name)):
-                projectors.append({
-                    'hwnd': hwnd,
-                    'title': title,
-                    'class': class_name
-                })
-        return True
-    
-    win32gui.EnumWindows(callback, None)
-    return projectors
+    """
+    Get all OBS projector windows with their handles. Only the windows of the OBS process are
+    enumerated, and titles are read without sending messages, so a hung app elsewhere on the
+    desktop can't stall the check. If OBS's PID isn't known yet, every window is looked at.
+    """
+    return [window for window in WINDOW_DISCOVERY.windows(obs_pid())
+            if "Projector" in window['title']
+            and ("OBS" in window['title'] or "obs64" in window['class'].lower() or "Qt" in window['class'])]
 
-def wait_for_projector_window(config, timeout=8):
-    """Wait for a specific projector window to appear and return its handle"""
+def wait_for_projector_window(config, timeout=8, exclude=()):
+    """Wait for a specific projector window to appear and return its handle. Windows in `exclude` are ignored."""
     start_time = time.time()
     
     while time.time() - start_time < timeout:
         projectors = get_obs_projector_windows()
         
         for proj in projectors:
-            title_lower = proj['title'].lower()
-            
-            if config["type"] == "program" and "program" in title_lower:
+            if proj['hwnd'] not in exclude and title_matches(config, proj['title']):
                 return proj["hwnd"]
-            elif config["type"] == "scene":
-                scene_name = config["scene"].lower()
-                if scene_name in title_lower or scene_name.replace(" ", "") in title_lower.replace(" ", ""):
-                    return proj["hwnd"]
         
         time.sleep(0.2)
     
     return None
 
-def open_projector_with_flash_suppression(client, config, monitor_details):
+def open_projector_with_flash_suppression(client, config_key, monitor_index, known_hwnds=()):
     """
-    Open a single projector and immediately suppress its taskbar flash.
-    Returns:
-        - True: If the projector was opened successfully.
-        - False: If there was an error during the process.
-        - None: If the projector was skipped because the monitor is off.
+    Open a single projector, queue its window for taskbar flash suppression and register
+    it to `config_key`. `known_hwnds` are windows that existed before the open.
+    Returns the new window's hwnd, or None if it didn't appear.
     """
+    config = CONFIG[config_key]
     try:
-        target_x = config.get('monitor_x', 0)
-        target_y = config.get('monitor_y', 0)
-
-        # Check if the target monitor is active before trying to open it.
-        target_monitor = next((m for m in monitor_details if m['rect'].left == target_x and m['rect'].top == target_y), None)
-        
-        # If monitor is found and not active, skip it.
-        if target_monitor and not target_monitor['is_active']:
-            print(f"  💤 Skipping '{config['title']}' because monitor at ({target_x}, {target_y}) is off or in power-save mode.")
-            return None  # Special return value for "skipped"
-
-        monitor_index = get_monitor_index_from_coords(target_x, target_y, client)
-
-        # Open the projector
         if config["type"] == "program":
-            client.send("OpenVideoMixProjector", {
+            client.call("OpenVideoMixProjector", {
                 "videoMixType": "OBS_WEBSOCKET_VIDEO_MIX_TYPE_PROGRAM",
                 "monitorIndex": monitor_index
             })
             print(f"  📺 Opening Program projector on monitor {monitor_index}")
             
         elif config["type"] == "scene":
-            client.send("OpenSourceProjector", {
+            client.call("OpenSourceProjector", {
                 "sourceName": config["scene"],
                 "monitorIndex": monitor_index
             })
             print(f"  📺 Opening {config['scene']} projector on monitor {monitor_index}")
         
-        hwnd = wait_for_projector_window(config, timeout=6)
+        hwnd = wait_for_projector_window(config, timeout=6, exclude=set(known_hwnds) | REGISTRY.bound_hwnds())
         
         if hwnd:
-            suppress_taskbar_flash_aggressive(hwnd, max_attempts=1)
-            return True
+            FLASH_SUPPRESSOR.queue(hwnd)
+            REGISTRY.bind(config_key, hwnd, config.get('title', config_key))
+            AVAILABILITY.mark(config_key, True)
+            return hwnd
         else:
             print(f"  ⚠️ Could not find window handle for {config['title']}")
-            return False
+            return None
             
     except Exception as e:
         print(f"  ❌ Failed to open {config['title']}: {e}")
-        return False
+        return None
 
-def check_missing_projectors():
-    """Check which projectors are missing and which exist"""
-    existing = get_obs_projector_windows()
-    missing = []
-    found = []
-    
-    for monitor, config in CONFIG.items():
-        projector_found = False
-        for proj in existing:
-            title_lower = proj['title'].lower()
-            
-            if config["type"] == "program" and "program" in title_lower:
-                projector_found = True
-                found.append(monitor)
-                break
-            elif config["type"] == "scene":
-                scene_name = config["scene"].lower()
-                if scene_name in title_lower or scene_name.replace(" ", "") in title_lower.replace(" ", ""):
-                    projector_found = True
-                    found.append(monitor)
-                    break
-        
-        if not projector_found:
-            missing.append(monitor)
-    
-    return missing, found
-
-def open_missing_projectors_enhanced(client):
-    """Enhanced version with better flash suppression and monitor status check"""
-    print("💻 Checking monitor power states...")
+def read_monitor_power():
+    """Reads the OS monitors with their power state (WMI) and keeps the result in LAST_OBSERVED."""
     try:
-        monitor_details = get_all_monitor_details()
-        active_monitors_count = sum(1 for m in monitor_details if m['is_active'])
-        print(f"  → Found {len(monitor_details)} total monitors, {active_monitors_count} are active.")
+        monitors = [
+            {'rect': (m['rect'].left, m['rect'].top, m['rect'].right, m['rect'].bottom), 'is_active': m['is_active']}
+            for m in get_all_monitor_details()
+        ]
     except Exception as e:
         print(f"  ⚠️ Could not check monitor power states: {e}")
-        print("     (Is the 'wmi' package installed? Falling back to basic check.)")
-        monitor_details = [] # Fallback to empty list
-
-    missing, found = check_missing_projectors()
-    
-    if not missing:
-        print("✅ All required projectors are already running!")
-        return True # Indicates no action was needed, but it's not a failure.
-    
-    print(f"📋 Found projectors: {found}")
-    print(f"🔍 Missing projectors: {missing}")
-    print("🚀 Opening missing projectors with flash suppression:")
-    
-    any_opened = False
-    
-    for monitor_id in missing:
-        config = CONFIG[monitor_id]
-        
-        # In case WMI failed, create a dummy entry that will always be 'active'
-        if not monitor_details:
-            monitor_details = [{'rect': type('obj', (object,), {'left': config.get('monitor_x', 0), 'top': config.get('monitor_y', 0)})(), 'is_active': True}]
-
-        result = open_projector_with_flash_suppression(client, config, monitor_details)
-        if result is True:
-            any_opened = True
-            time.sleep(0.2) # Stagger opening projectors
-    
-    return any_opened
+        print("     (Is the 'wmi' package installed? Assuming all monitors are on.)")
+        monitors = []
+    LAST_OBSERVED['monitors'] = monitors
+    return monitors
 
-def verify_projectors_exist():
-    """Check if projectors are actually running and correctly identified."""
-    print("\n🔍 Verifying projectors:")
-    
-    projectors = get_obs_projector_windows()
-    found_config_keys = []
-    
-    for proj in projectors:
-        title = proj['title']
-        print(f"  → Found window: {title}")
-        title_lower = title.lower()
-
-        # Iterate through config to find a match
-        for key, config in CONFIG.items():
-            # Check if this key has already been found
-            if key in found_config_keys:
+def observe_projector_state(client, monitors=None):
+    """
+    Collects everything the reconciler needs in one pass: projector windows with their
+    rects, OS monitors with their power state, the OBS monitor list and the scene names.
+    While every projector is registered to a live window, only those windows are looked
+    at; all windows are enumerated only when a key is unbound or a periodic scan is due.
+    `monitors` skips the monitor power check when the caller has just done it.
+    A phase the watchdog has backed off after a stall is done without: its last result is
+    reused (or the scan skipped) until it is retried.
+    """
+    WATCHDOG.phase('windows')
+    windows = REGISTRY.live_windows()
+    if REGISTRY.needs_full_scan(CONFIG) and WATCHDOG.attempt('window scan'):
+        bound = REGISTRY.bound_hwnds()
+        for proj in get_obs_projector_windows():
+            if proj['hwnd'] in bound:
                 continue
+            try:
+                rect = tuple(win32gui.GetWindowRect(proj['hwnd']))
+            except Exception:
+                continue  # Window closed while we were looking at it
+            windows.append({'hwnd': proj['hwnd'], 'title': proj['title'], 'rect': rect, 'key': None})
+
+    # Monitor power states (WMI) and the OBS monitor list are deferrable: while the governor
+    # is throttled, the last result is reused on most cycles.
+    if monitors is None:
+        monitors = LAST_OBSERVED['monitors']
+        if (monitors is None or GOVERNOR.allow('monitor_power')) and WATCHDOG.attempt('monitors'):
+            monitors = read_monitor_power()
+        elif monitors is None:
+            monitors = []  # WMI has never answered; assume every monitor is on
+
+    obs_monitors = LAST_OBSERVED['obs_monitors']
+    if (obs_monitors is None or GOVERNOR.allow('obs_monitor_list')) and WATCHDOG.attempt('obs monitors'):
+        try:
+            obs_monitors = client.call("GetMonitorList")["monitors"]
+        except Exception as e:
+            print(f"  ⚠️ Could not get monitor list from OBS: {e}. Falling back to primary monitor.")
+            obs_monitors = None
+        LAST_OBSERVED['obs_monitors'] = obs_monitors
 
-            is_match = False
-            if config.get("type") == "program" and "program" in title_lower:
-                is_match = True
-            elif config.get("type") == "scene":
-                scene_name = config.get("scene", "").lower()
-                if scene_name and (scene_name in title_lower or scene_name.replace(" ", "") in title_lower.replace(" ", "")):
-                    is_match = True
-            
-            if is_match:
-                found_config_keys.append(key)
-                # Once a projector window matches a config, break inner loop to not match it with another config
+    scenes = SCENE_CATALOG.scene_names(client) if WATCHDOG.attempt('scenes') else None
+    return windows, monitors, obs_monitors, scenes
+
+def execute_plan(plan, client, windows):
+    """
+    Carries out a reconciler plan. Returns False if opening a projector failed and the
+    websocket connection should be dropped.
+    """
+    known_hwnds = {window['hwnd'] for window in windows}
+    ok = True
+    for action in plan.actions:
+        if SHUTDOWN_REQUESTED:
+            break
+        if not WATCHDOG.attempt('execute'):
+            print("  ⏸️ Not changing projectors this check: the last attempt hung.")
+            break
+        if action.kind == OPEN:
+            hwnd = open_projector_with_flash_suppression(client, action.key, action.monitor_index, known_hwnds)
+            if hwnd:
+                known_hwnds.add(hwnd)  # Another projector of the same source may be opened next
+                time.sleep(0.2) # Stagger opening projectors
+            else:
+                ok = False
                 break
+        elif action.kind == MOVE:
+            left, top, right, bottom = action.rect
+            try:
+                win32gui.SetWindowPos(action.hwnd, 0, left, top, right - left, bottom - top,
+                                      win32con.SWP_NOZORDER | win32con.SWP_NOACTIVATE)
+            except Exception as e:
+                print(f"  ⚠️ Could not move '{CONFIG[action.key]['title']}' ({e}); closing it so it can be reopened.")
+                REGISTRY.unbind(action.key)
+                win32gui.PostMessage(action.hwnd, win32con.WM_CLOSE, 0, 0)
+        elif action.kind == CLOSE:
+            win32gui.PostMessage(action.hwnd, win32con.WM_CLOSE, 0, 0)
 
-    unique_found_keys = list(set(found_config_keys))
-    success = len(unique_found_keys) >= len(CONFIG)
-    print(f"  → Expected: {len(CONFIG)}, Found matching: {len(unique_found_keys)} {unique_found_keys}")
+    FLASH_SUPPRESSOR.flush()
+    return ok
+
+def reconcile_projectors(client, dry_run=False, monitors=None):
+    """
+    Observes the current state, computes a single plan of open/move/close/skip actions
+    against CONFIG and executes it (or only prints it when `dry_run` is set).
+    Returns False if the websocket connection should be dropped.
+    """
+    windows, monitors, obs_monitors, scenes = observe_projector_state(client, monitors)
+    plan = plan_actions(CONFIG, windows, monitors, obs_monitors, scenes)
+
+    print(f"📋 Plan ({len(plan.assignments)}/{len(CONFIG)} projectors in place):")
+    for line in format_plan(plan, CONFIG):
+        print(line)
+    if dry_run:
+        print("  (dry run - nothing was changed)")
+        return True
+
+    titles = {window['hwnd']: window['title'] for window in windows}
+    bound = REGISTRY.bound_hwnds()
+    newly_bound = [hwnd for hwnd in plan.assignments.values() if hwnd not in bound]
+    for config_key, hwnd in plan.assignments.items():
+        REGISTRY.bind(config_key, hwnd, titles.get(hwnd, ""))
+    missing = [key for key in CONFIG if key not in plan.assignments]
+    for config_key in missing:
+        REGISTRY.unbind(config_key)
+    # A projector left closed because its monitor is off isn't an outage
+    switched_off = {action.key for action in plan.actions if action.kind == SKIP and action.reason == MONITOR_OFF}
+    AVAILABILITY.observe(list(plan.assignments), [key for key in missing if key not in switched_off], switched_off)
+
+    # Projectors we didn't open ourselves (OBS restored them, or they were already open) flash
+    # like any other; execute_plan() flushes them together with the ones it opens.
+    for hwnd in newly_bound:
+        FLASH_SUPPRESSOR.queue(hwnd)
+    return execute_plan(plan, client, windows)
+
+def wait_for_next_check():
+    """Sleeps until the next monitor check is due, or until an immediate re-check is requested."""
+    if RECHECK_REQUESTED.wait(CHECK_INTERVAL):
+        RECHECK_REQUESTED.clear()
+
+def run_monitor_cycle(check_count):
+    """
+    Runs a single monitor check: reconnects if needed and reconciles the projectors
+    with CONFIG. Returns False if monitoring should stop (OBS was closed).
+    """
+    print(f"\n🔍 Monitor Check #{check_count} - {time.strftime('%H:%M:%S')}")
+    GOVERNOR.begin_cycle()
+    try:
+        return check_projectors()
+    finally:
+        GOVERNOR.end_cycle()
+
+def check_projectors():
+    """Body of a monitor check; see run_monitor_cycle()."""
+    # A phase backed off after a stall is skipped (the process check assumes OBS is still up)
+    if WATCHDOG.attempt('obs process') and not is_obs_running():
+        print("🛑 OBS has been closed - stopping monitoring.")
+        return False
+    if OBSBOT and WATCHDOG.attempt('obsbot'):
+        OBSBOT.ensure_running()
     
-    return success, projectors
+    if WEBSOCKET_CLIENT is None:
+        if not WATCHDOG.attempt('connect'):
+            print("⏸️ Not reconnecting to OBS yet: the last attempt hung.")
+            return True
+        connect_to_obs_websocket(max_retries=2) # This populates the global client
+        if WEBSOCKET_CLIENT is None:
+            print("❌ WebSocket connection failed, will retry next cycle.")
+            return True
+    
+    # This check may be abandoned by the watchdog while it waits on OBS; it then only ever
+    # drops the session it started with, never the one the next check opened.
+    client = WEBSOCKET_CLIENT
+    try:
+        if WATCHDOG.attempt('stats'):
+            GOVERNOR.observe_stats(client.call("GetStats"))
+        if not reconcile_projectors(client):
+            print("  ❌ An error occurred during projector opening. Will try to reconnect.")
+            drop_websocket(client)
 
-def monitor_projectors_continuously():
-    """Continuously monitor and maintain projectors until a shutdown is requested."""
-    global WEBSOCKET_CLIENT # This function will now manage the global client connection
+    except Exception as e:
+        print(f"❌ Error during projector check: {e}")
+        drop_websocket(client)
+    return True
+
+def drop_websocket(client):
+    """Disconnects `client` and clears WEBSOCKET_CLIENT, unless another session has replaced it since."""
+    global WEBSOCKET_CLIENT
+    if client is None or WEBSOCKET_CLIENT is not client:
+        return
+    WEBSOCKET_CLIENT = None
+    try: client.disconnect()
+    except: pass
+
+# Phases that talk to OBS over the websocket; a stall in one of them drops the session
+WEBSOCKET_PHASES = {'connect', 'stats', 'obs monitors', 'scenes', 'execute'}
 
+def recover_from_stall(phase):
+    """Watchdog recovery: throws away what the stalled phase was using, so the restarted check rebuilds it."""
+    global WEBSOCKET_CLIENT
+    if phase in WEBSOCKET_PHASES and WEBSOCKET_CLIENT is not None:
+        client, WEBSOCKET_CLIENT = WEBSOCKET_CLIENT, None
+        # Closing a connection OBS doesn't answer on can block as well, so don't wait for it
+        threading.Thread(target=client.close, name="drop websocket", daemon=True).start()
+        print("  -> Dropped the OBS websocket session; the next check reconnects.")
+    elif phase == 'monitors':
+        # WMI connections are per thread, so the new worker thread opens a fresh one once the
+        # back-off is over; until then the last monitor power states are reused
+        print("  -> Reusing the last monitor power states; the next WMI query uses a new connection.")
+
+def monitor_projectors_continuously(startup_delay=None):
+    """Continuously monitor and maintain projectors until a shutdown is requested."""
     print(f"\n🛡️ Starting continuous monitoring mode (checking every {CHECK_INTERVAL} seconds)")
     print("💡 This will run in the background. Close window or press Ctrl+C for graceful shutdown.")
     
-    if STARTUP_DELAY > 0 and not SHUTDOWN_REQUESTED:
-        print(f"⏳ Startup delay: waiting {STARTUP_DELAY} seconds before first check...")
-        time.sleep(STARTUP_DELAY)
+    if startup_delay is None:
+        startup_delay = STARTUP_DELAY
+    if startup_delay > 0 and not SHUTDOWN_REQUESTED:
+        print(f"⏳ Startup delay: waiting {startup_delay} seconds before first check...")
+        time.sleep(startup_delay)
     
+    start_frame_probe()
     check_count = 1
+    last_export = time.monotonic()
     
     while not SHUTDOWN_REQUESTED:
-        print(f"\n🔍 Monitor Check #{check_count} - {time.strftime('%H:%M:%S')}")
-        
-        if not is_obs_running():
-            print("🛑 OBS has been closed - stopping monitoring.")
+        completed, keep_going = WATCHDOG.run(run_monitor_cycle, check_count)
+        if completed and not keep_going:
             break
-        
-        if WEBSOCKET_CLIENT is None:
-            connect_to_obs_websocket(max_retries=2) # This populates the global client
-            if WEBSOCKET_CLIENT is None:
-                print("❌ WebSocket connection failed, will retry next cycle.")
-                check_count += 1
-                if not SHUTDOWN_REQUESTED: time.sleep(CHECK_INTERVAL)
-                continue
-        
-        try:
-            monitor_details = get_all_monitor_details()
-            missing, found = check_missing_projectors()
-            
-            if not missing:
-                print("✅ All projectors running correctly")
-            else:
-                print(f"⚠️ Missing projectors detected: {missing}")
-                
-                for monitor_id in missing:
-                    if SHUTDOWN_REQUESTED: break
-                    config = CONFIG[monitor_id]
-                    result = open_projector_with_flash_suppression(WEBSOCKET_CLIENT, config, monitor_details)
-                    
-                    if result is True:
-                        time.sleep(0.5)
-                    elif result is False:
-                        print("  ❌ An error occurred during projector opening. Will try to reconnect.")
-                        try: WEBSOCKET_CLIENT.disconnect()
-                        except: pass
-                        WEBSOCKET_CLIENT = None
-                        break 
+        if SHUTDOWN_REQUESTED:
+            break
+        if not completed:
+            check_count += 1
+            continue  # Restart the check straight away on a new worker
+
+        record_warm_state()
+        if export_availability_if_requested():
+            last_export = time.monotonic()
+        elif time.monotonic() - last_export >= AVAILABILITY_EXPORT_INTERVAL:
+            export_availability()
+            last_export = time.monotonic()
+        check_count += 1
+        wait_for_next_check()
             
-            if SHUTDOWN_REQUESTED: break
+    WATCHDOG.stop()
+    print("🔚 Monitoring loop ended.")
+    if not SHUTDOWN_REQUESTED:
+        report_availability()
 
-            if WEBSOCKET_CLIENT is None: # If connection was dropped
-                check_count += 1
-                if not SHUTDOWN_REQUESTED: time.sleep(CHECK_INTERVAL)
-                continue
+def start_frame_probe():
+    """Starts the background frame liveness probe for the configured sources, if enabled."""
+    global FRAME_PROBE
+    if FRAME_PROBE_INTERVAL <= 0 or FRAME_PROBE is not None:
+        return
+    sources = [PROGRAM if config.get("type") == "program" else config["scene"] for config in CONFIG.values()
+               if config.get("type") == "program" or config.get("scene")]
+    FRAME_PROBE = FrameProbe(lambda: RequestSession(open_obs_connection, metrics=REQUEST_METRICS),
+                             sources, interval=FRAME_PROBE_INTERVAL, frozen_after=FRAME_PROBE_FROZEN_AFTER,
+                             gate=lambda: GOVERNOR.allow('frame_probe'))
+    if not FRAME_PROBE.start():
+        FRAME_PROBE = None
+
+def record_warm_state():
+    """Persists the current supervision state for a fast warm restart (only writes when it changed)."""
+    if OBS_PROCESS is None:
+        return
+    try:
+        create_time = OBS_PROCESS.create_time()
+    except psutil.Error:
+        return
+    monitor_fingerprint = get_monitor_fingerprint()
+    WARM_STATE.update(
+        obs_pid=OBS_PROCESS.pid,
+        obs_create_time=create_time,
+        monitor_fingerprint=monitor_fingerprint,
+        config_fingerprint=get_config_fingerprint(),
+    )
+    WARM_STATE.save()
+    if MONITOR_LAYOUT:
+        MONITOR_LAYOUT.record(monitor_fingerprint, LAST_OBSERVED['obs_monitors'])
+
+def try_warm_resume():
+    """
+    Checks the state file left by a previous launcher instance. If OBS, the monitor layout,
+    the config and every recorded projector window are unchanged, adopts that state and
+    returns True so the cold startup path can be skipped.
+    """
+    global OBS_PROCESS
+    state = WARM_STATE.load()
+    if not state:
+        return False
 
-            time.sleep(1) 
-            if not SHUTDOWN_REQUESTED:
-                check_and_correct_projector_positions(WEBSOCKET_CLIENT)
+    try:
+        proc = psutil.Process(state["obs_pid"])
+        if abs(proc.create_time() - state["obs_create_time"]) > 0.01:
+            return False
+    except (psutil.Error, TypeError, ValueError):
+        return False
 
-        except Exception as e:
-            print(f"❌ Error during projector check: {e}")
-            if WEBSOCKET_CLIENT:
-                try: WEBSOCKET_CLIENT.disconnect()
-                except: pass
-            WEBSOCKET_CLIENT = None
-        
-        check_count += 1
-        if not SHUTDOWN_REQUESTED:
-            time.sleep(CHECK_INTERVAL)
-            
-    print("🔚 Monitoring loop ended.")
+    if state.get("config_fingerprint") != get_config_fingerprint():
+        print("ℹ️ Configuration changed since last run - doing a full startup.")
+        return False
+    if state.get("monitor_fingerprint") != get_monitor_fingerprint():
+        print("ℹ️ Monitor layout changed since last run - doing a full startup.")
+        return False
 
-def is_obsbot_running():
-    """Check if OBSBOT Center is already running and store the process object."""
-    global OBSBOT_PROCESS
-    for proc in psutil.process_iter(['name']):
-        try:
-            if proc.info['name'] and 'obsbot' in proc.info['name'].lower():
-                OBSBOT_PROCESS = proc
-                return True
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
-    OBSBOT_PROCESS = None
-    return False
+    projectors = state["projectors"]
+    for config_key, hwnd in projectors.items():
+        if config_key not in CONFIG or not win32gui.IsWindow(hwnd):
+            return False
+
+    OBS_PROCESS = proc
+    REGISTRY.adopt(projectors)
+    for hwnd in projectors.values():
+        FLASH_SUPPRESSOR.mark_handled(hwnd)  # Already suppressed by the previous instance
+    print(f"♻️ Resuming supervision of OBS (PID {proc.pid}) with {len(projectors)} known projectors.")
+    return True
+
+def launch_obsbot_center():
+    """Launches OBSBOT Center if it isn't running; from then on it's supervised by the monitor loop."""
+    OBSBOT.ensure_running(wait=2)
+
+def close_obsbot_main_window():
+    """Asks OBSBOT Center to close. Returns True if its window was found."""
+    obsbot_hwnd = find_obsbot_main_window()
+    if not obsbot_hwnd:
+        return False
+    print("  -> Sending WM_CLOSE to OBSBOT Center window...")
+    win32gui.PostMessage(obsbot_hwnd, win32con.WM_CLOSE, 0, 0)
+    return True
+
+def start_obs_stage():
+    if not start_obs():
+        raise StageFailed("Could not start OBS")
+
+def connect_stage(_):
+    # OBS may still be loading when its window appears: retry often instead of every 3 s
+    if not connect_to_obs_websocket(max_retries=30, retry_delay=0.5):
+        raise StageFailed("Could not connect to OBS")
+    return WEBSOCKET_CLIENT
+
+def open_projectors_stage(client, monitors):
+    print("\n🔍 Checking existing projectors...")
+    reconcile_projectors(client, monitors=monitors)
+
+def verify_projectors_stage(_):
+    time.sleep(2)
+    if SHUTDOWN_REQUESTED: return
+    print("\n🔍 Verifying projectors...")
+    reconcile_projectors(WEBSOCKET_CLIENT)
+
+def build_startup_pipeline():
+    """
+    The cold-start path as a dependency graph. OBS, OBSBOT Center and the monitor power
+    check (WMI, so every worker thread initializes COM) start together; the websocket
+    connection follows OBS, and the projectors are opened as soon as both the connection
+    and the monitors are ready.
+    """
+    pipeline = StartupPipeline(initializer=pythoncom.CoInitialize)
+    pipeline.add("obs", start_obs_stage)
+    pipeline.add("monitors", read_monitor_power)
+    pipeline.add("obsbot", launch_obsbot_center)
+    pipeline.add("websocket", connect_stage, requires=("obs",))
+    pipeline.add("projectors", open_projectors_stage, requires=("websocket", "monitors"))
+    pipeline.add("verify", verify_projectors_stage, requires=("projectors",))
+    return pipeline
 
 def run_single_check():
     """Run a single check, managed by the shutdown handler."""
@@ -825,32 +863,9 @@ def run_single_check():
     print("=" * 50)
     
     if SHUTDOWN_REQUESTED: return
-    if not start_obs():
-        print("\n💥 FAILURE: Could not start OBS")
-        return
-
-    if SHUTDOWN_REQUESTED: return
-    connect_to_obs_websocket()
-    if not WEBSOCKET_CLIENT:
-        print("\n💥 FAILURE: Could not connect to OBS")
-        return
-    
+    pipeline = build_startup_pipeline()
     try:
-        if SHUTDOWN_REQUESTED: return
-        print("\n🔍 Checking existing projectors...")
-        open_missing_projectors_enhanced(WEBSOCKET_CLIENT)
-        
-        if SHUTDOWN_REQUESTED: return
-        time.sleep(2)
-        verify_projectors_exist()
-
-        if SHUTDOWN_REQUESTED: return
-        time.sleep(1)
-        check_and_correct_projector_positions(WEBSOCKET_CLIENT)
-
-    except Exception as e:
-        print(f"\n💥 UNEXPECTED ERROR during single check: {e}")
-        
+        pipeline.run(should_stop=lambda: SHUTDOWN_REQUESTED)
     finally:
         # Disconnect only if not in monitor mode and no shutdown is happening
         if not MONITOR_MODE and not SHUTDOWN_REQUESTED:
@@ -859,37 +874,86 @@ def run_single_check():
                 except: pass
             WEBSOCKET_CLIENT = None
 
-    if SHUTDOWN_REQUESTED: return
-    
-    # Launch OBSBOT Center
-    if not is_obsbot_running():
-        print("🚀 Launching OBSBOT Center...")
-        try:
-            obsbot_shortcut = r"C:\Users\Public\Desktop\OBSBOT Center.lnk"
-            os.startfile(obsbot_shortcut)
-            # Give it a moment to start and then find the process
-            time.sleep(2)
-            is_obsbot_running() 
-        except Exception as e:
-            print(f"❌ Failed to launch OBSBOT Center: {e}")
-    else:
-        print("ℹ️ OBSBOT Center is already running.")
+    for timing in pipeline.timings.values():
+        if timing.status == FAILED:
+            print(f"\n💥 FAILURE in {timing.name}: {timing.error}")
+    pipeline.print_report()
+    if 'websocket' in pipeline.results:
+        record_warm_state()
 
-    if not MONITOR_MODE:
+    if not MONITOR_MODE and not SHUTDOWN_REQUESTED:
         print("\n✅ Single run check complete!")
 
-def main():
+def parse_args(argv=None):
+    """Parses the command line. Without arguments the launcher behaves as configured by the constants above."""
+    parser = argparse.ArgumentParser(description="Start OBS and keep its projectors open on the configured screens.")
+    parser.add_argument("--profile", action="store_true",
+                        help="run monitor cycles under cProfile and tracemalloc, write a report and exit")
+    parser.add_argument("--cycles", type=int, default=50,
+                        help="number of monitor cycles to profile (default: 50)")
+    parser.add_argument("--simulate", action="store_true",
+                        help="use simulated OBS, window and monitor backends (with --profile or --dry-run)")
+    parser.add_argument("--report",
+                        help="where to write the profile report (default: profile_report.txt next to config.json)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="print the projector action plan for the current state without executing it, then exit")
+    parser.add_argument("--frame-probe", type=float, default=FRAME_PROBE_INTERVAL, metavar="SECONDS",
+                        help="check projected sources for black or frozen output every SECONDS in monitor mode (0 = off)")
+    parser.add_argument("--obs-restore", action="store_true", default=OBS_RESTORE_PROJECTORS,
+                        help="before launching OBS, write the projectors into OBS's config so OBS opens them itself")
+    parser.add_argument("--obsbot-path", default=OBSBOT_LAUNCH_PATH,
+                        help="program or shortcut that starts OBSBOT Center (empty to not start it)")
+    parser.add_argument("--export-availability", action="store_true",
+                        help="ask the launcher that is already running to export availability.csv/.json now, then exit")
+    args = parser.parse_args(argv)
+    if args.simulate and not (args.profile or args.dry_run):
+        parser.error("--simulate can only be used together with --profile or --dry-run")
+    return args
+
+def main(argv=None):
     """Main function - chooses between single run or continuous monitoring"""
+    global WARM_STATE, REGISTRY, OBSBOT, MONITOR_LAYOUT, FRAME_PROBE_INTERVAL, OBS_RESTORE_PROJECTORS
+    args = parse_args(argv)
+    if args.export_availability:
+        request_availability_export()
+        return
+    FRAME_PROBE_INTERVAL = args.frame_probe
+    OBS_RESTORE_PROJECTORS = args.obs_restore
     # Register the shutdown handler for graceful exit on Ctrl+C, close, etc.
     win32api.SetConsoleCtrlHandler(shutdown_handler, True)
 
     load_config()
+    WARM_STATE = WarmState(get_state_path())
+    REGISTRY = ProjectorRegistry(WARM_STATE, owner_pid=obs_pid)
+    MONITOR_LAYOUT = MonitorLayoutCache(get_monitor_layout_path())
+    OBSBOT = SupervisedProcess("OBSBOT Center", args.obsbot_path, "obsbot", on_exit=RECHECK_REQUESTED.set)
 
     # If a shutdown is requested during setup, don't proceed.
     if SHUTDOWN_REQUESTED:
         return
 
-    if MONITOR_MODE:
+    if args.profile:
+        from profiling import run_profile
+        report_path = args.report or os.path.join(os.path.dirname(get_config_path()), "profile_report.txt")
+        run_profile(sys.modules[__name__], args.cycles, report_path, simulate=args.simulate)
+        return
+
+    if args.dry_run:
+        if args.simulate:
+            import simulation
+            simulation.install(sys.modules[__name__])
+        if not is_obs_running() or (WEBSOCKET_CLIENT is None and not connect_to_obs_websocket(max_retries=1)):
+            print("❌ OBS is not running or not reachable - nothing to plan against.")
+            return
+        reconcile_projectors(WEBSOCKET_CLIENT, dry_run=True)
+        return
+
+    if MONITOR_MODE and try_warm_resume():
+        # Warm restart: OBS and the projectors are already up, go straight to steady state.
+        launch_obsbot_center()
+        if not SHUTDOWN_REQUESTED:
+            monitor_projectors_continuously(startup_delay=0)
+    elif MONITOR_MODE:
         run_single_check()
         if not SHUTDOWN_REQUESTED:
             monitor_projectors_continuously()
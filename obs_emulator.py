@@ -0,0 +1,726 @@
+#!/usr/bin/env python3
+"""
+Local obs-websocket v5 emulator.
+
+Speaks the real protocol - an RFC 6455 websocket, Hello/Identify with the SHA-256
+challenge authentication, requests, request batches and events - with a small in-memory
+OBS behind it (monitors, scenes, projectors, stats). Latency, error codes and dropped
+connections can be injected per request type, and every request is counted and timed, so
+the launcher's websocket path can be measured and broken on purpose without OBS or Windows:
+
+    python obs_emulator.py --port 4455 --password secret
+    python obs_emulator.py --latency GetStats=0.05 --latency "*=0.002:0.001" --error OpenSourceProjector=600
+    python obs_emulator.py --drop-rate 0.01 --bench 2000
+
+--latency TYPE=SECONDS[:JITTER] delays TYPE ("*" for every request type), --error TYPE=CODE
+fails it with that status code, and --drop-rate closes the connection instead of answering
+that fraction of requests. --bench N runs N round trips through ws_requests.RequestSession
+against the emulator and prints client and server timings. Only the JSON encoding
+(obswebsocket.json) is supported.
+"""
+import argparse
+import base64
+import hashlib
+import json
+import random
+import secrets
+import socketserver
+import struct
+import sys
+import threading
+import time
+
+from histogram import LogHistogram
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OBS_VERSION = "30.2.0"
+OBS_WEBSOCKET_VERSION = "5.5.0"
+RPC_VERSION = 1
+
+# Message opcodes
+HELLO = 0
+IDENTIFY = 1
+IDENTIFIED = 2
+REIDENTIFY = 3
+EVENT = 5
+REQUEST = 6
+REQUEST_RESPONSE = 7
+REQUEST_BATCH = 8
+REQUEST_BATCH_RESPONSE = 9
+
+# Request status codes
+SUCCESS = 100
+MISSING_REQUEST_TYPE = 203
+UNKNOWN_REQUEST_TYPE = 204
+MISSING_REQUEST_FIELD = 300
+REQUEST_FIELD_OUT_OF_RANGE = 402
+RESOURCE_NOT_FOUND = 600
+RESOURCE_ALREADY_EXISTS = 601
+
+# Websocket close codes
+GOING_AWAY = 1001
+UNKNOWN_OP_CODE = 4003
+NOT_IDENTIFIED = 4007
+ALREADY_IDENTIFIED = 4008
+AUTHENTICATION_FAILED = 4009
+UNSUPPORTED_RPC_VERSION = 4010
+
+# Event subscription bits of the events the emulator sends
+SUBS_GENERAL = 1
+SUBS_CONFIG = 2
+SUBS_SCENES = 4
+SUBS_ALL = 0x7FF
+EVENT_CATEGORIES = {
+    "ExitStarted": SUBS_GENERAL,
+    "CurrentSceneCollectionChanging": SUBS_CONFIG,
+    "CurrentSceneCollectionChanged": SUBS_CONFIG,
+    "SceneCreated": SUBS_SCENES,
+    "SceneRemoved": SUBS_SCENES,
+    "SceneNameChanged": SUBS_SCENES,
+    "SceneListChanged": SUBS_SCENES,
+    "CurrentProgramSceneChanged": SUBS_SCENES,
+}
+
+VIDEO_MIX_TYPES = ("OBS_WEBSOCKET_VIDEO_MIX_TYPE_PREVIEW", "OBS_WEBSOCKET_VIDEO_MIX_TYPE_PROGRAM",
+                   "OBS_WEBSOCKET_VIDEO_MIX_TYPE_MULTIVIEW")
+
+
+class RequestError(Exception):
+    """Raised by a request handler to fail the request with an obs-websocket status code."""
+
+    def __init__(self, code, comment=None):
+        super().__init__(comment or f"request failed with code {code}")
+        self.code = code
+        self.comment = comment
+
+
+def auth_string(password, salt, challenge):
+    """The `authentication` value a client sends for `password` (obs-websocket v5 scheme)."""
+    secret = base64.b64encode(hashlib.sha256((password + salt).encode()).digest())
+    return base64.b64encode(hashlib.sha256(secret + challenge.encode()).digest()).decode()
+
+
+def _unmask(payload, mask):
+    key = (mask * (len(payload) // 4 + 1))[:len(payload)]
+    return (int.from_bytes(payload, 'big') ^ int.from_bytes(key, 'big')).to_bytes(len(payload), 'big')
+
+
+class _Connection:
+    """Server side of one websocket connection (RFC 6455 framing, text messages only)."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.identified = False
+        self.subscriptions = 0
+        self._buffer = b""
+        self._send_lock = threading.Lock()
+
+    def _read(self, count):
+        while len(self._buffer) < count:
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                raise ConnectionError("connection closed by the client")
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:count], self._buffer[count:]
+        return data
+
+    def handshake(self):
+        """Reads the HTTP upgrade request and accepts it. Returns False if it isn't a websocket upgrade."""
+        while b"\r\n\r\n" not in self._buffer:
+            chunk = self.sock.recv(4096)
+            if not chunk or len(self._buffer) > 65536:
+                return False
+            self._buffer += chunk
+        head, self._buffer = self._buffer.split(b"\r\n\r\n", 1)
+        headers = {}
+        for line in head.decode('latin-1').split("\r\n")[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        key = headers.get("sec-websocket-key")
+        if headers.get("upgrade", "").lower() != "websocket" or not key:
+            self.sock.sendall(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+            return False
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+        response = ["HTTP/1.1 101 Switching Protocols", "Upgrade: websocket", "Connection: Upgrade",
+                    f"Sec-WebSocket-Accept: {accept}"]
+        protocols = [p.strip() for p in headers.get("sec-websocket-protocol", "").split(",")]
+        if "obswebsocket.json" in protocols:
+            response.append("Sec-WebSocket-Protocol: obswebsocket.json")
+        self.sock.sendall(("\r\n".join(response) + "\r\n\r\n").encode())
+        return True
+
+    def receive(self):
+        """Returns the next text message, or None once the client has closed the connection."""
+        message = bytearray()
+        while True:
+            first, second = self._read(2)
+            opcode, length = first & 0x0F, second & 0x7F
+            if length == 126:
+                length = struct.unpack('>H', self._read(2))[0]
+            elif length == 127:
+                length = struct.unpack('>Q', self._read(8))[0]
+            mask = self._read(4) if second & 0x80 else None
+            payload = self._read(length)
+            if mask:
+                payload = _unmask(payload, mask)
+            if opcode == 0x8:
+                self._send_frame(0x8, payload[:2])
+                return None
+            if opcode == 0x9:
+                self._send_frame(0xA, payload)
+                continue
+            if opcode == 0xA:
+                continue
+            if opcode in (0x1, 0x2):
+                message = bytearray(payload)
+            else:
+                message += payload
+            if first & 0x80:
+                return message.decode('utf-8')
+
+    def _send_frame(self, opcode, payload):
+        length = len(payload)
+        if length < 126:
+            header = struct.pack('>BB', 0x80 | opcode, length)
+        elif length < 65536:
+            header = struct.pack('>BBH', 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack('>BBQ', 0x80 | opcode, 127, length)
+        with self._send_lock:
+            self.sock.sendall(header + payload)
+
+    def send(self, message):
+        self._send_frame(0x1, json.dumps(message).encode('utf-8'))
+
+    def close(self, code=1000, reason=""):
+        try:
+            self._send_frame(0x8, struct.pack('>H', code) + reason.encode('utf-8'))
+        except OSError:
+            pass
+        self.abort()
+
+    def abort(self):
+        """Drops the connection without a close frame, like a crashed or restarted OBS."""
+        try:
+            self.sock.shutdown(2)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        self.server.emulator._serve(_Connection(self.request))
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class ObsEmulator:
+    """
+    An obs-websocket v5 server with an in-memory OBS: `monitor_count` 1920x1080 monitors side
+    by side, `scenes`, the program scene and the projectors opened so far.
+
+    Handlers for GetVersion, GetStats, GetMonitorList, GetSceneList, GetCurrentProgramScene,
+    SetCurrentProgramScene, CreateScene, RemoveScene, SetSceneName, OpenVideoMixProjector
+    and OpenSourceProjector are built in; respond() adds or replaces one (the handler gets the
+    requestData and returns the responseData, or raises RequestError). Batches (including
+    Sleep and input/output variables) are executed request by request. Scene changes emit
+    the matching events to the clients subscribed to them.
+
+    set_latency(), set_error(), drop_rate and drop_next() inject faults. Every request is
+    counted and timed (from receipt to the reply, injected latency included); see
+    summary() and print_summary().
+    """
+
+    def __init__(self, host="127.0.0.1", port=4455, password="", monitor_count=3, scenes=("Screen 1", "Screen 2"),
+                 seed=0):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.monitors = [
+            {'monitorIndex': i, 'monitorName': f"\\\\.\\DISPLAY{i + 1}", 'monitorPositionX': i * 1920,
+             'monitorPositionY': 0, 'monitorWidth': 1920, 'monitorHeight': 1080}
+            for i in range(monitor_count)
+        ]
+        self.scenes = list(scenes)
+        self.program_scene = self.scenes[0] if self.scenes else None
+        self.collection = "Untitled"
+        self.projectors = []
+        self.cpu_usage = 5.0
+        self.active_fps = 30.0
+        self.skip_rate = 0.0
+        self.handlers = {
+            "GetVersion": self._get_version,
+            "GetStats": self._get_stats,
+            "GetMonitorList": lambda data: {"monitors": [dict(m) for m in self.monitors]},
+            "GetSceneList": self._get_scene_list,
+            "GetCurrentProgramScene": lambda data: {"currentProgramSceneName": self.program_scene,
+                                                    "sceneName": self.program_scene},
+            "SetCurrentProgramScene": lambda data: self.set_program_scene(self._scene_field(data)),
+            "CreateScene": lambda data: self.create_scene(self._field(data, "sceneName")),
+            "RemoveScene": lambda data: self.remove_scene(self._scene_field(data)),
+            "SetSceneName": lambda data: self.rename_scene(self._scene_field(data),
+                                                           self._field(data, "newSceneName")),
+            "OpenVideoMixProjector": self._open_video_mix_projector,
+            "OpenSourceProjector": self._open_source_projector,
+        }
+        # Fault injection
+        self.latency = {}  # request type (or "*") -> (seconds, jitter)
+        self.errors = {}   # request type -> (code, comment)
+        self.drop_rate = 0.0
+        self._drop_next = 0
+        # Metrics
+        self.timings = {}
+        self.error_counts = {}
+        self.connections = 0
+        self.dropped = 0
+        self.auth_failures = 0
+        self.events_sent = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+        self._clients = set()
+        self._started_at = time.monotonic()
+        self._server = None
+        self._thread = None
+
+    # --- Server ---
+
+    def start(self):
+        """Starts serving in the background. Returns the port (useful with port=0)."""
+        self._server = _Server((self.host, self.port), _Handler)
+        self._server.emulator = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="obs emulator", daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self):
+        """Sends ExitStarted, closes every connection and stops listening."""
+        self.emit("ExitStarted")
+        for client in self._snapshot_clients():
+            client.close(GOING_AWAY, "Server stopping.")
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _snapshot_clients(self):
+        with self._lock:
+            return list(self._clients)
+
+    def _serve(self, connection):
+        try:
+            if not connection.handshake():
+                connection.abort()
+                return
+        except OSError:
+            connection.abort()
+            return
+        with self._lock:
+            self._clients.add(connection)
+            self.connections += 1
+        try:
+            challenge, salt = secrets.token_urlsafe(32), secrets.token_urlsafe(32)
+            hello = {"obsWebSocketVersion": OBS_WEBSOCKET_VERSION, "rpcVersion": RPC_VERSION}
+            if self.password:
+                hello["authentication"] = {"challenge": challenge, "salt": salt}
+            connection.send({"op": HELLO, "d": hello})
+            while True:
+                text = connection.receive()
+                if text is None:
+                    break
+                message = json.loads(text)
+                op, data = message.get("op"), message.get("d") or {}
+                if op == IDENTIFY:
+                    if not self._identify(connection, data, salt, challenge):
+                        break
+                elif not connection.identified:
+                    connection.close(NOT_IDENTIFIED, "The session is not identified.")
+                    break
+                elif op == REIDENTIFY:
+                    connection.subscriptions = data.get("eventSubscriptions", connection.subscriptions)
+                    connection.send({"op": IDENTIFIED, "d": {"negotiatedRpcVersion": RPC_VERSION}})
+                elif op in (REQUEST, REQUEST_BATCH):
+                    if self._should_drop():
+                        connection.abort()
+                        break
+                    connection.send(self._request(data) if op == REQUEST else self._batch(data))
+                else:
+                    connection.close(UNKNOWN_OP_CODE, f"Unknown OpCode: {op}")
+                    break
+        except (OSError, ValueError):
+            pass  # Connection lost, or the client sent something that isn't JSON
+        finally:
+            with self._lock:
+                self._clients.discard(connection)
+            connection.abort()
+
+    def _identify(self, connection, data, salt, challenge):
+        if connection.identified:
+            connection.close(ALREADY_IDENTIFIED, "You are already Identified with the obs-websocket server.")
+            return False
+        if data.get("rpcVersion") != RPC_VERSION:
+            connection.close(UNSUPPORTED_RPC_VERSION, f"RPC version {data.get('rpcVersion')} is not supported.")
+            return False
+        if self.password and data.get("authentication") != auth_string(self.password, salt, challenge):
+            with self._lock:
+                self.auth_failures += 1
+            connection.close(AUTHENTICATION_FAILED, "Authentication failed.")
+            return False
+        connection.identified = True
+        connection.subscriptions = data.get("eventSubscriptions", SUBS_ALL)
+        connection.send({"op": IDENTIFIED, "d": {"negotiatedRpcVersion": RPC_VERSION}})
+        return True
+
+    # --- Requests ---
+
+    def _request(self, data):
+        status, response = self._execute(data.get("requestType"), data.get("requestData") or {})
+        reply = {"requestType": data.get("requestType"), "requestId": data.get("requestId"), "requestStatus": status}
+        if response is not None:
+            reply["responseData"] = response
+        return {"op": REQUEST_RESPONSE, "d": reply}
+
+    def _batch(self, data):
+        started = time.perf_counter()
+        results, variables = [], {}
+        for request in data.get("requests", []):
+            request_type = request.get("requestType")
+            request_data = dict(request.get("requestData") or {})
+            for field, variable in (request.get("inputVariables") or {}).items():
+                if variable in variables:
+                    request_data[field] = variables[variable]
+            if request_type == "Sleep":
+                time.sleep(request_data.get("sleepMillis", 0) / 1000.0)
+                status, response = {"result": True, "code": SUCCESS}, None
+            else:
+                status, response = self._execute(request_type, request_data)
+            result = {"requestType": request_type, "requestStatus": status}
+            if "requestId" in request:
+                result["requestId"] = request["requestId"]
+            if response is not None:
+                result["responseData"] = response
+                for variable, field in (request.get("outputVariables") or {}).items():
+                    if field in response:
+                        variables[variable] = response[field]
+            results.append(result)
+            if data.get("haltOnFailure") and not status["result"]:
+                break
+        self._record("RequestBatch", time.perf_counter() - started, True)
+        return {"op": REQUEST_BATCH_RESPONSE, "d": {"requestId": data.get("requestId"), "results": results}}
+
+    def _execute(self, request_type, data):
+        """Runs one request with the injected latency and errors. Returns (requestStatus, responseData)."""
+        started = time.perf_counter()
+        delay = self._delay(request_type)
+        if delay:
+            time.sleep(delay)
+        response = None
+        try:
+            if not request_type:
+                raise RequestError(MISSING_REQUEST_TYPE, "Your request is missing a `requestType`")
+            error = self.errors.get(request_type)
+            if error:
+                raise RequestError(*error)
+            handler = self.handlers.get(request_type)
+            if handler is None:
+                raise RequestError(UNKNOWN_REQUEST_TYPE, f"Your request type `{request_type}` is not valid.")
+            with self._lock:
+                response = handler(data)
+            status = {"result": True, "code": SUCCESS}
+        except RequestError as e:
+            status = {"result": False, "code": e.code, "comment": e.comment}
+        self._record(request_type or "", time.perf_counter() - started, status["result"])
+        return status, response
+
+    def _delay(self, request_type):
+        seconds, jitter = self.latency.get(request_type) or self.latency.get("*") or (0.0, 0.0)
+        return max(0.0, seconds + self._rng.uniform(-jitter, jitter)) if jitter else seconds
+
+    def _should_drop(self):
+        with self._lock:
+            if self._drop_next:
+                self._drop_next -= 1
+            elif not (self.drop_rate and self._rng.random() < self.drop_rate):
+                return False
+            self.dropped += 1
+            return True
+
+    def _record(self, request_type, seconds, ok):
+        with self._lock:
+            histogram = self.timings.get(request_type)
+            if histogram is None:
+                histogram = self.timings[request_type] = LogHistogram(min_value=0.00001, max_value=60.0)
+            histogram.record(seconds)
+            if not ok:
+                self.error_counts[request_type] = self.error_counts.get(request_type, 0) + 1
+
+    # --- Fault injection ---
+
+    def respond(self, request_type, handler):
+        """Answers `request_type` with handler(requestData) -> responseData (None for no data)."""
+        self.handlers[request_type] = handler
+
+    def set_latency(self, request_type, seconds, jitter=0.0):
+        """Delays every `request_type` request ("*": every type without its own latency)."""
+        self.latency[request_type] = (seconds, jitter)
+
+    def set_error(self, request_type, code, comment=None):
+        """Fails every `request_type` request with `code`; code None clears the error."""
+        if code is None:
+            self.errors.pop(request_type, None)
+        else:
+            self.errors[request_type] = (code, comment)
+
+    def drop_next(self, count=1):
+        """Closes the connection instead of answering the next `count` requests."""
+        with self._lock:
+            self._drop_next += count
+
+    def drop_connections(self):
+        """Drops every open connection now, without a close frame."""
+        for client in self._snapshot_clients():
+            client.abort()
+
+    # --- Events and scene state ---
+
+    def emit(self, event_type, data=None):
+        """Sends an event to every identified client subscribed to its category. Returns how many got it."""
+        intent = EVENT_CATEGORIES.get(event_type, SUBS_GENERAL)
+        message = {"op": EVENT, "d": {"eventType": event_type, "eventIntent": intent}}
+        if data is not None:
+            message["d"]["eventData"] = data
+        sent = 0
+        for client in self._snapshot_clients():
+            if client.identified and client.subscriptions & intent:
+                try:
+                    client.send(message)
+                    sent += 1
+                except OSError:
+                    pass
+        with self._lock:
+            self.events_sent += sent
+        return sent
+
+    def _scene_list_changed(self):
+        self.emit("SceneListChanged", {"scenes": self._get_scene_list(None)["scenes"]})
+
+    def create_scene(self, name):
+        with self._lock:
+            if name in self.scenes:
+                raise RequestError(RESOURCE_ALREADY_EXISTS, "A source already exists by that scene name.")
+            self.scenes.append(name)
+        self.emit("SceneCreated", {"sceneName": name, "isGroup": False})
+        self._scene_list_changed()
+
+    def remove_scene(self, name):
+        with self._lock:
+            if name not in self.scenes:
+                raise RequestError(RESOURCE_NOT_FOUND, f"No source was found by the name of `{name}`.")
+            self.scenes.remove(name)
+        self.emit("SceneRemoved", {"sceneName": name, "isGroup": False})
+        self._scene_list_changed()
+
+    def rename_scene(self, name, new_name):
+        with self._lock:
+            if name not in self.scenes:
+                raise RequestError(RESOURCE_NOT_FOUND, f"No source was found by the name of `{name}`.")
+            if new_name in self.scenes:
+                raise RequestError(RESOURCE_ALREADY_EXISTS, "A source already exists by that new scene name.")
+            self.scenes[self.scenes.index(name)] = new_name
+            if self.program_scene == name:
+                self.program_scene = new_name
+        self.emit("SceneNameChanged", {"oldSceneName": name, "sceneName": new_name})
+        self._scene_list_changed()
+
+    def set_program_scene(self, name):
+        with self._lock:
+            if name not in self.scenes:
+                raise RequestError(RESOURCE_NOT_FOUND, f"No source was found by the name of `{name}`.")
+            self.program_scene = name
+        self.emit("CurrentProgramSceneChanged", {"sceneName": name})
+
+    def switch_collection(self, name, scenes):
+        """Replaces the scene collection, with the events OBS sends around the switch."""
+        self.emit("CurrentSceneCollectionChanging", {"sceneCollectionName": self.collection})
+        with self._lock:
+            self.collection = name
+            self.scenes = list(scenes)
+            self.program_scene = self.scenes[0] if self.scenes else None
+        self.emit("CurrentSceneCollectionChanged", {"sceneCollectionName": name})
+
+    # --- Built-in handlers ---
+
+    def _field(self, data, name):
+        if name not in data:
+            raise RequestError(MISSING_REQUEST_FIELD, f"Your request is missing the `{name}` field.")
+        return data[name]
+
+    def _scene_field(self, data):
+        return data["sceneName"] if "sceneName" in data else self._field(data, "sourceName")
+
+    def _get_version(self, data):
+        return {"obsVersion": OBS_VERSION, "obsWebSocketVersion": OBS_WEBSOCKET_VERSION, "rpcVersion": RPC_VERSION,
+                "availableRequests": sorted(self.handlers), "supportedImageFormats": ["bmp", "jpeg", "png"],
+                "platform": "windows", "platformDescription": "obs_emulator"}
+
+    def _get_stats(self, data):
+        frames = int((time.monotonic() - self._started_at) * self.active_fps)
+        skipped = int(frames * self.skip_rate)
+        return {"cpuUsage": self.cpu_usage, "memoryUsage": 512.0, "availableDiskSpace": 100000.0,
+                "activeFps": self.active_fps, "averageFrameRenderTime": 1.0,
+                "renderSkippedFrames": skipped, "renderTotalFrames": frames,
+                "outputSkippedFrames": skipped, "outputTotalFrames": frames,
+                "webSocketSessionIncomingMessages": 0, "webSocketSessionOutgoingMessages": 0}
+
+    def _get_scene_list(self, data):
+        # OBS lists scenes bottom-up: the first scene in the UI has the highest index
+        count = len(self.scenes)
+        return {"currentProgramSceneName": self.program_scene, "currentPreviewSceneName": None,
+                "scenes": [{"sceneIndex": count - 1 - i, "sceneName": name}
+                           for i, name in reversed(list(enumerate(self.scenes)))]}
+
+    def _monitor_index(self, data):
+        index = data.get("monitorIndex", -1)
+        if index >= len(self.monitors):
+            raise RequestError(REQUEST_FIELD_OUT_OF_RANGE, "The specified monitor index is out of range.")
+        return index
+
+    def _open_video_mix_projector(self, data):
+        mix = self._field(data, "videoMixType")
+        if mix not in VIDEO_MIX_TYPES:
+            raise RequestError(REQUEST_FIELD_OUT_OF_RANGE, f"Unknown video mix type `{mix}`.")
+        self.projectors.append({'type': mix, 'monitorIndex': self._monitor_index(data)})
+        return None
+
+    def _open_source_projector(self, data):
+        source = self._field(data, "sourceName")
+        if source not in self.scenes:
+            raise RequestError(RESOURCE_NOT_FOUND, f"No source was found by the name of `{source}`.")
+        self.projectors.append({'type': "source", 'sourceName': source, 'monitorIndex': self._monitor_index(data)})
+        return None
+
+    # --- Metrics ---
+
+    def summary(self):
+        """One row per request type, server-side times in milliseconds."""
+        with self._lock:
+            rows = []
+            for request_type, histogram in sorted(self.timings.items()):
+                stats = histogram.summary()
+                rows.append({
+                    'request_type': request_type,
+                    'count': stats['count'],
+                    'p50_ms': round(stats['p50'] * 1000, 2),
+                    'p95_ms': round(stats['p95'] * 1000, 2),
+                    'max_ms': round(stats['max'] * 1000, 2),
+                    'errors': self.error_counts.get(request_type, 0),
+                })
+            return rows
+
+    def print_summary(self):
+        rows = self.summary()
+        total = sum(row['count'] for row in rows if row['request_type'] != "RequestBatch")
+        print(f"\n📊 Emulator: {self.connections} connections, {total} requests, {self.dropped} dropped connections, "
+              f"{self.auth_failures} failed logins, {self.events_sent} events sent")
+        for row in rows:
+            line = f"  → {row['request_type']}: {row['count']}, p50 {row['p50_ms']} ms / p95 {row['p95_ms']} ms / max {row['max_ms']} ms"
+            if row['errors']:
+                line += f", {row['errors']} errors"
+            print(line)
+
+
+def run_bench(emulator, count, request_types):
+    """Sends `count` requests (cycling through `request_types`) through a RequestSession and prints the timings."""
+    from obsws_python import ReqClient
+    from obsws_python.error import OBSSDKError
+    from ws_requests import RequestMetrics, RequestSession
+
+    def connect():
+        return ReqClient(host=emulator.host, port=emulator.port, password=emulator.password, timeout=5)
+
+    metrics = RequestMetrics()
+    session = RequestSession(connect, metrics=metrics)
+    failures = 0
+    started = time.perf_counter()
+    for i in range(count):
+        try:
+            session.call(request_types[i % len(request_types)])
+        except OBSSDKError:
+            failures += 1
+    elapsed = time.perf_counter() - started
+    session.close()
+    print(f"\n🏁 {count} requests in {elapsed:.2f}s ({count / elapsed:.0f}/s), {failures} failed")
+    metrics.print_summary()
+
+
+def _parse_latency(text):
+    try:
+        request_type, value = text.split("=", 1)
+        seconds, _, jitter = value.partition(":")
+        return request_type, float(seconds), float(jitter or 0)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected TYPE=SECONDS[:JITTER], got '{text}'")
+
+
+def _parse_error(text):
+    try:
+        request_type, code = text.split("=", 1)
+        return request_type, int(code)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected TYPE=CODE, got '{text}'")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Emulate an obs-websocket v5 server for load and fault testing.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=4455, help="port to listen on (default: 4455, 0 = any free port)")
+    parser.add_argument("--password", default="", help="require this password (default: no authentication)")
+    parser.add_argument("--monitors", type=int, default=3, help="emulated monitors (default: 3)")
+    parser.add_argument("--scenes", nargs="*", default=["Screen 1", "Screen 2"], help="scene names")
+    parser.add_argument("--latency", action="append", default=[], type=_parse_latency, metavar="TYPE=SECONDS[:JITTER]",
+                        help="delay requests of TYPE ('*' for all types)")
+    parser.add_argument("--error", action="append", default=[], type=_parse_error, metavar="TYPE=CODE",
+                        help="fail requests of TYPE with status CODE")
+    parser.add_argument("--drop-rate", type=float, default=0.0,
+                        help="fraction of requests answered by dropping the connection (default: 0)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for jitter and drops (default: 0)")
+    parser.add_argument("--stats-every", type=float, default=0, metavar="SECONDS",
+                        help="print the request summary every SECONDS while serving (default: only on exit)")
+    parser.add_argument("--bench", type=int, default=0, metavar="N",
+                        help="send N requests through ws_requests.RequestSession, print the timings and exit")
+    parser.add_argument("--bench-requests", nargs="+", default=["GetStats", "GetMonitorList", "GetSceneList"],
+                        help="request types the benchmark cycles through")
+    args = parser.parse_args(argv)
+
+    emulator = ObsEmulator(args.host, args.port, args.password, args.monitors, args.scenes, args.seed)
+    for request_type, seconds, jitter in args.latency:
+        emulator.set_latency(request_type, seconds, jitter)
+    for request_type, code in args.error:
+        emulator.set_error(request_type, code)
+    emulator.drop_rate = args.drop_rate
+    port = emulator.start()
+    print(f"🎭 obs-websocket emulator listening on ws://{args.host}:{port}"
+          f"{' (password required)' if args.password else ''}")
+
+    try:
+        if args.bench:
+            run_bench(emulator, args.bench, args.bench_requests)
+        else:
+            while True:
+                time.sleep(args.stats_every or 3600)
+                if args.stats_every:
+                    emulator.print_summary()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator.stop()
+        emulator.print_summary()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
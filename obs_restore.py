@@ -0,0 +1,157 @@
+import configparser
+import io
+import json
+import os
+import shutil
+
+from persistence import atomic_write_json, atomic_write_text
+
+# OBS's ProjectorType values, as stored in a scene collection's saved_projectors
+PROJECTOR_TYPE_SCENE = 1
+PROJECTOR_TYPE_STUDIO_PROGRAM = 3  # The program output (what OpenVideoMixProjector PROGRAM opens)
+
+BACKUP_SUFFIX = ".obsstart.bak"
+BOM = "\ufeff"
+
+
+def obs_config_dir(app_data=None):
+    """OBS's configuration directory (%APPDATA%\\obs-studio)."""
+    return os.path.join(app_data or os.getenv('APPDATA') or "", "obs-studio")
+
+
+def _read_text(path):
+    """Returns (text, newline): the file's text with '\n' line endings, and the line ending it uses."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        text = f.read()
+    newline = "\r\n" if "\r\n" in text else "\n"
+    return text.replace("\r\n", "\n"), newline
+
+
+def _write_text(path, text, newline):
+    """Backs up `path` and rewrites it atomically with `newline` line endings."""
+    _backup(path)
+    atomic_write_text(path, text.replace("\n", newline), newline='')
+
+
+def read_ini(path):
+    """
+    Reads one of OBS's INI files. Key case is kept and values are taken literally. Returns
+    (parser, had_bom, newline), so the file can be written back the way OBS wrote it: with a
+    UTF-8 byte order mark and, on Windows, CRLF line endings.
+    """
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    parser.optionxform = str
+    text, newline = _read_text(path)
+    parser.read_string(text.lstrip(BOM), source=path)
+    return parser, text.startswith(BOM), newline
+
+
+def _render_ini(parser, bom):
+    out = io.StringIO()
+    parser.write(out, space_around_delimiters=False)
+    return (BOM if bom else "") + out.getvalue()
+
+
+def _backup(path):
+    """Keeps the file as it was before ObsStartUp first changed it; later changes don't replace that copy."""
+    backup = path + BACKUP_SUFFIX
+    if os.path.exists(path) and not os.path.exists(backup):
+        shutil.copy2(path, backup)
+
+
+def settings_ini_path(obs_dir):
+    """OBS 31 moved the per-user settings from global.ini to user.ini; returns whichever this OBS uses."""
+    user_ini = os.path.join(obs_dir, "user.ini")
+    return user_ini if os.path.exists(user_ini) else os.path.join(obs_dir, "global.ini")
+
+
+def scene_collection_path(obs_dir, settings):
+    """Path of the active scene collection's JSON file, from the [Basic] SceneCollectionFile setting."""
+    name = settings.get("Basic", "SceneCollectionFile", fallback=None)
+    if not name:
+        raise ValueError("OBS settings have no [Basic] SceneCollectionFile - has OBS been started before?")
+    return os.path.join(obs_dir, "basic", "scenes", name + ".json")
+
+
+def saved_projectors(config, obs_monitors):
+    """
+    Translates CONFIG into saved_projectors entries. A projector's monitor is found by its
+    coordinates in `obs_monitors` (GetMonitorList entries); projectors whose monitor isn't
+    in the list are left out and opened over the websocket as usual.
+    """
+    indexes = {(m['monitorPositionX'], m['monitorPositionY']): i for i, m in enumerate(obs_monitors)}
+    projectors = []
+    for entry in config.values():
+        index = indexes.get((entry.get("monitor_x", 0), entry.get("monitor_y", 0)))
+        if index is None:
+            continue
+        if entry.get("type") == "program":
+            projectors.append({"type": PROJECTOR_TYPE_STUDIO_PROGRAM, "monitor": index})
+        elif entry.get("type") == "scene" and entry.get("scene"):
+            projectors.append({"type": PROJECTOR_TYPE_SCENE, "monitor": index, "name": entry["scene"]})
+    for projector in projectors:
+        projector.update(geometry="", alwaysOnTopOverridden=False)
+    return projectors
+
+
+def write_projector_layout(obs_dir, config, obs_monitors):
+    """
+    Makes OBS open the projectors in `config` by itself at its next start: turns on
+    [BasicWindow] SaveProjectors and replaces saved_projectors in the active scene
+    collection. OBS must not be running. A file is only rewritten when it changes, always
+    atomically, keeping its permissions and line endings; the first time, the original is
+    copied to <file>.obsstart.bak. Returns (number of projectors, changed file paths).
+    Raises OSError or ValueError.
+    """
+    ini_path = settings_ini_path(obs_dir)
+    settings, bom, newline = read_ini(ini_path)
+    changed = []
+    if settings.get("BasicWindow", "SaveProjectors", fallback="false").lower() != "true":
+        if not settings.has_section("BasicWindow"):
+            settings.add_section("BasicWindow")
+        settings.set("BasicWindow", "SaveProjectors", "true")
+        _write_text(ini_path, _render_ini(settings, bom), newline)
+        changed.append(ini_path)
+
+    collection_path = scene_collection_path(obs_dir, settings)
+    text, newline = _read_text(collection_path)
+    collection = json.loads(text)
+    projectors = saved_projectors(config, obs_monitors)
+    if collection.get("saved_projectors") != projectors:
+        collection["saved_projectors"] = projectors
+        _write_text(collection_path, json.dumps(collection, indent=4), newline)
+        changed.append(collection_path)
+    return len(projectors), changed
+
+
+class MonitorLayoutCache:
+    """
+    Remembers OBS's monitor list for a monitor layout (fingerprint), so projector monitor
+    indexes can be worked out before OBS is running. Kept in its own file, which survives
+    the warm-state reset on shutdown; only written when the list or layout changes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._last = None
+
+    def record(self, fingerprint, obs_monitors):
+        data = {"monitor_fingerprint": fingerprint, "obs_monitors": obs_monitors}
+        if not obs_monitors or data == self._last:
+            return
+        try:
+            atomic_write_json(self.path, data)
+            self._last = data
+        except OSError as e:
+            print(f"⚠️ Could not write {self.path}: {e}")
+
+    def lookup(self, fingerprint):
+        """The OBS monitor list recorded for this layout, or None."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("monitor_fingerprint") != fingerprint:
+            return None
+        return data.get("obs_monitors") or None
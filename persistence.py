@@ -0,0 +1,91 @@
+import json
+import os
+import stat
+import tempfile
+
+
+def atomic_write_text(path, text, newline=None):
+    """
+    Writes `text` to `path` via a temp file in the same directory and an atomic rename.
+    A file that already exists keeps its permissions. `newline` works as in open():
+    None writes the platform's line endings, '' writes `text` exactly as given.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline=newline) as f:
+            f.write(text)
+        try:
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass  # A new file keeps mkstemp's owner-only permissions
+        os.replace(tmp_path, path)
+    except Exception:
+        try: os.remove(tmp_path)
+        except OSError: pass
+        raise
+
+
+def atomic_write_json(path, data):
+    atomic_write_text(path, json.dumps(data, indent=4))
+
+
+class WarmState:
+    """
+    Small state file that lets a restarted launcher resume supervision without the cold path.
+
+    Holds the OBS PID and create-time, the projector hwnd -> config key mapping and the
+    monitor/config fingerprints. `save()` only touches the disk when the content changed,
+    so it is cheap enough to call after every check.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.data = {
+            "obs_pid": None,
+            "obs_create_time": None,
+            "monitor_fingerprint": None,
+            "config_fingerprint": None,
+            "projectors": {},
+        }
+        self._last_written = None
+
+    def load(self):
+        """Returns the saved state dict, or None if there is no usable state file."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(saved, dict) or not isinstance(saved.get("projectors"), dict):
+            return None
+        return saved
+
+    def update(self, **fields):
+        self.data.update(fields)
+
+    def bind_projector(self, config_key, hwnd):
+        self.data["projectors"][config_key] = hwnd
+
+    def unbind_projector(self, config_key):
+        self.data["projectors"].pop(config_key, None)
+
+    def save(self):
+        text = json.dumps(self.data, sort_keys=True)
+        if text == self._last_written:
+            return False
+        try:
+            atomic_write_text(self.path, text)
+        except OSError as e:
+            print(f"⚠️ Could not write state file {self.path}: {e}")
+            return False
+        self._last_written = text
+        return True
+
+    def clear(self):
+        self.data["projectors"] = {}
+        self._last_written = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
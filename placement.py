@@ -0,0 +1,78 @@
+try:
+    import numpy as np
+except ImportError:  # Optional; the pure-Python path gives the same answers
+    np = None
+
+# Below this many window/monitor pairs plain Python beats NumPy's per-call overhead
+VECTORIZE_MIN_PAIRS = 32
+
+
+def center_in(rect, monitor_rect):
+    """True if the centre of `rect` lies inside `monitor_rect` (both (left, top, right, bottom))."""
+    cx = (rect[0] + rect[2]) / 2
+    cy = (rect[1] + rect[3]) / 2
+    return monitor_rect[0] <= cx < monitor_rect[2] and monitor_rect[1] <= cy < monitor_rect[3]
+
+
+def _overlap(rect, monitor_rect):
+    width = min(rect[2], monitor_rect[2]) - max(rect[0], monitor_rect[0])
+    height = min(rect[3], monitor_rect[3]) - max(rect[1], monitor_rect[1])
+    return width * height if width > 0 and height > 0 else 0
+
+
+def _place_python(window_rects, monitor_rects):
+    contains, best = [], []
+    for rect in window_rects:
+        row = [center_in(rect, monitor_rect) for monitor_rect in monitor_rects]
+        scores = [(inside, _overlap(rect, monitor_rect)) for inside, monitor_rect in zip(row, monitor_rects)]
+        top = max(range(len(scores)), key=scores.__getitem__, default=-1)
+        contains.append(row)
+        best.append(top if top >= 0 and (scores[top][0] or scores[top][1] > 0) else -1)
+    return contains, best
+
+
+def _place_numpy(window_rects, monitor_rects):
+    windows = np.asarray(window_rects, dtype=np.float64).reshape(-1, 4)
+    monitors = np.asarray(monitor_rects, dtype=np.float64).reshape(-1, 4)
+    cx = ((windows[:, 0] + windows[:, 2]) / 2)[:, None]
+    cy = ((windows[:, 1] + windows[:, 3]) / 2)[:, None]
+    left, top, right, bottom = (monitors[:, i][None, :] for i in range(4))
+    contains = (left <= cx) & (cx < right) & (top <= cy) & (cy < bottom)
+    width = np.minimum(windows[:, 2:3], right) - np.maximum(windows[:, 0:1], left)
+    height = np.minimum(windows[:, 3:4], bottom) - np.maximum(windows[:, 1:2], top)
+    overlap = np.clip(width, 0, None) * np.clip(height, 0, None)
+    # Containing the centre beats any overlap; overlap area breaks ties
+    score = overlap + contains * (overlap.max(initial=0.0) + 1.0)
+    best = np.where(score.max(axis=1) > 0, score.argmax(axis=1), -1)
+    return contains.tolist(), best.tolist()
+
+
+class Placement:
+    """
+    Where every window sits relative to every monitor, worked out in one pass.
+
+    For each window it records which monitors contain its centre, and its best monitor:
+    the one containing its centre (the largest overlap if several do), else the one it
+    overlaps most, else none. Uses NumPy when it is installed and there are at least
+    VECTORIZE_MIN_PAIRS window/monitor pairs, plain Python otherwise; `vectorize` forces
+    one or the other. Windows and monitors are referred to by their
+    position in the lists given.
+    """
+
+    def __init__(self, window_rects, monitor_rects, vectorize=None):
+        if vectorize is None:
+            vectorize = np is not None and len(window_rects) * len(monitor_rects) >= VECTORIZE_MIN_PAIRS
+        if window_rects and monitor_rects:
+            place = _place_numpy if vectorize else _place_python
+            self._contains, self._best = place(window_rects, monitor_rects)
+        else:
+            self._contains, self._best = [[] for _ in window_rects], [-1] * len(window_rects)
+
+    def inside(self, window, monitor):
+        """True if the centre of window `window` is on monitor `monitor` (False for monitor None)."""
+        return monitor is not None and self._contains[window][monitor]
+
+    def best_monitor(self, window):
+        """Index of the monitor window `window` is on, or None if it is on none of them."""
+        best = self._best[window]
+        return best if best >= 0 else None
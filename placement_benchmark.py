@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark for projector placement checks on large video walls.
+
+Builds a synthetic wall of 1920x1080 screens (ten to a row) with one scene projector per
+screen, a share of them on the wrong screen or half off it, and times placement.Placement
+with and without NumPy, and a whole reconciler.plan_actions call, for each wall size.
+Also checks that both placement paths agree.
+
+    python placement_benchmark.py --screens 3 10 25 50 100
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import placement
+from placement import Placement
+from reconciler import MOVE, plan_actions
+
+WIDTH, HEIGHT, PER_ROW = 1920, 1080, 10
+
+
+def build_wall(screens, misplaced_every):
+    """Returns (desired, windows, monitors, obs_monitors) for a wall of `screens` screens."""
+    desired, windows, monitors, obs_monitors = {}, [], [], []
+    for index in range(screens):
+        x, y = (index % PER_ROW) * WIDTH, (index // PER_ROW) * HEIGHT
+        obs_monitors.append({'monitorIndex': index, 'monitorName': f"Display {index + 1}",
+                             'monitorPositionX': x, 'monitorPositionY': y,
+                             'monitorWidth': WIDTH, 'monitorHeight': HEIGHT})
+        monitors.append({'rect': (x, y, x + WIDTH, y + HEIGHT), 'is_active': True})
+        key = f"screen_{index + 1}"
+        desired[key] = {"type": "scene", "scene": f"Screen {index + 1}", "monitor_x": x, "monitor_y": y,
+                        "title": f"Screen {index + 1}"}
+        if misplaced_every and index % misplaced_every == misplaced_every - 1:
+            x += WIDTH * 3 // 4 if index % 2 else -WIDTH * (PER_ROW + 1)  # Mostly on the next screen, or off the wall
+        windows.append({'hwnd': 1000 + index, 'title': f"Windowed Projector (Scene) - Screen {index + 1}",
+                        'rect': (x, y, x + WIDTH, y + HEIGHT), 'key': key})
+    return desired, windows, monitors, obs_monitors
+
+
+def _time(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1e6
+
+
+def _agree(window_rects, monitor_rects):
+    vectorized = Placement(window_rects, monitor_rects, vectorize=True)
+    plain = Placement(window_rects, monitor_rects, vectorize=False)
+    return all(vectorized.best_monitor(w) == plain.best_monitor(w) and
+               all(vectorized.inside(w, m) == plain.inside(w, m) for m in range(len(monitor_rects)))
+               for w in range(len(window_rects)))
+
+
+def run_benchmark(screen_counts, repeat, misplaced_every):
+    if placement.np is None:
+        print("ℹ️ numpy is not installed; only the pure-Python path is measured.")
+    print(f"{'screens':>7}  {'python µs':>10}  {'numpy µs':>10}  {'plan µs':>10}  {'moves':>5}")
+    ok = True
+    for screens in screen_counts:
+        desired, windows, monitors, obs_monitors = build_wall(screens, misplaced_every)
+        window_rects = [window['rect'] for window in windows]
+        monitor_rects = [monitor['rect'] for monitor in monitors]
+        plain = _time(lambda: Placement(window_rects, monitor_rects, vectorize=False), repeat)
+        vectorized = "-"
+        if placement.np is not None:
+            vectorized = f"{_time(lambda: Placement(window_rects, monitor_rects, vectorize=True), repeat):10.1f}"
+            ok = _agree(window_rects, monitor_rects) and ok
+        plan_time = _time(lambda: plan_actions(desired, windows, monitors, obs_monitors), repeat)
+        moves = sum(action.kind == MOVE for action in plan_actions(desired, windows, monitors, obs_monitors).actions)
+        print(f"{screens:>7}  {plain:10.1f}  {vectorized:>10}  {plan_time:10.1f}  {moves:>5}")
+    if not ok:
+        print("❌ NumPy and pure-Python placement disagree.")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time projector placement checks for growing video walls.")
+    parser.add_argument("--screens", type=int, nargs="+", default=[3, 6, 12, 25, 50, 100],
+                        help="wall sizes to measure (default: 3 6 12 25 50 100)")
+    parser.add_argument("--repeat", type=int, default=200, help="timed runs per size; the median is shown (default: 200)")
+    parser.add_argument("--misplaced-every", type=int, default=7,
+                        help="put every Nth projector on the wrong screen, 0 = none (default: 7)")
+    args = parser.parse_args()
+    sys.exit(0 if run_benchmark(args.screens, args.repeat, args.misplaced_every) else 1)
+
+
+if __name__ == "__main__":
+    main()
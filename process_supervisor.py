@@ -0,0 +1,173 @@
+import os
+import threading
+import time
+
+import psutil
+
+
+class SupervisedProcess:
+    """
+    Keeps a helper application (OBSBOT Center) running.
+
+    Liveness is tracked through the process handle: once a process is attached, a daemon
+    thread blocks in psutil's wait() and flags the exit the moment it happens, so is_alive()
+    is a flag check. A full process scan only happens when the application has to be
+    (re)started or was just launched and its PID isn't known yet.
+
+    Restarts are rate-limited: the delay between launches starts at `min_restart_interval`
+    and doubles (up to `max_restart_interval`) every time the application dies again before
+    it has stayed up for `stable_after` seconds.
+    """
+
+    def __init__(self, name, launch_path, process_name, on_exit=None,
+                 min_restart_interval=30, max_restart_interval=900, stable_after=600,
+                 discover_timeout=30, launcher=None, finder=None, clock=time.monotonic):
+        self.name = name
+        self.launch_path = launch_path
+        self.process_name = process_name.lower()
+        self.on_exit = on_exit
+        self.min_restart_interval = min_restart_interval
+        self.max_restart_interval = max_restart_interval
+        self.stable_after = stable_after
+        self.discover_timeout = discover_timeout
+        self.launcher = launcher  # Defaults to os.startfile (Windows only), looked up at launch time
+        self.finder = finder
+        self.clock = clock
+
+        self.process = None
+        self.restarts = 0
+        self._exited = threading.Event()
+        self._attached_at = None
+        self._launched_at = None
+        self._next_launch_at = 0.0
+        self._restart_delay = min_restart_interval
+        self._stopping = False
+        self._warned_no_path = False
+
+    # --- Liveness ---
+
+    def find(self):
+        """Scans the process list for the application. Returns a psutil.Process or None."""
+        if self.finder:
+            return self.finder()
+        for proc in psutil.process_iter(['name']):
+            try:
+                if proc.info['name'] and self.process_name in proc.info['name'].lower():
+                    return proc
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return None
+
+    def attach(self, proc):
+        """Starts tracking `proc` and waits for its exit on a daemon thread."""
+        exited = threading.Event()
+        self.process = proc
+        self._exited = exited
+        self._attached_at = self.clock()
+        self._launched_at = None
+        threading.Thread(target=self._watch, args=(proc, exited),
+                         name=f"{self.name} watcher", daemon=True).start()
+
+    def _watch(self, proc, exited):
+        try:
+            proc.wait()
+        except psutil.Error:
+            pass
+        exited.set()
+        if self.process is proc and not self._stopping:
+            print(f"\n⚠️ {self.name} (PID {proc.pid}) exited.")
+            if self.on_exit:
+                self.on_exit()
+
+    def is_alive(self):
+        return self.process is not None and not self._exited.is_set()
+
+    # --- Supervision ---
+
+    def ensure_running(self, wait=0):
+        """
+        Called every monitor cycle. Returns True if the application is running.
+        Starts it if it isn't and the restart backoff allows; `wait` is how many seconds
+        to spend looking for the new process before returning.
+        """
+        now = self.clock()
+        if self.is_alive():
+            if self._restart_delay != self.min_restart_interval and now - self._attached_at >= self.stable_after:
+                self._restart_delay = self.min_restart_interval
+            return True
+        self.process = None
+
+        if self._launched_at is not None and now - self._launched_at < self.discover_timeout:
+            return self._discover(wait)
+        self._launched_at = None
+        if now < self._next_launch_at:
+            return False
+
+        # It may have been started by hand since we last looked.
+        proc = self.find()
+        if proc:
+            print(f"ℹ️ {self.name} is already running (PID {proc.pid}).")
+            self.attach(proc)
+            return True
+        if not self.launch(now):
+            return False
+        return self._discover(wait)
+
+    def launch(self, now=None):
+        """Starts the application and schedules the earliest next restart. Returns True if it was started."""
+        now = self.clock() if now is None else now
+        if self.launch_path and self._attached_at is not None:
+            self.restarts += 1
+            self._restart_delay = min(self._restart_delay * 2, self.max_restart_interval)
+        self._next_launch_at = now + self._restart_delay
+        if not self.launch_path:
+            # Nothing to start; still look for a copy started by hand, but only this often
+            if not self._warned_no_path:
+                print(f"ℹ️ No launch path configured for {self.name} - not starting it.")
+                self._warned_no_path = True
+            return False
+        print(f"🚀 Launching {self.name}...")
+        try:
+            (self.launcher or os.startfile)(self.launch_path)
+        except OSError as e:
+            print(f"❌ Failed to launch {self.name}: {e} (next attempt in {self._next_launch_at - now:.0f}s)")
+            return False
+        self._launched_at = now
+        return True
+
+    def _discover(self, wait):
+        deadline = time.monotonic() + wait
+        while True:
+            proc = self.find()
+            if proc:
+                print(f"  ✅ {self.name} is running (PID {proc.pid}).")
+                self.attach(proc)
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.5)
+
+    def stop(self, close_window=None, timeout=8):
+        """
+        Shuts the application down: asks it to close through `close_window` (returns True if a
+        close request was sent) and terminates it if it doesn't exit within `timeout` seconds.
+        """
+        self._stopping = True
+        proc = self.process if self.is_alive() else self.find()
+        if proc is None:
+            return
+        if close_window and close_window():
+            try:
+                proc.wait(timeout=timeout)
+                print(f"  -> {self.name} process exited gracefully.")
+                return
+            except psutil.TimeoutExpired:
+                print(f"  -> {self.name} did not exit gracefully, forcing termination.")
+            except psutil.NoSuchProcess:
+                return
+        else:
+            print(f"  -> {self.name} window not found, forcing termination.")
+        try:
+            proc.terminate()
+        except psutil.NoSuchProcess:
+            pass
@@ -0,0 +1,104 @@
+import cProfile
+import contextlib
+import io
+import os
+import pstats
+import time
+import tracemalloc
+
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, cProfile.__file__),
+    tracemalloc.Filter(False, pstats.__file__),
+    tracemalloc.Filter(False, __file__),
+]
+
+
+def _snapshot():
+    return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+
+def run_profile(app, cycles, report_path, simulate=False):
+    """
+    Runs `cycles` monitor cycles of the supervisor module `app` under cProfile and
+    tracemalloc and writes a hot-function report plus per-cycle memory growth to `report_path`.
+    With `simulate`, OBS, windows and monitors are replaced by simulation backends.
+    """
+    sim = None
+    if simulate:
+        import simulation
+        sim = simulation.install(app)
+
+    print(f"📊 Profiling {cycles} monitor cycles{' against simulated backends' if simulate else ''}...")
+    profiler = cProfile.Profile()
+    cycle_rows = []
+    tracemalloc.start(10)
+    try:
+        with open(os.devnull, 'w', encoding='utf-8') as devnull:
+            # Warm-up cycle (imports, first connection, caches) is not measured.
+            with contextlib.redirect_stdout(devnull):
+                app.run_monitor_cycle(0)
+            baseline = _snapshot()
+            previous_traced, _ = tracemalloc.get_traced_memory()
+
+            for cycle in range(1, cycles + 1):
+                if app.SHUTDOWN_REQUESTED:
+                    break
+                if sim:
+                    sim.before_cycle(cycle)
+                cpu_start, wall_start = time.process_time(), time.perf_counter()
+                with contextlib.redirect_stdout(devnull):
+                    profiler.enable()
+                    keep_going = app.run_monitor_cycle(cycle)
+                    app.record_warm_state()
+                    profiler.disable()
+                cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+
+                traced, _ = tracemalloc.get_traced_memory()
+                cycle_rows.append((cycle, wall, cpu, traced - previous_traced, traced))
+                previous_traced = traced
+                if not keep_going:
+                    break
+
+            retained = _snapshot().compare_to(baseline, 'lineno')
+    finally:
+        tracemalloc.stop()
+
+    _write_report(report_path, profiler, cycle_rows, retained, simulate)
+    print(f"✅ Profile report written to {report_path}")
+    return cycle_rows
+
+
+def _write_report(report_path, profiler, cycle_rows, retained, simulate):
+    out = io.StringIO()
+    measured = len(cycle_rows)
+    out.write("OBS Projector Auto-Manager - profile report\n")
+    out.write(f"Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+    out.write(f"Backends: {'simulated' if simulate else 'live'}\n")
+    out.write(f"Cycles measured: {measured}\n")
+    if measured:
+        total_wall = sum(row[1] for row in cycle_rows)
+        total_cpu = sum(row[2] for row in cycle_rows)
+        out.write(f"Wall time per cycle: {1000 * total_wall / measured:.2f} ms\n")
+        out.write(f"CPU time per cycle:  {1000 * total_cpu / measured:.2f} ms\n")
+
+    for sort_key in ('cumulative', 'tottime'):
+        out.write(f"\n=== Hot functions by {sort_key} time ===\n")
+        stats = pstats.Stats(profiler, stream=out)
+        stats.strip_dirs().sort_stats(sort_key).print_stats(30)
+
+    out.write("\n=== Memory growth per cycle ===\n")
+    out.write(f"{'cycle':>6} {'wall ms':>10} {'cpu ms':>10} {'growth B':>12} {'traced B':>12}\n")
+    for cycle, wall, cpu, growth, traced in cycle_rows:
+        out.write(f"{cycle:>6} {1000 * wall:>10.2f} {1000 * cpu:>10.2f} {growth:>12} {traced:>12}\n")
+
+    out.write("\n=== Allocations retained since the first measured cycle (top 20) ===\n")
+    for stat in retained[:20]:
+        if stat.size_diff:
+            out.write(f"{stat}\n")
+
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write(out.getvalue())
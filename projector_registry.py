@@ -0,0 +1,102 @@
+class Win32WindowState:
+    """Reads window state without sending messages to the window (safe on hung windows)."""
+
+    def __init__(self):
+        # Imported here rather than at module level, so the registry works with other backends off Windows
+        import win32gui
+        import win32process
+        self.win32gui = win32gui
+        self.win32process = win32process
+
+    def is_window(self, hwnd):
+        return bool(self.win32gui.IsWindow(hwnd))
+
+    def get_window_pid(self, hwnd):
+        return self.win32process.GetWindowThreadProcessId(hwnd)[1]
+
+    def get_window_rect(self, hwnd):
+        return tuple(self.win32gui.GetWindowRect(hwnd))
+
+
+class ProjectorRegistry:
+    """
+    Which projector window belongs to which config key.
+
+    A key is bound to the hwnd it opened (or that the reconciler assigned to it) and stays
+    bound while that window exists and still belongs to the OBS process, so a steady-state
+    check only looks at one window per projector, and several projectors of the same source
+    are told apart by their hwnd rather than by their title. Bindings are mirrored into the
+    WarmState so they survive a launcher restart.
+
+    `owner_pid` returns the PID of the OBS process (or None if unknown). `full_scan_every`
+    forces a full window discovery every N checks even when every key is bound, so stray
+    duplicate projectors are still noticed.
+    """
+
+    def __init__(self, warm_state, owner_pid=lambda: None, backend=None, full_scan_every=30):
+        self.warm_state = warm_state
+        self.owner_pid = owner_pid
+        self.backend = backend or Win32WindowState()
+        self.full_scan_every = full_scan_every
+        self._bindings = {}  # key -> (hwnd, title)
+        self._owners = {}    # hwnd -> key
+        self._checks_since_scan = 0
+
+    def bind(self, key, hwnd, title=""):
+        if self._bindings.get(key, (None,))[0] == hwnd:
+            return
+        self.unbind(key)
+        previous_owner = self._owners.get(hwnd)
+        if previous_owner is not None:
+            self.unbind(previous_owner)
+        self._bindings[key] = (hwnd, title)
+        self._owners[hwnd] = key
+        self.warm_state.bind_projector(key, hwnd)
+
+    def unbind(self, key):
+        binding = self._bindings.pop(key, None)
+        if binding:
+            self._owners.pop(binding[0], None)
+        self.warm_state.unbind_projector(key)
+
+    def adopt(self, projectors):
+        """Takes over key -> hwnd bindings saved by a previous launcher instance."""
+        for key, hwnd in projectors.items():
+            self.bind(key, hwnd)
+
+    def bound_hwnds(self):
+        return set(self._owners)
+
+    def _alive(self, hwnd, pid):
+        try:
+            return self.backend.is_window(hwnd) and (pid is None or self.backend.get_window_pid(hwnd) == pid)
+        except Exception:
+            return False
+
+    def live_windows(self):
+        """
+        Checks every binding and drops the ones whose window is gone (or was reused by another
+        process). Returns the live ones as reconciler windows: {'hwnd', 'title', 'rect', 'key'}.
+        """
+        pid = self.owner_pid()
+        windows = []
+        for key, (hwnd, title) in list(self._bindings.items()):
+            rect = None
+            if self._alive(hwnd, pid):
+                try:
+                    rect = self.backend.get_window_rect(hwnd)
+                except Exception:
+                    pass
+            if rect is None:
+                self.unbind(key)
+                continue
+            windows.append({'hwnd': hwnd, 'title': title, 'rect': rect, 'key': key})
+        return windows
+
+    def needs_full_scan(self, keys):
+        """True if some of `keys` has no live binding, or the periodic full scan is due."""
+        self._checks_since_scan += 1
+        if any(key not in self._bindings for key in keys) or self._checks_since_scan >= self.full_scan_every:
+            self._checks_since_scan = 0
+            return True
+        return False
@@ -0,0 +1,167 @@
+from collections import namedtuple
+
+from placement import Placement
+
+OPEN = 'open'
+MOVE = 'move'
+CLOSE = 'close'
+SKIP = 'skip'
+
+# Reason of the SKIP for a key whose monitor is off: its projector is missing on purpose
+MONITOR_OFF = "monitor is off or in power-save mode"
+
+# kind: OPEN/MOVE/CLOSE/SKIP; key: config key (None for CLOSE of an unowned window);
+# hwnd: window to move/close; monitor_index: OBS monitor index for OPEN;
+# rect: (left, top, right, bottom) target for MOVE; reason: human-readable explanation
+Action = namedtuple('Action', ['kind', 'key', 'hwnd', 'monitor_index', 'rect', 'reason'])
+
+# actions: ordered list of Action; assignments: config key -> hwnd of the window serving it
+Plan = namedtuple('Plan', ['actions', 'assignments'])
+
+
+def title_matches(config, title):
+    """Returns True if a projector window title belongs to the given config entry."""
+    title_lower = title.lower()
+    other_kind = "(source)" in title_lower or "(preview)" in title_lower
+    if config.get("type") == "program":
+        # "Windowed/Fullscreen Projector (Program)"; a scene named "Program ..." has "(Scene)" in its title
+        return title_lower.endswith("projector (program)") and "(scene)" not in title_lower and not other_kind
+    if config.get("type") == "scene":
+        scene_name = config.get("scene", "").lower()
+        if not scene_name:
+            return False
+        _, is_scene_title, projected = title_lower.partition("(scene) - ")
+        if is_scene_title:
+            # "... Projector (Scene) - <name>": the name has to match whole, so scene "S" isn't "Stage"
+            return projected == scene_name or projected.replace(" ", "") == scene_name.replace(" ", "")
+        if other_kind or "(program)" in title_lower:
+            return False
+        return scene_name in title_lower or scene_name.replace(" ", "") in title_lower.replace(" ", "")
+    return False
+
+
+def _obs_monitor_rect(monitor):
+    x, y = monitor['monitorPositionX'], monitor['monitorPositionY']
+    return (x, y, x + monitor['monitorWidth'], y + monitor['monitorHeight'])
+
+
+def _misplacement(found_index, obs_index):
+    if found_index is None:
+        return f"projector is off every OBS monitor, should be on monitor {obs_index}"
+    return f"projector is on monitor {found_index} instead of monitor {obs_index}"
+
+
+def plan_actions(desired, windows, monitors, obs_monitors, scenes=None):
+    """
+    Computes one deduplicated plan that brings the open projectors in line with `desired`.
+
+    Pure function: it only looks at its arguments.
+        desired:      CONFIG, config key -> {"type", "scene", "monitor_x", "monitor_y", "title"}
+        windows:      open projector windows, [{'hwnd', 'title', 'rect': (l, t, r, b), 'key'}];
+                      'key' (optional) is the config key the window is registered to
+        monitors:     OS monitors, [{'rect': (l, t, r, b), 'is_active'}] (may be empty if unknown)
+        obs_monitors: OBS GetMonitorList entries, or None if the list couldn't be fetched
+        scenes:       set of scene names in OBS, or None if unknown
+
+    Each config key gets at most one action and each window is used by at most one key.
+    A window registered to a key belongs to that key whatever its title; the others are
+    matched by title. A window already on its target monitor is kept; a misplaced one is moved rather than
+    reopened; keys without a window are opened unless their monitor is off or their
+    scene doesn't exist. Windows of a managed source that no key claims and that sit on a
+    managed screen are closed, since they would cover (or be covered by) the real one.
+    """
+    # 1. Resolve each key's target monitor, and where every window is relative to the OBS monitors
+    obs_rects = [_obs_monitor_rect(monitor) for monitor in obs_monitors or []]
+    obs_by_position, os_by_position = {}, {}
+    for index, monitor in enumerate(obs_monitors or []):
+        obs_by_position.setdefault((monitor.get('monitorPositionX'), monitor.get('monitorPositionY')), index)
+    for monitor in monitors:
+        os_by_position.setdefault((monitor['rect'][0], monitor['rect'][1]), monitor)
+    targets = {}
+    for key, config in desired.items():
+        position = (config.get('monitor_x', 0), config.get('monitor_y', 0))
+        obs_index = obs_by_position.get(position)
+        obs_rect = obs_rects[obs_index] if obs_index is not None else None
+        os_monitor = os_by_position.get(position)
+        is_active = os_monitor['is_active'] if os_monitor else True
+        targets[key] = (obs_index, obs_rect, is_active)
+    placement = Placement([window['rect'] for window in windows], obs_rects)
+    slots = {window['hwnd']: slot for slot, window in enumerate(windows)}
+
+    # 2. Assign windows to keys: registered windows to their key, then by title, first the
+    #    windows already on the right monitor, then any match
+    assignments = {}
+    claimed = set()
+    for window in windows:
+        key = window.get('key')
+        if key in desired and key not in assignments:
+            assignments[key] = window['hwnd']
+            claimed.add(window['hwnd'])
+    for placed_pass in (True, False):
+        for key, config in desired.items():
+            if key in assignments:
+                continue
+            obs_index = targets[key][0]
+            for slot, window in enumerate(windows):
+                if window['hwnd'] in claimed or not title_matches(config, window['title']):
+                    continue
+                if placed_pass and not placement.inside(slot, obs_index):
+                    continue
+                assignments[key] = window['hwnd']
+                claimed.add(window['hwnd'])
+                break
+
+    # 3. One action per key
+    actions = []
+    for key, config in desired.items():
+        obs_index, obs_rect, is_active = targets[key]
+        hwnd = assignments.get(key)
+        if hwnd is not None:
+            if obs_rect is None:
+                if obs_monitors is not None:
+                    actions.append(Action(SKIP, key, hwnd, None, None,
+                                          "no OBS monitor at the configured coordinates; position not checked"))
+            elif not placement.inside(slots[hwnd], obs_index):
+                actions.append(Action(MOVE, key, hwnd, obs_index, obs_rect,
+                                      _misplacement(placement.best_monitor(slots[hwnd]), obs_index)))
+            continue
+
+        if not is_active:
+            actions.append(Action(SKIP, key, None, None, None, MONITOR_OFF))
+        elif config.get("type") == "scene" and scenes is not None and config.get("scene") not in scenes:
+            actions.append(Action(SKIP, key, None, None, None, f"scene '{config.get('scene')}' does not exist in OBS"))
+        elif obs_index is None:
+            actions.append(Action(OPEN, key, None, 0, None,
+                                  "projector is missing; no OBS monitor at the configured coordinates, using primary"))
+        else:
+            actions.append(Action(OPEN, key, None, obs_index, obs_rect, "projector is missing"))
+
+    # 4. Close unclaimed duplicates sitting on a screen another key is using
+    managed = {targets[key][0] for key in assignments if targets[key][0] is not None}
+    for slot, window in enumerate(windows):
+        if window['hwnd'] in claimed:
+            continue
+        if not any(title_matches(config, window['title']) for config in desired.values()):
+            continue
+        if any(placement.inside(slot, index) for index in managed):
+            actions.append(Action(CLOSE, None, window['hwnd'], None, None,
+                                  f"duplicate projector '{window['title']}' on a managed screen"))
+
+    return Plan(actions, assignments)
+
+
+def format_plan(plan, desired):
+    """Returns printable lines describing a plan."""
+    if not plan.actions:
+        return [f"  ✅ Nothing to do - all {len(plan.assignments)} projectors are in place."]
+    icons = {OPEN: '📺', MOVE: '↔️', CLOSE: '🗑️', SKIP: '💤'}
+    lines = []
+    for action in plan.actions:
+        name = desired[action.key].get('title', action.key) if action.key is not None else f"hwnd {action.hwnd}"
+        detail = ""
+        if action.kind == OPEN:
+            detail = f" on monitor {action.monitor_index}"
+        elif action.kind == MOVE:
+            detail = f" to {action.rect}"
+        lines.append(f"  {icons[action.kind]} {action.kind.upper()} '{name}'{detail}: {action.reason}")
+    return lines
@@ -0,0 +1,105 @@
+import threading
+from obsws_python import EventClient, Subs
+
+
+class SceneCatalog:
+    """
+    Cached set of OBS scene names, kept current through obs-websocket events.
+
+    The list is loaded once with GetSceneList and then patched by SceneCreated,
+    SceneRemoved and SceneNameChanged. A CurrentSceneCollectionChanged event marks
+    the cache stale (it is reloaded on the next lookup) and calls `on_collection_changed`
+    so the supervisor can re-check its projectors straight away.
+    """
+
+    def __init__(self, on_collection_changed=None):
+        self.on_collection_changed = on_collection_changed
+        self._lock = threading.Lock()
+        self._scenes = set()
+        self._stale = True
+        self._events = None
+
+    # --- Event subscription ---
+
+    def start_events(self, host, port, password, timeout=5):
+        """
+        Opens the event connection if it isn't already running. Returns True on success.
+        `timeout` bounds the connect and handshake; the subscription itself waits for events.
+        """
+        if self.events_alive():
+            return True
+        self.stop_events()
+        try:
+            events = EventClient(host=host, port=port, password=password, subs=Subs.SCENES | Subs.CONFIG,
+                                 timeout=timeout)
+        except Exception as e:
+            print(f"  ⚠️ Could not subscribe to OBS scene events: {e}")
+            return False
+        events.callback.register([
+            self.on_scene_created,
+            self.on_scene_removed,
+            self.on_scene_name_changed,
+            self.on_current_scene_collection_changed,
+        ])
+        # Events may have been missed while we weren't subscribed.
+        self.invalidate()
+        self._events = events
+        return True
+
+    def stop_events(self):
+        events, self._events = self._events, None
+        if events:
+            try: events.disconnect()
+            except Exception: pass
+
+    def events_alive(self):
+        return self._events is not None and self._events.worker.is_alive()
+
+    # --- Cache access ---
+
+    def invalidate(self):
+        with self._lock:
+            self._stale = True
+
+    def load(self, client):
+        """(Re)loads the scene list from OBS through a ws_requests.RequestSession."""
+        scenes = client.call("GetSceneList")["scenes"]
+        with self._lock:
+            self._scenes = {scene['sceneName'] for scene in scenes}
+            self._stale = False
+        print(f"  🎞️ Scene catalog loaded: {len(self._scenes)} scenes")
+
+    def scene_names(self, client):
+        """
+        Returns the scene names of the current collection.
+        Reloads from `client` if the cache is stale or no event stream is keeping it current.
+        """
+        with self._lock:
+            needs_load = self._stale or not self.events_alive()
+        if needs_load:
+            self.load(client)
+        with self._lock:
+            return set(self._scenes)
+
+    # --- Event callbacks (run on the EventClient thread) ---
+
+    def on_scene_created(self, data):
+        if getattr(data, 'is_group', False):
+            return
+        with self._lock:
+            self._scenes.add(data.scene_name)
+
+    def on_scene_removed(self, data):
+        with self._lock:
+            self._scenes.discard(data.scene_name)
+
+    def on_scene_name_changed(self, data):
+        with self._lock:
+            self._scenes.discard(data.old_scene_name)
+            self._scenes.add(data.scene_name)
+
+    def on_current_scene_collection_changed(self, data):
+        print(f"\n🗂️ Scene collection switched to '{data.scene_collection_name}' - re-checking projectors.")
+        self.invalidate()
+        if self.on_collection_changed:
+            self.on_collection_changed()
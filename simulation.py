@@ -0,0 +1,466 @@
+import base64
+import json
+import os
+import random
+import struct
+import tempfile
+import threading
+import time as _time
+from types import SimpleNamespace
+
+from websocket import WebSocketConnectionClosedException, WebSocketTimeoutException
+
+from availability import AvailabilityLedger
+from flash_suppression import FlashSuppressor
+from obs_restore import MonitorLayoutCache
+from persistence import WarmState
+from process_supervisor import SupervisedProcess
+from projector_registry import ProjectorRegistry
+from scene_catalog import SceneCatalog
+from window_discovery import WindowDiscovery
+
+WM_CLOSE = 0x0010
+MONITOR_WIDTH = 1920
+MONITOR_HEIGHT = 1080
+OBS_PID = 4242
+
+
+class SimulatedRect:
+    """Stand-in for a wintypes.RECT."""
+
+    def __init__(self, left, top, right, bottom):
+        self.left, self.top, self.right, self.bottom = left, top, right, bottom
+
+    def __repr__(self):
+        return f"RECT(left={self.left}, top={self.top}, right={self.right}, bottom={self.bottom})"
+
+
+class Hang:
+    """
+    A stall that can be switched on for a simulated backend: while engaged, every call that
+    goes through wait() blocks (for real, not in virtual time) until release().
+    """
+
+    def __init__(self):
+        self._released = threading.Event()
+        self._released.set()
+        self.hits = 0
+
+    def engage(self):
+        self._released.clear()
+
+    def release(self):
+        self._released.set()
+
+    def wait(self):
+        if not self._released.is_set():
+            self.hits += 1
+            self._released.wait()
+
+
+class SimulatedClock:
+    """Replaces the `time` module: sleep() advances virtual time instead of blocking."""
+
+    def __init__(self):
+        self._epoch = _time.time()
+        self._now = 0.0
+
+    def time(self):
+        return self._epoch + self._now
+
+    def monotonic(self):
+        return self._now
+
+    def perf_counter(self):
+        # Virtual time plus the real time spent computing, so simulated delays show up in timings
+        return self._now + _time.perf_counter()
+
+    def sleep(self, seconds):
+        self._now += max(0.0, seconds)
+
+    def strftime(self, fmt, t=None):
+        return _time.strftime(fmt, _time.localtime(self.time()) if t is None else t)
+
+
+class SimulatedProcess:
+    """Stand-in for a psutil.Process (OBS, OBSBOT Center)."""
+
+    def __init__(self, pid=OBS_PID):
+        self.pid = pid
+        self._create_time = _time.time()
+        self._exited = threading.Event()
+
+    def create_time(self):
+        return self._create_time
+
+    def is_running(self):
+        return not self._exited.is_set()
+
+    def wait(self, timeout=None):
+        self._exited.wait(timeout)
+
+    def terminate(self):
+        self._exited.set()
+
+    def nice(self, value=None):
+        if value is None:
+            return getattr(self, '_nice', 0)
+        self._nice = value
+
+
+class SimulatedDesktop:
+    """
+    A desktop with monitors and top-level windows. Implements the subset of the
+    win32gui API used by the supervisor, plus the flash suppression and window discovery
+    backends. The first background window is hung: asking for its title with GetWindowText
+    raises, as a stand-in for the call blocking forever.
+    """
+
+    def __init__(self, monitor_count=3, background_windows=40):
+        self.monitors = [
+            {'x': i * MONITOR_WIDTH, 'y': 0, 'width': MONITOR_WIDTH, 'height': MONITOR_HEIGHT, 'active': True}
+            for i in range(monitor_count)
+        ]
+        self.windows = {}
+        self.obsbot = None
+        self.wmi_hang = Hang()  # Stalls the monitor power (WMI) query
+        self._next_hwnd = 0x10000
+        for i in range(background_windows):
+            self.create_window(f"Background App {i}", "Chrome_WidgetWin_1", (100, 100, 900, 700), pid=5000 + i, hung=i == 0)
+        self.create_window("OBS 30.2.0 - Profile: Venue - Scenes: Venue", "Qt663QWindowIcon", (0, 0, 1280, 720))
+
+    def create_window(self, title, class_name, rect, pid=OBS_PID, hung=False):
+        hwnd = self._next_hwnd
+        self._next_hwnd += 4
+        self.windows[hwnd] = {'title': title, 'class': class_name, 'rect': rect, 'visible': True, 'pid': pid,
+                              'hung': hung}
+        return hwnd
+
+    def open_projector(self, title, monitor_index):
+        monitor = self.monitors[monitor_index] if 0 <= monitor_index < len(self.monitors) else self.monitors[0]
+        rect = (monitor['x'], monitor['y'], monitor['x'] + monitor['width'], monitor['y'] + monitor['height'])
+        return self.create_window(title, "Qt663QWindowIcon", rect)
+
+    def launch_obsbot(self, path):
+        self.obsbot = SimulatedProcess(pid=4343)
+
+    def projector_hwnds(self):
+        return [hwnd for hwnd, w in self.windows.items() if "Projector" in w['title']]
+
+    # --- win32gui subset ---
+
+    def EnumWindows(self, callback, extra):
+        for hwnd in list(self.windows):
+            callback(hwnd, extra)
+
+    def IsWindow(self, hwnd):
+        return hwnd in self.windows
+
+    def IsWindowVisible(self, hwnd):
+        return hwnd in self.windows and self.windows[hwnd]['visible']
+
+    def GetWindowText(self, hwnd):
+        if hwnd in self.windows and self.windows[hwnd]['hung']:
+            raise RuntimeError(f"GetWindowText({hwnd:#x}) sent a message to a hung window")
+        return self.windows[hwnd]['title'] if hwnd in self.windows else ""
+
+    def GetClassName(self, hwnd):
+        return self.windows[hwnd]['class'] if hwnd in self.windows else ""
+
+    def GetWindowRect(self, hwnd):
+        return self.windows[hwnd]['rect']
+
+    def SetWindowPos(self, hwnd, insert_after, x, y, cx, cy, flags):
+        if hwnd in self.windows:
+            self.windows[hwnd]['rect'] = (x, y, x + cx, y + cy)
+
+    def PostMessage(self, hwnd, msg, wparam, lparam):
+        if msg == WM_CLOSE:
+            self.windows.pop(hwnd, None)
+
+    # --- flash_suppression / projector_registry backends ---
+
+    def is_window(self, hwnd):
+        return hwnd in self.windows
+
+    def get_window_pid(self, hwnd):
+        return self.windows[hwnd]['pid'] if hwnd in self.windows else 0
+
+    def get_window_rect(self, hwnd):
+        return self.windows[hwnd]['rect']
+
+    def stop_flash(self, hwnd):
+        pass
+
+    # --- window_discovery backend (one UI thread per process: its PID times 10) ---
+
+    def enum_windows(self):
+        return list(self.windows)
+
+    def enum_thread_windows(self, thread_id):
+        return [hwnd for hwnd, w in self.windows.items() if w['pid'] * 10 == thread_id]
+
+    def get_window_thread_process_id(self, hwnd):
+        pid = self.get_window_pid(hwnd)
+        return pid * 10, pid
+
+    def is_window_visible(self, hwnd):
+        return self.IsWindowVisible(hwnd)
+
+    def get_window_title(self, hwnd):
+        return self.windows[hwnd]['title'] if hwnd in self.windows else ""
+
+    def get_class_name(self, hwnd):
+        return self.GetClassName(hwnd)
+
+    def hide_from_taskbar(self, hwnd):
+        pass
+
+    def set_z_order(self, hwnds, insert_after, flags):
+        pass
+
+    # --- monitor_utils / OBS monitor list ---
+
+    def get_monitor_details(self):
+        self.wmi_hang.wait()
+        return [
+            {
+                'hMonitor': 0x1000 + i,
+                'rect': SimulatedRect(m['x'], m['y'], m['x'] + m['width'], m['y'] + m['height']),
+                'pnp_id': f"MONITOR\\SIM{i:04d}",
+                'is_active': m['active'],
+            }
+            for i, m in enumerate(self.monitors)
+        ]
+
+    def get_monitor_fingerprint(self):
+        return ";".join(f"{m['x']},{m['y']},{m['width']},{m['height']}" for m in self.monitors)
+
+    def obs_monitor_list(self):
+        return [
+            {
+                'monitorIndex': i,
+                'monitorName': f"\\\\.\\DISPLAY{i + 1}",
+                'monitorPositionX': m['x'],
+                'monitorPositionY': m['y'],
+                'monitorWidth': m['width'],
+                'monitorHeight': m['height'],
+            }
+            for i, m in enumerate(self.monitors)
+        ]
+
+
+def make_bmp(width, height, pixel, bits=24, top_down=False):
+    """
+    Encodes an uncompressed 24- or 32-bit BMP, stored bottom-up unless `top_down` is set;
+    `pixel(x, y)` returns an (r, g, b) tuple, y counted from the top.
+    """
+    channels = bits // 8
+    stride = (width * bits + 31) // 32 * 4
+    rows = []
+    for y in (range(height) if top_down else range(height - 1, -1, -1)):
+        row = bytearray()
+        for x in range(width):
+            r, g, b = pixel(x, y)
+            row += bytes((b, g, r, 255)[:channels])
+        rows.append(bytes(row) + b"\0" * (stride - len(row)))
+    image = b"".join(rows)
+    header = struct.pack('<2sIHHI', b'BM', 54 + len(image), 0, 0, 54)
+    info = struct.pack('<IiiHHIIiiII', 40, width, -height if top_down else height, 1, bits, 0, len(image),
+                       2835, 2835, 0, 0)
+    return header + info + image
+
+
+class SimulatedWebSocket:
+    """
+    Stand-in for the websocket-client WebSocket under a ReqClient. Replies to op 6 requests
+    and op 8 request batches through `handler` after the delay given by `delays` (request
+    type -> seconds, "RequestBatch" for batches), waiting in virtual time. A reply that takes
+    longer than the socket timeout raises WebSocketTimeoutException and is delivered later,
+    like a late reply from a busy OBS.
+    """
+
+    def __init__(self, handler, clock, delays=None):
+        self.handler = handler
+        self.clock = clock
+        self.delays = delays if delays is not None else {}
+        self.timeout = None
+        self.hang = Hang()  # Stalls recv() regardless of the timeout, like a wedged socket
+        self._pending = []  # [remaining delay, message]
+
+    def settimeout(self, timeout):
+        self.timeout = timeout
+
+    def _respond(self, request, variables=None):
+        data = dict(request.get("requestData") or {})
+        for field, variable in request.get("inputVariables", {}).items():
+            data[field] = variables.get(variable)
+        status, response_data = self.handler(request["requestType"], data)
+        response = {"requestType": request["requestType"], "requestStatus": status}
+        if response_data is not None:
+            response["responseData"] = response_data
+            for variable, field in request.get("outputVariables", {}).items():
+                variables[variable] = response_data.get(field)
+        return response
+
+    def send(self, payload):
+        message = json.loads(payload)
+        request = message["d"]
+        if message["op"] == 8:
+            variables = {}
+            results = [self._respond(r, variables) for r in request["requests"]]
+            reply = {"op": 9, "d": {"requestId": request["requestId"], "results": results}}
+            delay = self.delays.get("RequestBatch", 0.0)
+        else:
+            reply = {"op": 7, "d": dict(self._respond(request), requestId=request["requestId"])}
+            delay = self.delays.get(request["requestType"], 0.0)
+        self._pending.append([delay, reply])
+
+    def recv(self):
+        self.hang.wait()
+        if not self._pending:
+            raise WebSocketConnectionClosedException("socket is already closed.")
+        delay, message = self._pending[0]
+        if self.timeout is not None and delay > self.timeout:
+            self.clock.sleep(self.timeout)
+            for pending in self._pending:
+                pending[0] = max(0.0, pending[0] - self.timeout)
+            raise WebSocketTimeoutException("timed out")
+        self.clock.sleep(delay)
+        self._pending.pop(0)
+        for pending in self._pending:
+            pending[0] = max(0.0, pending[0] - delay)
+        return json.dumps(message)
+
+    def close(self):
+        self._pending.clear()
+
+    def shutdown(self):
+        self._pending.clear()
+
+
+class SimulatedObsClient:
+    """Stand-in for obsws_python.ReqClient that opens projector windows on a SimulatedDesktop."""
+
+    def __init__(self, desktop, scenes, clock, delays=None):
+        self.desktop = desktop
+        self.scenes = list(scenes)
+        self.request_counts = {}
+        self.program_scene = self.scenes[0] if self.scenes else None
+        # GetStats counters; each call advances them by `frames_per_call`, `skip_rate` of which are skipped
+        self.stats = {"cpuUsage": 12.0, "activeFps": 30.0, "renderTotalFrames": 0, "renderSkippedFrames": 0,
+                      "outputTotalFrames": 0, "outputSkippedFrames": 0}
+        self.frames_per_call = 300
+        self.skip_rate = 0.0
+        # Source name -> pixel(x, y, frame) for screenshots; default is a pattern that moves every frame
+        self.frames = {}
+        self._frame = 0
+        self.base_client = SimpleNamespace(ws=SimulatedWebSocket(self.handle, clock, delays), timeout=None)
+
+    def screenshot(self, source, width, height):
+        self._frame += 1
+        frame = self._frame
+        pixel = self.frames.get(source, lambda x, y, f: ((x * 8 + f) % 256, (y * 8) % 256, 128))
+        bmp = make_bmp(width, height, lambda x, y: pixel(x, y, frame))
+        return "data:image/bmp;base64," + base64.b64encode(bmp).decode('ascii')
+
+    def handle(self, request_type, data):
+        """Returns (requestStatus, responseData) for a request."""
+        self.request_counts[request_type] = self.request_counts.get(request_type, 0) + 1
+        ok = {"result": True, "code": 100}
+        if request_type == "GetMonitorList":
+            return ok, {"monitors": self.desktop.obs_monitor_list()}
+        if request_type == "GetSceneList":
+            return ok, {"scenes": [{"sceneName": name} for name in self.scenes]}
+        if request_type == "GetStats":
+            skipped = int(self.frames_per_call * self.skip_rate)
+            for kind in ("render", "output"):
+                self.stats[f"{kind}TotalFrames"] += self.frames_per_call
+                self.stats[f"{kind}SkippedFrames"] += skipped
+            return ok, dict(self.stats)
+        if request_type == "GetCurrentProgramScene":
+            return ok, {"currentProgramSceneName": self.program_scene}
+        if request_type == "GetSourceScreenshot":
+            if data.get("sourceName") not in self.scenes:
+                return {"result": False, "code": 600, "comment": "No source was found"}, None
+            return ok, {"imageData": self.screenshot(data["sourceName"], data.get("imageWidth", 16),
+                                                     data.get("imageHeight", 9))}
+        if request_type == "OpenVideoMixProjector":
+            self.desktop.open_projector("Fullscreen Projector (Program)", data.get("monitorIndex", 0))
+            return ok, None
+        if request_type == "OpenSourceProjector":
+            if data.get("sourceName") not in self.scenes:
+                return {"result": False, "code": 600, "comment": "No source was found"}, None
+            self.desktop.open_projector(f"Fullscreen Projector (Scene) - {data['sourceName']}",
+                                        data.get("monitorIndex", 0))
+            return ok, None
+        return {"result": False, "code": 204, "comment": "Unknown request type"}, None
+
+    def disconnect(self):
+        self.base_client.ws.close()
+
+
+def build_config(monitor_count):
+    """One Program projector on the first monitor and a scene projector on each of the others."""
+    config = {"1": {"title": "Program (Projector)", "type": "program", "monitor_x": 0, "monitor_y": 0}}
+    for i in range(1, monitor_count):
+        scene = f"Screen {i}"
+        config[str(i + 1)] = {"title": f"Scene Projector ({scene})", "type": "scene",
+                              "monitor_x": i * MONITOR_WIDTH, "monitor_y": 0, "scene": scene}
+    return config
+
+
+class Simulation:
+    """Handle returned by install(); drives churn (closed projectors) between cycles."""
+
+    def __init__(self, desktop, client, clock, churn_every, seed):
+        self.desktop = desktop
+        self.client = client
+        self.clock = clock
+        self.churn_every = churn_every
+        self._rng = random.Random(seed)
+
+    def before_cycle(self, cycle):
+        """Every `churn_every` cycles, closes a random projector so the reopen path is exercised too."""
+        if self.churn_every and cycle % self.churn_every == 0:
+            hwnds = self.desktop.projector_hwnds()
+            if hwnds:
+                self.desktop.PostMessage(self._rng.choice(hwnds), WM_CLOSE, 0, 0)
+
+
+def install(app, monitor_count=3, background_windows=40, churn_every=5, seed=0, request_delays=None):
+    """
+    Points the supervisor module `app` (obsStart) at simulated backends: windows, monitors,
+    the OBS process and websocket, and the clock. `request_delays` maps request types to
+    simulated OBS response times in seconds. Returns a Simulation.
+    """
+    desktop = SimulatedDesktop(monitor_count, background_windows)
+    config = build_config(monitor_count)
+    scenes = [c["scene"] for c in config.values() if c["type"] == "scene"]
+    clock = SimulatedClock()
+    client = SimulatedObsClient(desktop, scenes, clock, request_delays)
+
+    app.CONFIG = config
+    app.time = clock
+    app.win32gui = desktop
+    app.get_all_monitor_details = desktop.get_monitor_details
+    app.get_monitor_fingerprint = desktop.get_monitor_fingerprint
+    app.OBS_PROCESS = SimulatedProcess()
+    app.is_obs_running = lambda: True
+    app.ReqClient = lambda **kwargs: client
+    app.WEBSOCKET_CLIENT = app.RequestSession(lambda: client, client, app.REQUEST_METRICS, clock=clock.perf_counter)
+    app.FLASH_SUPPRESSOR = FlashSuppressor(desktop)
+    app.WINDOW_DISCOVERY = WindowDiscovery(desktop)
+    app.OBSBOT = SupervisedProcess("OBSBOT Center", "OBSBOT Center.lnk", "obsbot",
+                                   launcher=desktop.launch_obsbot, finder=lambda: desktop.obsbot,
+                                   clock=clock.monotonic)
+    app.SCENE_CATALOG = SceneCatalog()
+    app.SCENE_CATALOG.start_events = lambda host, port, password, timeout=None: False
+    app.AVAILABILITY = AvailabilityLedger(clock=clock.monotonic)
+    app.GOVERNOR = app.LoadGovernor(cycle_budget=float('inf'), process=SimulatedProcess())
+    app.LAST_OBSERVED = {'monitors': None, 'obs_monitors': None}
+    state_dir = tempfile.mkdtemp(prefix="obsstartup-sim-")
+    app.WARM_STATE = WarmState(os.path.join(state_dir, "state.json"))
+    app.MONITOR_LAYOUT = MonitorLayoutCache(os.path.join(state_dir, "obs_monitors.json"))
+    app.REGISTRY = ProjectorRegistry(app.WARM_STATE, owner_pid=lambda: app.OBS_PROCESS.pid, backend=desktop)
+    return Simulation(desktop, client, clock, churn_every, seed)
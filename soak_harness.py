@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Soak test for monitor mode.
+
+Runs many supervisor cycles against the simulated backends (see simulation.py) and
+uses tracemalloc to check that memory stays flat. Exits with status 1 if traced memory
+grows past the ceiling, or if any allocation site keeps growing with the cycle count
+(i.e. something allocated per cycle is being retained).
+
+    python soak_harness.py --cycles 200000
+"""
+import argparse
+import contextlib
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+import obsStart
+import simulation
+
+
+def run_cycle(cycle):
+    obsStart.run_monitor_cycle(cycle)
+    obsStart.record_warm_state()
+
+
+def run_soak(cycles, warmup, ceiling_kib, monitors, churn_every, progress_every):
+    sim = simulation.install(obsStart, monitor_count=monitors, churn_every=churn_every)
+    ceiling = ceiling_kib * 1024
+    # A site retaining one object every `churn_every` cycles shows up with at least this many
+    # blocks. It must grow in both halves of the run: interpreter caches grow in one-off steps.
+    leak_blocks = max(256, cycles // (10 * max(churn_every, 1)))
+    halfway = warmup + cycles // 2
+
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        with contextlib.redirect_stdout(devnull):
+            for cycle in range(1, warmup + 1):
+                sim.before_cycle(cycle)
+                run_cycle(cycle)
+        gc.collect()
+
+        tracemalloc.start(5)
+        baseline = tracemalloc.take_snapshot()
+        baseline_traced, _ = tracemalloc.get_traced_memory()
+        midpoint = baseline
+        peak_growth = 0
+        started = time.perf_counter()
+        try:
+            for cycle in range(warmup + 1, warmup + cycles + 1):
+                sim.before_cycle(cycle)
+                with contextlib.redirect_stdout(devnull):
+                    run_cycle(cycle)
+                if cycle == halfway:
+                    midpoint = tracemalloc.take_snapshot()
+                if (cycle - warmup) % progress_every == 0:
+                    traced, _ = tracemalloc.get_traced_memory()
+                    peak_growth = max(peak_growth, traced - baseline_traced)
+                    elapsed = time.perf_counter() - started
+                    print(f"  cycle {cycle - warmup:>8}/{cycles}: traced growth {traced - baseline_traced:>8} B"
+                          f" ({elapsed:.0f}s elapsed)")
+            gc.collect()
+            final_traced, _ = tracemalloc.get_traced_memory()
+            peak_growth = max(peak_growth, final_traced - baseline_traced)
+            final = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+
+    first_half = {stat.traceback: stat.count_diff for stat in midpoint.compare_to(baseline, 'traceback')}
+    growing_sites = [stat for stat in final.compare_to(midpoint, 'traceback')
+                     if stat.count_diff >= leak_blocks // 2
+                     and first_half.get(stat.traceback, 0) >= leak_blocks // 2]
+
+    print(f"\nCycles: {cycles} (after {warmup} warm-up cycles)")
+    print(f"Traced memory growth: final {final_traced - baseline_traced} B, peak {peak_growth} B,"
+          f" ceiling {ceiling} B")
+    failed = False
+    if peak_growth > ceiling:
+        print("❌ Memory ceiling exceeded.")
+        failed = True
+    if growing_sites:
+        print(f"❌ {len(growing_sites)} allocation site(s) kept growing (>= {leak_blocks // 2} blocks per half):")
+        for stat in growing_sites[:10]:
+            print(f"  {stat}")
+            for line in stat.traceback.format()[-6:]:
+                print(f"    {line}")
+        failed = True
+    if not failed:
+        print("✅ Memory stayed flat.")
+    return not failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak-test monitor mode against simulated backends.")
+    parser.add_argument("--cycles", type=int, default=200000, help="measured cycles (default: 200000)")
+    parser.add_argument("--warmup", type=int, default=200, help="unmeasured warm-up cycles (default: 200)")
+    parser.add_argument("--ceiling-kib", type=int, default=256,
+                        help="allowed traced-memory growth in KiB (default: 256)")
+    parser.add_argument("--monitors", type=int, default=3, help="simulated monitors/projectors (default: 3)")
+    parser.add_argument("--churn-every", type=int, default=5,
+                        help="close a random projector every N cycles (default: 5, 0 disables)")
+    parser.add_argument("--progress-every", type=int, default=10000, help="progress line interval (default: 10000)")
+    args = parser.parse_args(argv)
+    ok = run_soak(args.cycles, args.warmup, args.ceiling_kib, args.monitors, args.churn_every, args.progress_every)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
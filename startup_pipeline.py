@@ -0,0 +1,110 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+DONE = 'done'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+
+
+class StageFailed(Exception):
+    """Raised by a stage that could not do its job; the stages that require it are skipped."""
+
+
+class StageTiming:
+    __slots__ = ('name', 'status', 'started', 'finished', 'error')
+
+    def __init__(self, name, status, started=None, finished=None, error=None):
+        self.name = name
+        self.status = status
+        self.started = started
+        self.finished = finished
+        self.error = error
+
+    @property
+    def duration(self):
+        return self.finished - self.started if self.started is not None else 0.0
+
+
+class StartupPipeline:
+    """
+    Runs the cold-start stages on a thread pool, each one as soon as the stages it requires
+    have finished, so independent work (OBS, OBSBOT Center, monitor discovery) overlaps.
+
+    A stage is a function called with the results of its required stages, in the order they
+    were listed. A stage that raises has failed, and every stage depending on it is skipped;
+    so is every stage that hasn't started when `should_stop` returns True. Stages must be
+    added after the stages they require, which rules out cycles. `initializer` runs once in
+    every worker thread (COM initialization for WMI). Each stage's start and end, relative
+    to the start of the run, are kept for print_report().
+    """
+
+    def __init__(self, max_workers=4, initializer=None, clock=time.perf_counter):
+        self.max_workers = max_workers
+        self.initializer = initializer
+        self.clock = clock
+        self._stages = {}  # name -> (func, requires), in the order they were added
+        self.results = {}
+        self.timings = {}
+        self.total = None
+
+    def add(self, name, func, requires=()):
+        if name in self._stages:
+            raise ValueError(f"stage '{name}' is already defined")
+        unknown = [required for required in requires if required not in self._stages]
+        if unknown:
+            raise ValueError(f"stage '{name}' requires unknown stage(s): {', '.join(unknown)}")
+        self._stages[name] = (func, tuple(requires))
+
+    def _call(self, name, func, args, origin):
+        started = self.clock() - origin
+        try:
+            result = func(*args)
+        except Exception as e:
+            return StageTiming(name, FAILED, started, self.clock() - origin, e), None
+        return StageTiming(name, DONE, started, self.clock() - origin), result
+
+    def run(self, should_stop=lambda: False):
+        """Runs every stage. Returns True if all of them finished."""
+        origin = self.clock()
+        self.results, self.timings = {}, {}
+        pending = dict(self._stages)
+        running = {}
+        with ThreadPoolExecutor(self.max_workers, thread_name_prefix="startup", initializer=self.initializer) as pool:
+            while pending or running:
+                for name, (func, requires) in list(pending.items()):
+                    blocked = [required for required in requires
+                               if required in self.timings and self.timings[required].status != DONE]
+                    if blocked or should_stop():
+                        del pending[name]
+                        self.timings[name] = StageTiming(name, SKIPPED, error=", ".join(blocked) or None)
+                    elif all(required in self.results for required in requires):
+                        del pending[name]
+                        args = [self.results[required] for required in requires]
+                        running[pool.submit(self._call, name, func, args, origin)] = name
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    del running[future]
+                    timing, result = future.result()
+                    self.timings[timing.name] = timing
+                    if timing.status == DONE:
+                        self.results[timing.name] = result
+        self.total = self.clock() - origin
+        return all(timing.status == DONE for timing in self.timings.values())
+
+    def print_report(self):
+        print(f"\n⏱️ Startup stages ({self.total:.2f}s in total):")
+        for name in self._stages:
+            timing = self.timings.get(name)
+            if timing is None:
+                continue
+            if timing.status == SKIPPED:
+                reason = f"after {timing.error} failed" if timing.error else "shutdown requested"
+                print(f"  ⏭️ {name:<12} skipped ({reason})")
+                continue
+            icon = "✅" if timing.status == DONE else "❌"
+            line = f"  {icon} {name:<12} {timing.started:6.2f}s -> {timing.finished:6.2f}s  ({timing.duration:.2f}s)"
+            if timing.status == FAILED:
+                line += f"  {timing.error}"
+            print(line)
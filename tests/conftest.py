@@ -0,0 +1,41 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+# The modules live at the top of the repository rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeClock:
+    """A monotonic clock that only moves when a test sets or advances `now`."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def sim():
+    """obsStart wired to the simulated desktop and OBS of simulation.py, with a quick watchdog. Needs pywin32."""
+    pytest.importorskip("win32gui")
+    import obsStart as app
+    import simulation
+    from cycle_watchdog import CycleWatchdog
+
+    sim = simulation.install(app, churn_every=0)
+    app.WATCHDOG = CycleWatchdog(default_budget=0.3, cycle_budget=5, on_stall=app.recover_from_stall,
+                                 poll_interval=0.02, backoff=1.0)
+    yield sim
+    sim.desktop.wmi_hang.release()
+    sim.client.base_client.ws.hang.release()
+    app.WATCHDOG.stop()
+    shutil.rmtree(os.path.dirname(app.WARM_STATE.path), ignore_errors=True)
@@ -0,0 +1,57 @@
+import json
+
+from availability import AvailabilityLedger
+
+
+def row(ledger, key):
+    return next(r for r in ledger.summary() if r['key'] == key)
+
+
+def test_outages_flaps_and_time_to_recover(clock):
+    ledger = AvailabilityLedger(clock)
+    ledger.observe(["a"], [])
+    clock.now = 90.0
+    ledger.observe([], ["a"])
+    clock.now = 100.0
+    ledger.observe(["a"], [])
+    clock.now = 190.0
+    ledger.observe([], ["a"])
+    clock.now = 200.0
+    summary = row(ledger, "a")
+    assert summary['state'] == 'down'
+    assert summary['outages'] == 2
+    assert summary['flaps'] == 1
+    assert summary['downtime_s'] == 20.0
+    assert summary['uptime_pct'] == 90.0
+    assert summary['ttr_max_s'] is not None and 9 < summary['ttr_max_s'] <= 11
+
+
+def test_paused_keys_are_neither_up_nor_down(clock):
+    ledger = AvailabilityLedger(clock)
+    ledger.observe([], ["a"])  # Missing for 10 s
+    clock.now = 10.0
+    ledger.observe([], [], paused=["a"])  # Monitor switched off for 1000 s
+    clock.now = 1010.0
+    ledger.observe([], ["a"])  # Monitor back on, still missing for 10 s
+    clock.now = 1020.0
+    ledger.observe(["a"], [])
+    clock.now = 1100.0
+    summary = row(ledger, "a")
+    assert summary['outages'] == 1
+    assert summary['downtime_s'] == 20.0
+    assert summary['uptime_pct'] == 80.0
+    assert 18 < summary['ttr_max_s'] <= 22
+
+
+def test_key_paused_from_the_start_has_no_uptime_figure(tmp_path, clock):
+    ledger = AvailabilityLedger(clock)
+    ledger.observe([], [], paused=["a"])
+    clock.now = 500.0
+    summary = row(ledger, "a")
+    assert summary['state'] == 'paused'
+    assert summary['uptime_pct'] is None
+    assert summary['downtime_s'] == 0.0
+
+    path = tmp_path / "availability.json"
+    ledger.export_json(str(path))
+    assert json.loads(path.read_text(encoding='utf-8'))[0]['state'] == 'paused'
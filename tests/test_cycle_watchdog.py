@@ -0,0 +1,168 @@
+import threading
+import time
+
+import pytest
+
+from cycle_watchdog import CycleWatchdog
+
+
+class ShiftableClock:
+    """time.monotonic that a test can move forward, to get past a back-off without waiting."""
+
+    def __init__(self):
+        self.offset = 0.0
+
+    def __call__(self):
+        return time.monotonic() + self.offset
+
+
+class Hang:
+    """A call that blocks until released, like a WMI query or a websocket read that never returns."""
+
+    def __init__(self):
+        self.released = threading.Event()
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        self.released.wait()
+
+
+@pytest.fixture
+def hang():
+    hang = Hang()
+    yield hang
+    hang.released.set()  # Let the abandoned workers run into CycleAbandoned and exit
+
+
+@pytest.fixture
+def clock():
+    return ShiftableClock()
+
+
+@pytest.fixture
+def stalls():
+    return []
+
+
+@pytest.fixture
+def watchdog(clock, stalls):
+    watchdog = CycleWatchdog(default_budget=0.1, cycle_budget=5, on_stall=stalls.append,
+                             poll_interval=0.01, backoff=60, max_backoff=240, clock=clock)
+    yield watchdog
+    watchdog.stop()
+
+
+def test_hung_phase_is_abandoned_and_the_next_cycle_runs_on_a_new_worker(watchdog, hang, stalls):
+    def cycle():
+        watchdog.phase('windows')
+        watchdog.phase('monitors')
+        hang()
+
+    assert watchdog.run(cycle) == (False, None)
+    assert stalls == ['monitors']
+    assert watchdog.stalls == {'monitors': 1}
+
+    first = watchdog.run(threading.current_thread)
+    second = watchdog.run(threading.current_thread)
+    assert first == second and first[0]
+    assert first[1].name == "monitor cycle 3"  # Worker 1 was abandoned; worker 3 is kept between cycles
+
+
+def test_abandoned_cycle_stops_at_its_next_phase(watchdog, hang):
+    reached = []
+    workers = []
+
+    def cycle():
+        workers.append(threading.current_thread())
+        watchdog.phase('connect')
+        hang()
+        watchdog.phase('scenes')
+        reached.append('scenes')
+
+    assert watchdog.run(cycle) == (False, None)
+    assert watchdog.run(lambda: 'next') == (True, 'next')
+    hang.released.set()
+    workers[0].join(1)
+    assert not workers[0].is_alive()
+    assert reached == []
+
+
+def test_exceeding_the_cycle_budget_abandons_the_cycle(clock, hang, stalls):
+    watchdog = CycleWatchdog(default_budget=5, cycle_budget=0.2, on_stall=stalls.append,
+                             poll_interval=0.01, clock=clock)
+
+    def cycle():
+        for _ in range(100):
+            watchdog.phase('execute')
+            time.sleep(0.01)
+
+    assert watchdog.run(cycle) == (False, None)
+    assert stalls == ['execute']
+    watchdog.stop()
+
+
+def test_errors_raised_by_the_cycle_are_reraised(watchdog):
+    def cycle():
+        watchdog.phase('stats')
+        raise ValueError("OBS went away")
+
+    with pytest.raises(ValueError):
+        watchdog.run(cycle)
+    assert watchdog.run(lambda: 1) == (True, 1)
+
+
+def test_stalled_phase_is_done_without_until_its_back_off_is_over(watchdog, hang, clock):
+    def cycle():
+        if not watchdog.attempt('monitors'):
+            return 'last observed'
+        hang()
+        return 'fresh'
+
+    assert watchdog.run(cycle) == (False, None)
+    for _ in range(5):
+        assert watchdog.run(cycle) == (True, 'last observed')
+    assert hang.calls == 1
+
+    clock.offset += 60
+    assert watchdog.run(cycle) == (False, None)  # Retried, and it hangs again
+    clock.offset += 60
+    assert watchdog.run(cycle) == (True, 'last observed')  # Backed off twice as long now
+    clock.offset += 60
+    assert watchdog.run(cycle) == (False, None)
+    assert hang.calls == 3
+    assert watchdog.stalls == {'monitors': 3}
+
+
+def test_back_off_is_capped_and_cleared_once_the_phase_completes(watchdog, hang, clock):
+    def cycle():
+        if watchdog.attempt('monitors'):
+            hang()
+
+    for _ in range(4):
+        assert watchdog.run(cycle) == (False, None)
+        clock.offset += 240  # 60, 120, 240, then capped at 240
+    hang.released.set()
+    assert watchdog.run(cycle) == (True, None)
+    assert hang.calls == 5  # Retried 240 s after the fourth stall
+
+    hang.released.clear()
+    assert watchdog.run(cycle) == (False, None)
+    clock.offset += 60  # Back to the shortest back-off
+    calls = hang.calls
+    assert watchdog.run(cycle) == (False, None)
+    assert hang.calls == calls + 1
+
+
+def test_permanent_hang_does_not_leak_a_thread_per_cycle(watchdog, hang, clock):
+    def cycle():
+        watchdog.phase('windows')
+        if watchdog.attempt('monitors'):
+            hang()
+        watchdog.phase('execute')
+
+    threads = threading.active_count()
+    for _ in range(50):
+        watchdog.run(cycle)
+    assert watchdog.stalls == {'monitors': 1}
+    assert threading.active_count() <= threads + 2  # The hung worker and the one that replaced it
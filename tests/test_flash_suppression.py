@@ -0,0 +1,66 @@
+from flash_suppression import HWND_BOTTOM, HWND_TOP, FlashSuppressor
+
+
+class FakeWindowBackend:
+    """Records the user32 calls FlashSuppressor makes instead of making them."""
+
+    def __init__(self, windows=()):
+        self.windows = set(windows)
+        self.calls = []
+
+    def is_window(self, hwnd):
+        return hwnd in self.windows
+
+    def stop_flash(self, hwnd):
+        self.calls.append(('stop_flash', hwnd))
+
+    def hide_from_taskbar(self, hwnd):
+        self.calls.append(('hide_from_taskbar', hwnd))
+
+    def set_z_order(self, hwnds, insert_after, flags):
+        self.calls.append(('set_z_order', tuple(hwnds), insert_after))
+
+
+def test_queue_ignores_pending_and_handled_windows():
+    suppressor = FlashSuppressor(FakeWindowBackend({1, 2}))
+    assert suppressor.queue(1)
+    assert not suppressor.queue(1)
+    suppressor.mark_handled(2)
+    assert not suppressor.queue(2)
+    assert suppressor.flush() == [1]
+    assert not suppressor.queue(1)
+
+
+def test_flush_reorders_all_pending_windows_in_one_batch():
+    backend = FakeWindowBackend({1, 2, 3})
+    suppressor = FlashSuppressor(backend)
+    for hwnd in (1, 2, 3):
+        suppressor.queue(hwnd)
+    assert suppressor.flush() == [1, 2, 3]
+    z_order = [call for call in backend.calls if call[0] == 'set_z_order']
+    assert z_order == [('set_z_order', (1, 2, 3), HWND_BOTTOM), ('set_z_order', (1, 2, 3), HWND_TOP)]
+    assert [call[1] for call in backend.calls if call[0] == 'hide_from_taskbar'] == [1, 2, 3]
+    assert suppressor.flush() == []
+
+
+def test_closed_windows_are_skipped_and_recycled_handles_treated_as_new():
+    backend = FakeWindowBackend({1})
+    suppressor = FlashSuppressor(backend)
+    suppressor.queue(1)
+    suppressor.queue(2)  # Closed before the flush
+    assert suppressor.flush() == [1]
+
+    backend.windows.discard(1)
+    suppressor.flush()  # Forgets the closed window
+    backend.windows.add(1)  # Windows hands the same hwnd to a new window
+    assert suppressor.queue(1)
+    assert suppressor.flush() == [1]
+
+
+def test_flush_survives_backend_failures():
+    backend = FakeWindowBackend({1})
+    backend.hide_from_taskbar = lambda hwnd: (_ for _ in ()).throw(OSError("access denied"))
+    suppressor = FlashSuppressor(backend)
+    suppressor.queue(1)
+    assert suppressor.flush() == [1]
+    assert ('stop_flash', 1) in backend.calls
@@ -0,0 +1,100 @@
+import base64
+import struct
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from frame_probe import BLACK, FROZEN, OK, PROGRAM, UNAVAILABLE, FrameProbe, decode_bmp
+from simulation import make_bmp
+
+
+def black(x, y):
+    return (0, 0, 0)
+
+
+def gradient(offset=0):
+    return lambda x, y: ((x * 8 + offset) % 256, (y * 14) % 256, 128)
+
+
+class FakeSession:
+    """Answers the probe's RequestBatch with the frames currently set per source."""
+
+    def __init__(self, program_scene="Main"):
+        self.program_scene = program_scene
+        self.frames = {}
+        self.batches = []
+
+    def call_batch(self, requests):
+        self.batches.append(requests)
+        results = []
+        for request in requests:
+            if request["requestType"] == "GetCurrentProgramScene":
+                results.append({"requestType": "GetCurrentProgramScene", "requestStatus": {"result": True},
+                                "responseData": {"currentProgramSceneName": self.program_scene}})
+                continue
+            source = request["requestData"].get("sourceName", self.program_scene)
+            frame = self.frames.get(source)
+            if frame is None:
+                results.append({"requestType": "GetSourceScreenshot",
+                                "requestStatus": {"result": False, "code": 600}})
+            else:
+                image = "data:image/bmp;base64," + base64.b64encode(frame).decode('ascii')
+                results.append({"requestType": "GetSourceScreenshot", "requestStatus": {"result": True},
+                                "responseData": {"imageData": image}})
+        return results
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("bits", [24, 32])
+@pytest.mark.parametrize("top_down", [False, True])
+def test_decode_bmp_orientation_and_row_padding(bits, top_down):
+    luminance = decode_bmp(make_bmp(5, 3, lambda x, y: (255, 255, 255) if (x, y) == (4, 0) else (0, 0, 0),
+                               bits, top_down))
+    assert luminance.shape == (3, 5)
+    assert luminance[0, 4] == pytest.approx(255, abs=0.5)
+    assert luminance.sum() == pytest.approx(255, abs=0.5)
+
+
+def test_decode_bmp_rejects_other_formats():
+    with pytest.raises(ValueError):
+        decode_bmp(b"\x89PNG" + b"\0" * 60)
+    paletted = bytearray(make_bmp(4, 4, black))
+    struct.pack_into('<H', paletted, 28, 8)  # 8 bits per pixel
+    with pytest.raises(ValueError):
+        decode_bmp(bytes(paletted))
+
+
+def test_black_frame_and_dark_detail_are_told_apart(clock):
+    session = FakeSession()
+    probe = FrameProbe(lambda: session, ["Dark scene", "Black scene"], clock=clock)
+    session.frames["Black scene"] = make_bmp(32, 18, black)
+    session.frames["Dark scene"] = make_bmp(32, 18, lambda x, y: (40, 40, 40) if (x + y) % 2 else (0, 0, 0))
+    assert probe.sample_once() == {"Dark scene": OK, "Black scene": BLACK}
+
+
+def test_unchanged_source_is_frozen_after_the_threshold_and_live_again_when_it_moves(clock):
+    session = FakeSession()
+    probe = FrameProbe(lambda: session, ["Stage"], interval=5, frozen_after=60, clock=clock)
+    session.frames["Stage"] = make_bmp(32, 18, gradient())
+    for _ in range(12):
+        assert probe.sample_once()["Stage"] == OK
+        clock.now += 5
+    assert probe.sample_once()["Stage"] == FROZEN
+
+    session.frames["Stage"] = make_bmp(32, 18, gradient(offset=64))
+    clock.now += 5
+    assert probe.sample_once()["Stage"] == OK
+
+
+def test_program_output_is_resolved_inside_the_batch_and_missing_sources_are_unavailable(clock):
+    session = FakeSession(program_scene="Main")
+    probe = FrameProbe(lambda: session, [PROGRAM, "Gone"], clock=clock)
+    session.frames["Main"] = make_bmp(32, 18, gradient())
+    assert probe.sample_once() == {PROGRAM: OK, "Gone": UNAVAILABLE}
+    requests = session.batches[-1]
+    assert [r["requestType"] for r in requests] == ["GetCurrentProgramScene", "GetSourceScreenshot",
+                                                    "GetSourceScreenshot"]
+    assert requests[1]["inputVariables"] == {"sourceName": "programScene"}
@@ -0,0 +1,120 @@
+import pytest
+
+from load_governor import LOWERED_PRIORITY, LoadGovernor
+
+
+class FakeObs:
+    """Answers GetStats like OBS streaming at 60 fps; a test sets the load of the next interval."""
+
+    def __init__(self):
+        self.stats = {'cpuUsage': 10.0, 'activeFps': 60.0, 'renderTotalFrames': 0, 'renderSkippedFrames': 0,
+                      'outputTotalFrames': 0, 'outputSkippedFrames': 0}
+
+    def tick(self, cpu=10.0, fps=60.0, render_skipped=0, output_skipped=0, frames=600):
+        stats = self.stats
+        stats.update(cpuUsage=cpu, activeFps=fps)
+        stats['renderTotalFrames'] += frames
+        stats['renderSkippedFrames'] += render_skipped
+        stats['outputTotalFrames'] += frames
+        stats['outputSkippedFrames'] += output_skipped
+
+    def call(self, request_type):
+        assert request_type == "GetStats"
+        return dict(self.stats)
+
+
+class FakeProcess:
+    def __init__(self):
+        self.priority = 0
+
+    def nice(self, value=None):
+        if value is None:
+            return self.priority
+        self.priority = value
+
+
+@pytest.fixture
+def obs():
+    return FakeObs()
+
+
+@pytest.fixture
+def process():
+    return FakeProcess()
+
+
+@pytest.fixture
+def governor(process, clock):
+    return LoadGovernor(cycle_budget=0.05, calm_samples=3, process=process, cpu_clock=clock)
+
+
+def sample(governor, obs, **load):
+    obs.tick(**load)
+    return governor.observe_stats(obs.call("GetStats"))
+
+
+@pytest.mark.parametrize("load, throttled", [
+    ({}, False),
+    ({'cpu': 84.0}, False),
+    ({'cpu': 85.0}, True),
+    ({'render_skipped': 2}, False),   # 0.3% of 600 frames
+    ({'render_skipped': 3}, True),    # 0.5%
+    ({'output_skipped': 30}, True),
+    ({'fps': 55.0}, False),           # Within 10% of the 60 fps seen before
+    ({'fps': 50.0}, True),
+])
+def test_pressure_thresholds(governor, obs, load, throttled):
+    sample(governor, obs)
+    assert bool(sample(governor, obs, **load)) is throttled
+    assert governor.throttled is throttled
+
+
+def test_frame_counters_restarting_are_not_skipped_frames(governor, obs):
+    sample(governor, obs)
+    obs.stats.update(renderTotalFrames=0, renderSkippedFrames=0, outputTotalFrames=0, outputSkippedFrames=0)
+    assert governor.observe_stats(obs.call("GetStats")) == []
+
+
+def test_pressure_lowers_priority_until_obs_has_been_calm_for_a_while(governor, obs, process):
+    sample(governor, obs)
+    sample(governor, obs, cpu=95.0)
+    assert governor.under_pressure
+    assert process.priority == LOWERED_PRIORITY
+
+    sample(governor, obs)
+    sample(governor, obs)
+    sample(governor, obs, cpu=90.0)  # Busy again before it had calmed down
+    for _ in range(2):
+        sample(governor, obs)
+        assert governor.under_pressure
+    sample(governor, obs)
+    assert not governor.throttled
+    assert process.priority == 0
+
+
+def test_expensive_checks_throttle_until_they_are_cheap_again(governor, clock):
+    governor.begin_cycle()
+    clock.now += 0.2
+    governor.end_cycle()
+    assert governor.over_budget
+    assert governor.last_cycle_cost == pytest.approx(0.2)
+    for _ in range(3):
+        assert governor.throttled
+        governor.begin_cycle()
+        clock.now += 0.01
+        governor.end_cycle()
+    assert not governor.throttled
+
+
+def test_deferred_checks_still_run_while_throttled(governor, obs):
+    sample(governor, obs, cpu=95.0)
+    sample(governor, obs, cpu=95.0)
+    runs = {check: 0 for check in ('monitor_power', 'obs_monitor_list', 'frame_probe', 'projectors')}
+    for _ in range(30):
+        for check in runs:
+            runs[check] += governor.allow(check)
+    assert runs == {'monitor_power': 5, 'obs_monitor_list': 5, 'frame_probe': 0, 'projectors': 30}
+
+    for _ in range(3):
+        sample(governor, obs)
+    assert all(governor.allow(check) for check in runs)
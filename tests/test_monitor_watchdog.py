@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+pytest.importorskip("win32gui")
+
+import obsStart as app
+import simulation
+
+
+def run_cycles(count, start=1):
+    return [app.WATCHDOG.run(app.run_monitor_cycle, check) for check in range(start, start + count)]
+
+
+def test_projectors_are_still_reconciled_while_wmi_hangs_for_good(sim):
+    run_cycles(2)
+    sim.desktop.wmi_hang.engage()
+    results = run_cycles(20, start=3)
+    assert results[0] == (False, None)
+    assert all(completed for completed, _ in results[1:])
+    assert app.WATCHDOG.stalls == {'monitors': 1}
+
+    sim.desktop.PostMessage(sim.desktop.projector_hwnds()[0], simulation.WM_CLOSE, 0, 0)
+    run_cycles(1, start=23)
+    assert len(sim.desktop.projector_hwnds()) == len(app.CONFIG)
+
+
+def test_hung_websocket_is_dropped_and_reconnected(sim):
+    run_cycles(1)
+    ws = sim.client.base_client.ws
+    ws.hang.engage()
+    assert run_cycles(1, start=2) == [(False, None)]
+    assert app.WEBSOCKET_CLIENT is None
+    ws.hang.release()
+    time.sleep(0.1)
+    assert run_cycles(1, start=3) == [(True, True)]
+    assert app.WEBSOCKET_CLIENT is not None
+
+
+def test_abandoned_check_does_not_drop_the_session_that_replaced_it(sim):
+    run_cycles(1)
+    abandoned, replacement = app.WEBSOCKET_CLIENT, object()
+    app.WEBSOCKET_CLIENT = replacement
+    app.drop_websocket(abandoned)
+    assert app.WEBSOCKET_CLIENT is replacement
@@ -0,0 +1,123 @@
+import json
+import os
+import shutil
+import stat
+import sys
+
+import pytest
+
+from obs_restore import (BACKUP_SUFFIX, PROJECTOR_TYPE_SCENE, PROJECTOR_TYPE_STUDIO_PROGRAM, MonitorLayoutCache,
+                         read_ini, write_projector_layout)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "obs-studio")
+COLLECTION = os.path.join("basic", "scenes", "Sunday_Service.json")
+
+CONFIG = {
+    "2": {"title": "Program (Projector)", "type": "program", "monitor_x": 0, "monitor_y": 0},
+    "3": {"title": "Scene Projector (Proiector)", "type": "scene", "monitor_x": 1920, "monitor_y": 0,
+          "scene": "Proiector"},
+    "4": {"title": "Scene Projector (TV Sala)", "type": "scene", "monitor_x": -1920, "monitor_y": 0,
+          "scene": "TV Sala"},
+}
+# GetMonitorList; the monitor at -1920 is unplugged
+OBS_MONITORS = [
+    {"monitorIndex": 0, "monitorPositionX": 0, "monitorPositionY": 0, "monitorWidth": 1920, "monitorHeight": 1080},
+    {"monitorIndex": 1, "monitorPositionX": 1920, "monitorPositionY": 0, "monitorWidth": 1920, "monitorHeight": 1080},
+]
+
+
+@pytest.fixture
+def obs_dir(tmp_path):
+    path = tmp_path / "obs-studio"
+    shutil.copytree(FIXTURES, path)
+    return str(path)
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def to_crlf(path):
+    data = read_bytes(path).replace(b"\r\n", b"\n").replace(b"\n", b"\r\n")
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def test_writes_the_projectors_and_turns_on_save_projectors(obs_dir):
+    count, changed = write_projector_layout(obs_dir, CONFIG, OBS_MONITORS)
+    ini_path = os.path.join(obs_dir, "global.ini")
+    collection_path = os.path.join(obs_dir, COLLECTION)
+    assert count == 2
+    assert changed == [ini_path, collection_path]
+
+    settings, bom, newline = read_ini(ini_path)
+    assert bom and newline == "\n"
+    assert settings.get("BasicWindow", "SaveProjectors") == "true"
+    assert settings.get("BasicWindow", "geometry").startswith("AdnQyw")  # Everything else is kept as is
+    assert settings.get("Basic", "SceneCollection") == "Sunday Service"
+
+    with open(collection_path, encoding='utf-8') as f:
+        collection = json.load(f)
+    assert collection["saved_projectors"] == [
+        {"type": PROJECTOR_TYPE_STUDIO_PROGRAM, "monitor": 0, "geometry": "", "alwaysOnTopOverridden": False},
+        {"type": PROJECTOR_TYPE_SCENE, "monitor": 1, "name": "Proiector", "geometry": "",
+         "alwaysOnTopOverridden": False},
+    ]
+    assert collection["scene_order"] == [{"name": "Proiector"}, {"name": "TV Sala"}]
+
+    assert write_projector_layout(obs_dir, CONFIG, OBS_MONITORS) == (2, [])
+
+
+def test_the_original_files_are_backed_up_once(obs_dir):
+    collection_path = os.path.join(obs_dir, COLLECTION)
+    original = read_bytes(collection_path)
+    write_projector_layout(obs_dir, CONFIG, OBS_MONITORS)
+    write_projector_layout(obs_dir, {"2": CONFIG["2"]}, OBS_MONITORS)
+    assert read_bytes(collection_path + BACKUP_SUFFIX) == original
+    assert read_bytes(os.path.join(obs_dir, "global.ini") + BACKUP_SUFFIX) == \
+        read_bytes(os.path.join(FIXTURES, "global.ini"))
+
+
+def test_crlf_line_endings_and_the_bom_are_kept(obs_dir):
+    ini_path = os.path.join(obs_dir, "global.ini")
+    collection_path = os.path.join(obs_dir, COLLECTION)
+    to_crlf(ini_path)
+    to_crlf(collection_path)
+    write_projector_layout(obs_dir, CONFIG, OBS_MONITORS)
+    for path in (ini_path, collection_path):
+        data = read_bytes(path)
+        assert data.count(b"\n") == data.count(b"\r\n") > 10
+    assert read_bytes(ini_path).startswith(b"\xef\xbb\xbf[General]\r\n")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX permission bits")
+def test_file_permissions_are_kept(obs_dir):
+    paths = [os.path.join(obs_dir, "global.ini"), os.path.join(obs_dir, COLLECTION)]
+    for path in paths:
+        os.chmod(path, 0o644)
+    write_projector_layout(obs_dir, CONFIG, OBS_MONITORS)
+    assert [stat.S_IMODE(os.stat(path).st_mode) for path in paths] == [0o644, 0o644]
+
+
+def test_user_ini_is_used_when_present(obs_dir):
+    # OBS 31 keeps the per-user settings in user.ini and leaves global.ini alone
+    shutil.copy(os.path.join(obs_dir, "global.ini"), os.path.join(obs_dir, "user.ini"))
+    _, changed = write_projector_layout(obs_dir, CONFIG, OBS_MONITORS)
+    assert changed[0] == os.path.join(obs_dir, "user.ini")
+    assert read_bytes(os.path.join(obs_dir, "global.ini")) == read_bytes(os.path.join(FIXTURES, "global.ini"))
+
+
+def test_settings_without_a_scene_collection_are_rejected(obs_dir):
+    with open(os.path.join(obs_dir, "global.ini"), 'w', encoding='utf-8') as f:
+        f.write("[General]\nFirstRun=true\n")
+    with pytest.raises(ValueError):
+        write_projector_layout(obs_dir, CONFIG, OBS_MONITORS)
+
+
+def test_monitor_layout_cache_only_answers_for_the_recorded_layout(tmp_path):
+    cache = MonitorLayoutCache(str(tmp_path / "obs_monitors.json"))
+    assert cache.lookup("layout-a") is None
+    cache.record("layout-a", OBS_MONITORS)
+    assert cache.lookup("layout-a") == OBS_MONITORS
+    assert cache.lookup("layout-b") is None
@@ -0,0 +1,95 @@
+import json
+import os
+
+import pytest
+
+import persistence
+from persistence import WarmState, atomic_write_text
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    return str(tmp_path / "state.json")
+
+
+def saved_state(state_path):
+    state = WarmState(state_path)
+    state.update(obs_pid=4242, obs_create_time=1700000000.5, monitor_fingerprint="m", config_fingerprint="c")
+    state.bind_projector("2", 100)
+    state.bind_projector("3", 101)
+    assert state.save()
+    return state
+
+
+def test_saved_state_loads_back(state_path):
+    saved_state(state_path)
+    loaded = WarmState(state_path).load()
+    assert loaded["obs_pid"] == 4242
+    assert loaded["obs_create_time"] == 1700000000.5
+    assert loaded["projectors"] == {"2": 100, "3": 101}
+
+
+def test_save_only_writes_when_the_state_changed(state_path):
+    state = saved_state(state_path)
+    os.remove(state_path)
+    assert not state.save()
+    assert not os.path.exists(state_path)
+
+    state.unbind_projector("3")
+    assert state.save()
+    assert WarmState(state_path).load()["projectors"] == {"2": 100}
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    "{\"obs_pid\": 4242, \"projectors\": {\"2\": 1",  # Cut off mid-write by a crash of an older version
+    "[1, 2, 3]",
+    json.dumps({"obs_pid": 4242}),
+    json.dumps({"obs_pid": 4242, "projectors": [100, 101]}),
+    "\xff\xfe not json",
+])
+def test_corrupt_or_foreign_state_files_are_ignored(state_path, content):
+    with open(state_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    assert WarmState(state_path).load() is None
+
+
+def test_missing_state_file_is_ignored(state_path):
+    assert WarmState(state_path).load() is None
+
+
+def test_clear_forgets_the_projectors_and_deletes_the_file(state_path):
+    state = saved_state(state_path)
+    state.clear()
+    assert not os.path.exists(state_path)
+    assert state.data["projectors"] == {}
+    assert state.save()  # Written again even though it was written before the clear
+    state.clear()
+    state.clear()  # No file left to delete
+
+
+def test_failed_write_keeps_the_previous_file_and_leaves_no_temp_file(state_path, monkeypatch, capsys):
+    state = saved_state(state_path)
+    before = open(state_path, encoding='utf-8').read()
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(persistence.os, "replace", fail)
+    state.bind_projector("4", 102)
+    assert not state.save()
+    assert "Could not write state file" in capsys.readouterr().out
+    assert open(state_path, encoding='utf-8').read() == before
+    assert os.listdir(os.path.dirname(state_path)) == ["state.json"]
+
+    monkeypatch.undo()
+    assert state.save()  # Not mistaken for already written
+    assert WarmState(state_path).load()["projectors"] == {"2": 100, "3": 101, "4": 102}
+
+
+def test_atomic_write_replaces_the_whole_file(tmp_path):
+    path = str(tmp_path / "state.json")
+    atomic_write_text(path, "a much longer first version")
+    atomic_write_text(path, "short")
+    assert open(path, encoding='utf-8').read() == "short"
+    assert os.listdir(str(tmp_path)) == ["state.json"]
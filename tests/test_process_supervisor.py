@@ -0,0 +1,80 @@
+import threading
+
+from process_supervisor import SupervisedProcess
+
+
+class FakeProcess:
+    def __init__(self, pid):
+        self.pid = pid
+        self.exited = threading.Event()
+
+    def wait(self, timeout=None):
+        self.exited.wait(timeout)
+
+
+class FakeProcessTable:
+    """Stands in for psutil.process_iter and os.startfile; counts the scans."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.running = None
+        self.scans = 0
+        self.launches = []
+
+    def find(self):
+        self.scans += 1
+        return self.running
+
+    def launch(self, path):
+        self.launches.append(self.clock())
+        self.running = FakeProcess(100 + len(self.launches))
+
+
+def supervised(table, clock, launch_path="obsbot.lnk"):
+    return SupervisedProcess("OBSBOT Center", launch_path, "obsbot", min_restart_interval=30,
+                             max_restart_interval=120, launcher=table.launch, finder=table.find, clock=clock)
+
+
+def test_no_launch_path_scans_only_once_per_restart_interval(clock):
+    table = FakeProcessTable(clock)
+    process = supervised(table, clock, launch_path="")
+    for _ in range(10):
+        assert not process.ensure_running()
+        clock.now += 5
+    assert table.scans == 2  # At 0 s and 30 s, not every cycle
+    assert table.launches == []
+
+    table.running = FakeProcess(7)  # Started by hand
+    clock.now += 30
+    assert process.ensure_running()
+    assert process.process.pid == 7
+    table.running.exited.set()
+
+
+def test_running_process_is_checked_without_scanning(clock):
+    table = FakeProcessTable(clock)
+    process = supervised(table, clock)
+    assert process.ensure_running()
+    scans = table.scans
+    for _ in range(5):
+        assert process.ensure_running()
+    assert table.scans == scans
+    table.running.exited.set()
+
+
+def test_restarts_back_off_while_the_process_keeps_dying(clock):
+    table = FakeProcessTable(clock)
+    process = supervised(table, clock)
+    assert process.ensure_running()
+    for _ in range(4):
+        launches = len(table.launches)
+        table.running.exited.set()
+        assert process._exited.wait(1)
+        table.running = None
+        while len(table.launches) == launches:
+            clock.now += 1
+            process.ensure_running()
+    gaps = [later - earlier for earlier, later in zip(table.launches, table.launches[1:])]
+    assert gaps == [30, 60, 120, 120]
+    assert process.restarts == 4
+    table.running.exited.set()
@@ -0,0 +1,83 @@
+from persistence import WarmState
+from projector_registry import ProjectorRegistry
+
+OBS_PID = 4242
+
+
+class FakeWindowState:
+    """Windows by hwnd: (owning PID, rect). Stands in for Win32WindowState."""
+
+    def __init__(self):
+        self.windows = {}
+
+    def is_window(self, hwnd):
+        return hwnd in self.windows
+
+    def get_window_pid(self, hwnd):
+        return self.windows[hwnd][0]
+
+    def get_window_rect(self, hwnd):
+        return self.windows[hwnd][1]
+
+
+def registry(tmp_path, backend=None, full_scan_every=30):
+    return ProjectorRegistry(WarmState(str(tmp_path / "state.json")), owner_pid=lambda: OBS_PID,
+                             backend=backend or FakeWindowState(), full_scan_every=full_scan_every)
+
+
+def test_bindings_are_mirrored_into_the_warm_state(tmp_path):
+    projectors = registry(tmp_path)
+    projectors.bind("2", 100, "Fullscreen Projector (Program)")
+    projectors.bind("3", 101)
+    assert projectors.bound_hwnds() == {100, 101}
+    assert projectors.warm_state.data["projectors"] == {"2": 100, "3": 101}
+
+    projectors.bind("2", 102)  # Reopened: the key moves to the new window
+    projectors.bind("4", 101)  # The window was reassigned: its old key loses it
+    assert projectors.bound_hwnds() == {101, 102}
+    assert projectors.warm_state.data["projectors"] == {"2": 102, "4": 101}
+
+    projectors.unbind("4")
+    projectors.unbind("missing")
+    assert projectors.bound_hwnds() == {102}
+    assert projectors.warm_state.data["projectors"] == {"2": 102}
+
+
+def test_adopt_takes_over_saved_bindings(tmp_path):
+    projectors = registry(tmp_path)
+    projectors.adopt({"2": 100, "3": 101})
+    assert projectors.bound_hwnds() == {100, 101}
+    assert projectors.warm_state.data["projectors"] == {"2": 100, "3": 101}
+
+
+def test_live_windows_drops_closed_and_reused_windows(tmp_path):
+    backend = FakeWindowState()
+    backend.windows = {100: (OBS_PID, (0, 0, 1920, 1080)), 101: (OBS_PID, (1920, 0, 3840, 1080)),
+                       102: (999, (0, 0, 10, 10))}
+    projectors = registry(tmp_path, backend)
+    projectors.bind("2", 100, "Fullscreen Projector (Program)")
+    projectors.bind("3", 101, "Fullscreen Projector (Scene) - Stage")
+    projectors.bind("4", 102, "Fullscreen Projector (Scene) - Lyrics")  # hwnd now used by another process
+    projectors.bind("5", 103, "Fullscreen Projector (Scene) - Gone")  # closed
+
+    assert projectors.live_windows() == [
+        {'hwnd': 100, 'title': "Fullscreen Projector (Program)", 'rect': (0, 0, 1920, 1080), 'key': "2"},
+        {'hwnd': 101, 'title': "Fullscreen Projector (Scene) - Stage", 'rect': (1920, 0, 3840, 1080), 'key': "3"},
+    ]
+    assert projectors.bound_hwnds() == {100, 101}
+    assert projectors.warm_state.data["projectors"] == {"2": 100, "3": 101}
+
+
+def test_full_scan_when_a_key_is_unbound_and_periodically(tmp_path):
+    projectors = registry(tmp_path, full_scan_every=3)
+    keys = ["2", "3"]
+    assert projectors.needs_full_scan(keys)  # Nothing bound yet
+    projectors.bind("2", 100)
+    projectors.bind("3", 101)
+    assert [projectors.needs_full_scan(keys) for _ in range(6)] == [False, False, True, False, False, True]
+
+    projectors.needs_full_scan(keys)
+    projectors.unbind("3")
+    assert projectors.needs_full_scan(keys)
+    projectors.bind("3", 102)
+    assert [projectors.needs_full_scan(keys) for _ in range(3)] == [False, False, True]
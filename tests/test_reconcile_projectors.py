@@ -0,0 +1,19 @@
+import pytest
+
+pytest.importorskip("win32gui")
+
+import obsStart as app
+
+
+def test_dry_run_leaves_registry_and_availability_alone(sim):
+    restored = sim.desktop.open_projector("Fullscreen Projector (Program)", 0)  # Opened by OBS, not registered yet
+    summary = app.AVAILABILITY.summary()
+
+    assert app.reconcile_projectors(app.WEBSOCKET_CLIENT, dry_run=True)
+    assert app.REGISTRY.bound_hwnds() == set()
+    assert app.AVAILABILITY.summary() == summary
+    assert sim.desktop.projector_hwnds() == [restored]
+
+    assert app.reconcile_projectors(app.WEBSOCKET_CLIENT)
+    assert restored in app.REGISTRY.bound_hwnds()
+    assert len(sim.desktop.projector_hwnds()) == len(app.CONFIG)
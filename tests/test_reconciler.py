@@ -0,0 +1,159 @@
+import pytest
+
+from reconciler import CLOSE, MONITOR_OFF, MOVE, OPEN, SKIP, plan_actions, title_matches
+
+WIDTH, HEIGHT = 1920, 1080
+
+
+def obs_monitor(index):
+    return {'monitorIndex': index, 'monitorName': f"Display {index + 1}", 'monitorPositionX': index * WIDTH,
+            'monitorPositionY': 0, 'monitorWidth': WIDTH, 'monitorHeight': HEIGHT}
+
+
+def screen(index, active=True):
+    return {'rect': (index * WIDTH, 0, (index + 1) * WIDTH, HEIGHT), 'is_active': active}
+
+
+def program(index):
+    return {"type": "program", "title": "Program (Projector)", "monitor_x": index * WIDTH, "monitor_y": 0}
+
+
+def scene(name, index):
+    return {"type": "scene", "scene": name, "title": f"Scene Projector ({name})", "monitor_x": index * WIDTH,
+            "monitor_y": 0}
+
+
+def window(hwnd, title, index, key=None):
+    x = index * WIDTH
+    return {'hwnd': hwnd, 'title': title, 'rect': (x, 0, x + WIDTH, HEIGHT), 'key': key}
+
+
+PROGRAM = "Fullscreen Projector (Program)"
+
+
+def scene_title(name):
+    return f"Fullscreen Projector (Scene) - {name}"
+
+
+OBS_MONITORS = [obs_monitor(i) for i in range(3)]
+SCREENS = [screen(i) for i in range(3)]
+
+# (desired, windows, monitors, obs_monitors, scenes, expected assignments, expected (kind, key, hwnd) actions)
+CASES = {
+    "registered window wins over a title match": (
+        {"a": scene("Stage", 1)},
+        [window(1, scene_title("Stage"), 1), window(2, "Renamed by hand", 1, key="a")],
+        SCREENS, OBS_MONITORS, None,
+        {"a": 2}, [(CLOSE, None, 1)]),
+    "placed window wins over an earlier misplaced one": (
+        {"a": scene("Stage", 1)},
+        [window(1, scene_title("Stage"), 2), window(2, scene_title("Stage"), 1)],
+        SCREENS, OBS_MONITORS, None,
+        {"a": 2}, []),
+    "same scene on two monitors gets one window each": (
+        {"a": scene("Stage", 1), "b": scene("Stage", 2)},
+        [window(1, scene_title("Stage"), 2), window(2, scene_title("Stage"), 1)],
+        SCREENS, OBS_MONITORS, None,
+        {"a": 2, "b": 1}, []),
+    "placed window is kept": (
+        {"p": program(0)},
+        [window(1, PROGRAM, 0)],
+        SCREENS, OBS_MONITORS, None,
+        {"p": 1}, []),
+    "misplaced window is moved": (
+        {"p": program(0)},
+        [window(1, PROGRAM, 2)],
+        SCREENS, OBS_MONITORS, None,
+        {"p": 1}, [(MOVE, "p", 1)]),
+    "missing projector is opened": (
+        {"p": program(0), "a": scene("Stage", 1)},
+        [window(1, PROGRAM, 0)],
+        SCREENS, OBS_MONITORS, {"Stage"},
+        {"p": 1}, [(OPEN, "a", None)]),
+    "monitor off is skipped": (
+        {"a": scene("Stage", 1)},
+        [],
+        [screen(0), screen(1, active=False), screen(2)], OBS_MONITORS, None,
+        {}, [(SKIP, "a", None)]),
+    "missing scene is skipped": (
+        {"a": scene("Stage", 1)},
+        [],
+        SCREENS, OBS_MONITORS, {"Other"},
+        {}, [(SKIP, "a", None)]),
+    "duplicate on a managed screen is closed": (
+        {"p": program(0)},
+        [window(1, PROGRAM, 0), window(2, PROGRAM, 0)],
+        SCREENS, OBS_MONITORS, None,
+        {"p": 1}, [(CLOSE, None, 2)]),
+    "duplicate on an unmanaged screen is left alone": (
+        {"p": program(0)},
+        [window(1, PROGRAM, 0), window(2, PROGRAM, 2)],
+        SCREENS, OBS_MONITORS, None,
+        {"p": 1}, []),
+    "unrelated projector on a managed screen is left alone": (
+        {"p": program(0)},
+        [window(1, PROGRAM, 0), window(2, scene_title("Lyrics"), 0)],
+        SCREENS, OBS_MONITORS, None,
+        {"p": 1}, []),
+    "without the OBS monitor list a window is kept wherever it is": (
+        {"p": program(0)},
+        [window(1, PROGRAM, 2)],
+        SCREENS, None, None,
+        {"p": 1}, []),
+    "without the OBS monitor list a missing projector opens on the primary": (
+        {"a": scene("Stage", 1)},
+        [],
+        SCREENS, None, None,
+        {}, [(OPEN, "a", None)]),
+    "scene named like the program output doesn't claim the program key": (
+        {"p": program(0), "s": scene("S", 1)},
+        [window(5, scene_title("Program Feed"), 0)],
+        SCREENS, OBS_MONITORS, None,
+        {}, [(OPEN, "p", None), (OPEN, "s", None)]),
+}
+
+
+@pytest.mark.parametrize("desired, windows, monitors, obs_monitors, scenes, assignments, actions",
+                         CASES.values(), ids=CASES.keys())
+def test_plan_actions(desired, windows, monitors, obs_monitors, scenes, assignments, actions):
+    plan = plan_actions(desired, windows, monitors, obs_monitors, scenes)
+    assert plan.assignments == assignments
+    assert [(action.kind, action.key, action.hwnd) for action in plan.actions] == actions
+
+
+def test_plan_reasons_and_targets():
+    desired = {"p": program(0), "a": scene("Stage", 1), "b": scene("Gone", 2)}
+    windows = [window(1, PROGRAM, 2)]
+    monitors = [screen(0), screen(1, active=False), screen(2)]
+    actions = {action.key: action for action in plan_actions(desired, windows, monitors, OBS_MONITORS, {"Stage"}).actions}
+    assert actions["p"].monitor_index == 0
+    assert actions["p"].rect == (0, 0, WIDTH, HEIGHT)
+    assert actions["p"].reason == "projector is on monitor 2 instead of monitor 0"
+    assert actions["a"].reason == MONITOR_OFF
+    assert actions["b"].reason == "scene 'Gone' does not exist in OBS"
+
+    opened = plan_actions({"a": scene("Stage", 1)}, [], [], None).actions[0]
+    assert opened.monitor_index == 0
+    assert "using primary" in opened.reason
+
+
+@pytest.mark.parametrize("title, matches", [
+    ("Fullscreen Projector (Scene) - S", True),
+    ("Windowed Projector (Scene) - s", True),
+    ("Fullscreen Projector (Scene) - Stage", False),
+    ("Fullscreen Projector (Program)", False),
+])
+def test_scene_config_matches_only_its_own_scene(title, matches):
+    assert title_matches(scene("S", 1), title) is matches
+
+
+@pytest.mark.parametrize("title, matches", [
+    ("Fullscreen Projector (Program)", True),
+    ("Windowed Projector (Program)", True),
+    ("Fullscreen Projector (Scene) - Program Feed", False),
+    ("Windowed Projector (Scene) - Stage (Projector (Program))", False),
+    ("Windowed Projector (Source) - Program Camera", False),
+    ("Fullscreen Projector (Preview)", False),
+])
+def test_program_config_matches_only_the_program_projector(title, matches):
+    assert title_matches(program(0), title) is matches
@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("obsws_python")
+
+from obs_emulator import ObsEmulator
+from obsws_python import ReqClient
+from scene_catalog import SceneCatalog
+from ws_requests import RequestSession
+
+
+def wait_until(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def obs():
+    emulator = ObsEmulator(port=0, password="secret", scenes=("Screen 1", "Screen 2"))
+    emulator.start()
+    yield emulator
+    emulator.stop()
+
+
+@pytest.fixture
+def session(obs):
+    session = RequestSession(lambda: ReqClient(host="127.0.0.1", port=obs.port, password="secret", timeout=3))
+    yield session
+    session.close()
+
+
+def scene_list_requests(obs):
+    return next((row['count'] for row in obs.summary() if row['request_type'] == "GetSceneList"), 0)
+
+
+def test_scene_events_keep_the_catalog_current(obs, session):
+    switched = threading.Event()
+    catalog = SceneCatalog(on_collection_changed=switched.set)
+    assert catalog.start_events("127.0.0.1", obs.port, "secret")
+    try:
+        assert catalog.scene_names(session) == {"Screen 1", "Screen 2"}
+        assert scene_list_requests(obs) == 1
+
+        obs.create_scene("Lobby")
+        assert wait_until(lambda: "Lobby" in catalog.scene_names(session))
+        obs.remove_scene("Screen 1")
+        assert wait_until(lambda: "Screen 1" not in catalog.scene_names(session))
+        session.call("SetSceneName", {"sceneName": "Screen 2", "newSceneName": "Stage"})
+        assert wait_until(lambda: catalog.scene_names(session) == {"Stage", "Lobby"})
+        # The events alone kept it current
+        assert scene_list_requests(obs) == 1
+
+        obs.switch_collection("Sunday", ["Main", "Side"])
+        assert switched.wait(3)
+        assert catalog.scene_names(session) == {"Main", "Side"}
+        assert scene_list_requests(obs) == 2
+    finally:
+        catalog.stop_events()
+
+
+def test_catalog_reloads_while_events_are_down(obs, session):
+    catalog = SceneCatalog()
+    assert catalog.scene_names(session) == {"Screen 1", "Screen 2"}
+    obs.create_scene("Lobby")
+    assert catalog.scene_names(session) == {"Screen 1", "Screen 2", "Lobby"}
+    assert scene_list_requests(obs) == 2
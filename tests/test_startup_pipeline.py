@@ -0,0 +1,98 @@
+import threading
+
+import pytest
+
+from startup_pipeline import DONE, FAILED, SKIPPED, StageFailed, StartupPipeline
+
+
+def test_stages_get_the_results_they_require_in_order():
+    pipeline = StartupPipeline()
+    finished = []
+
+    def stage(name, value):
+        def run(*args):
+            finished.append(name)
+            return (value, args)
+        return run
+
+    pipeline.add("obs", stage("obs", 1))
+    pipeline.add("monitors", stage("monitors", 2))
+    pipeline.add("websocket", stage("websocket", 3), requires=("obs",))
+    pipeline.add("projectors", stage("projectors", 4), requires=("websocket", "monitors"))
+    assert pipeline.run()
+
+    assert pipeline.results["projectors"] == (4, ((3, ((1, ()),)), (2, ())))
+    assert finished.index("websocket") > finished.index("obs")
+    assert finished.index("projectors") > max(finished.index("websocket"), finished.index("monitors"))
+    assert pipeline.timings["projectors"].started >= pipeline.timings["websocket"].finished
+
+
+def test_independent_stages_overlap():
+    all_running = threading.Barrier(3, timeout=2)  # Only passes if all three stages run at once
+
+    def stage():
+        all_running.wait()
+
+    pipeline = StartupPipeline(max_workers=4)
+    for name in ("obs", "obsbot", "monitors"):
+        pipeline.add(name, stage)
+    assert pipeline.run()
+    timings = [pipeline.timings[name] for name in ("obs", "obsbot", "monitors")]
+    assert max(timing.started for timing in timings) < min(timing.finished for timing in timings)
+
+
+def test_failed_stage_skips_everything_downstream_but_nothing_else():
+    ran = []
+    pipeline = StartupPipeline()
+
+    def fail():
+        raise StageFailed("OBS did not start")
+
+    pipeline.add("obs", fail)
+    pipeline.add("monitors", lambda: ran.append("monitors"))
+    pipeline.add("websocket", lambda obs: ran.append("websocket"), requires=("obs",))
+    pipeline.add("projectors", lambda ws, monitors: ran.append("projectors"), requires=("websocket", "monitors"))
+    pipeline.add("verify", lambda projectors: ran.append("verify"), requires=("projectors",))
+    assert not pipeline.run()
+
+    assert ran == ["monitors"]
+    statuses = {name: timing.status for name, timing in pipeline.timings.items()}
+    assert statuses == {"obs": FAILED, "monitors": DONE, "websocket": SKIPPED, "projectors": SKIPPED,
+                        "verify": SKIPPED}
+    assert str(pipeline.timings["obs"].error) == "OBS did not start"
+    assert pipeline.timings["websocket"].error == "obs"
+    assert pipeline.timings["verify"].error == "projectors"
+    assert "projectors" not in pipeline.results
+
+
+def test_stages_not_started_when_a_stop_is_requested_are_skipped():
+    stop = threading.Event()
+    pipeline = StartupPipeline()
+    pipeline.add("obs", stop.set)
+    pipeline.add("websocket", lambda obs: None, requires=("obs",))
+    assert not pipeline.run(should_stop=stop.is_set)
+    assert pipeline.timings["obs"].status == DONE
+    assert pipeline.timings["websocket"].status == SKIPPED
+    assert pipeline.timings["websocket"].error is None
+
+
+def test_stages_must_be_added_after_what_they_require():
+    pipeline = StartupPipeline()
+    pipeline.add("obs", lambda: None)
+    with pytest.raises(ValueError):
+        pipeline.add("obs", lambda: None)
+    with pytest.raises(ValueError):
+        pipeline.add("projectors", lambda ws: None, requires=("websocket",))
+
+
+def test_report_lists_every_stage(capsys):
+    pipeline = StartupPipeline()
+    pipeline.add("obs", lambda: None)
+    pipeline.add("monitors", lambda: 1 / 0)
+    pipeline.add("projectors", lambda obs, monitors: None, requires=("obs", "monitors"))
+    pipeline.run()
+    pipeline.print_report()
+    report = capsys.readouterr().out
+    assert "✅ obs" in report
+    assert "❌ monitors" in report and "division by zero" in report
+    assert "⏭️ projectors" in report and "after monitors failed" in report
@@ -0,0 +1,82 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("win32gui")
+
+import psutil
+
+import obsStart as app
+import simulation
+from persistence import WarmState
+from projector_registry import ProjectorRegistry
+
+
+@pytest.fixture
+def previous_run(sim):
+    """A launcher that opened the projectors and recorded its state, then exited."""
+    assert app.reconcile_projectors(app.WEBSOCKET_CLIENT)
+    app.OBS_PROCESS = psutil.Process()  # The state names this test process as OBS, so it can be looked up
+    app.record_warm_state()
+    app.OBS_PROCESS = None
+    app.WARM_STATE = WarmState(app.WARM_STATE.path)
+    app.REGISTRY = ProjectorRegistry(app.WARM_STATE, owner_pid=lambda: os.getpid(), backend=sim.desktop)
+    return sim
+
+
+def edit_state(**fields):
+    with open(app.WARM_STATE.path, encoding='utf-8') as f:
+        state = json.load(f)
+    state.update(fields)
+    with open(app.WARM_STATE.path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+
+
+def test_unchanged_setup_is_resumed(previous_run):
+    projectors = set(previous_run.desktop.projector_hwnds())
+    assert app.try_warm_resume()
+    assert app.OBS_PROCESS.pid == os.getpid()
+    assert app.REGISTRY.bound_hwnds() == projectors
+
+
+def test_obs_restarted_under_another_pid(previous_run):
+    started = psutil.Process().create_time()
+    other = next(proc for proc in psutil.process_iter(['create_time'])
+                 if proc.info['create_time'] and abs(proc.info['create_time'] - started) > 1)
+    edit_state(obs_pid=other.pid)
+    assert not app.try_warm_resume()
+
+
+def test_obs_pid_reused_by_a_newer_process(previous_run):
+    edit_state(obs_create_time=psutil.Process().create_time() - 3600)
+    assert not app.try_warm_resume()
+
+
+def test_obs_no_longer_running(previous_run):
+    pids = set(psutil.pids())
+    edit_state(obs_pid=next(pid for pid in range(4_000_000, 5_000_000) if pid not in pids))
+    assert not app.try_warm_resume()
+
+
+def test_config_changed(previous_run):
+    app.CONFIG = dict(app.CONFIG, extra={"type": "program", "title": "Extra", "monitor_x": 0, "monitor_y": 0})
+    assert not app.try_warm_resume()
+
+
+def test_monitor_layout_changed(previous_run, monkeypatch):
+    monkeypatch.setattr(app, "get_monitor_fingerprint", lambda: "another layout")
+    assert not app.try_warm_resume()
+
+
+def test_recorded_projector_was_closed(previous_run):
+    previous_run.desktop.PostMessage(previous_run.desktop.projector_hwnds()[0], simulation.WM_CLOSE, 0, 0)
+    assert not app.try_warm_resume()
+
+
+@pytest.mark.parametrize("content", ["", "{\"obs_pid\": ", "[]"])
+def test_corrupt_state_file(previous_run, content):
+    with open(app.WARM_STATE.path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    assert not app.try_warm_resume()
+    assert app.REGISTRY.bound_hwnds() == set()
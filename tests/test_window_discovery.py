@@ -0,0 +1,99 @@
+from window_discovery import WindowDiscovery
+
+OBS_PID = 100
+
+
+class FakeDesktop:
+    """
+    A discovery backend over a list of windows. Records which windows had their title, class or
+    visibility read; reading anything but the owner of a hung window fails the test, like
+    GetWindowText blocking on a hung window would.
+    """
+
+    def __init__(self):
+        self.windows = {}  # hwnd -> dict(thread, pid, title, cls, visible, hung)
+        self.enumerations = 0
+        self.touched = set()
+
+    def add(self, hwnd, thread, pid, title="", cls="Qt5152QWindowIcon", visible=True, hung=False):
+        self.windows[hwnd] = dict(thread=thread, pid=pid, title=title, cls=cls, visible=visible, hung=hung)
+
+    def _read(self, hwnd):
+        window = self.windows[hwnd]
+        assert not window['hung'], f"read from hung window {hwnd}"
+        self.touched.add(hwnd)
+        return window
+
+    def enum_windows(self):
+        self.enumerations += 1
+        return list(self.windows)
+
+    def enum_thread_windows(self, thread_id):
+        return [hwnd for hwnd, window in self.windows.items() if window['thread'] == thread_id]
+
+    def get_window_thread_process_id(self, hwnd):
+        window = self.windows[hwnd]
+        return window['thread'], window['pid']
+
+    def is_window_visible(self, hwnd):
+        return self._read(hwnd)['visible']
+
+    def get_window_title(self, hwnd):
+        return self._read(hwnd)['title']
+
+    def get_class_name(self, hwnd):
+        return self._read(hwnd)['cls']
+
+
+def desktop_with_obs():
+    desktop = FakeDesktop()
+    desktop.add(1, thread=7, pid=OBS_PID, title="OBS 31.0.0 - Profile: Untitled")
+    desktop.add(2, thread=7, pid=OBS_PID, title="Fullscreen Projector (Program)")
+    desktop.add(3, thread=7, pid=OBS_PID, title="hidden helper", visible=False)
+    desktop.add(4, thread=8, pid=OBS_PID, title="Windowed Projector (Scene) - Stage")
+    desktop.add(10, thread=50, pid=200, title="Not responding", hung=True)
+    for hwnd in range(11, 40):
+        desktop.add(hwnd, thread=60 + hwnd, pid=300 + hwnd, title=f"Other app {hwnd}")
+    return desktop
+
+
+def test_only_the_processes_own_visible_windows_are_described():
+    desktop = desktop_with_obs()
+    discovery = WindowDiscovery(desktop)
+    windows = discovery.windows(OBS_PID)
+    assert sorted(window['hwnd'] for window in windows) == [1, 2, 4]
+    assert {window['title'] for window in windows} >= {"Fullscreen Projector (Program)"}
+    assert desktop.touched <= {1, 2, 3, 4}
+
+
+def test_threads_are_learned_once_and_reused():
+    desktop = desktop_with_obs()
+    discovery = WindowDiscovery(desktop)
+    for _ in range(5):
+        discovery.windows(OBS_PID)
+    assert desktop.enumerations == 1
+
+    desktop.add(5, thread=8, pid=OBS_PID, title="Fullscreen Projector (Scene) - Lobby")
+    assert 5 in {window['hwnd'] for window in discovery.windows(OBS_PID)}
+    assert desktop.enumerations == 1
+
+
+def test_threads_are_learned_again_after_the_process_recreates_its_ui():
+    desktop = desktop_with_obs()
+    discovery = WindowDiscovery(desktop)
+    discovery.windows(OBS_PID)
+    for hwnd in (1, 2, 3, 4):
+        del desktop.windows[hwnd]
+    assert discovery.windows(OBS_PID) == []  # Remembered threads are empty: forgotten
+    desktop.add(20, thread=9, pid=OBS_PID, title="Fullscreen Projector (Program)")
+    assert [window['hwnd'] for window in discovery.windows(OBS_PID)] == [20]
+    assert desktop.enumerations == 2
+
+
+def test_unknown_process_has_no_windows_and_is_not_cached():
+    desktop = desktop_with_obs()
+    discovery = WindowDiscovery(desktop)
+    assert discovery.windows(999) == []
+    assert discovery.windows(999) == []
+    assert desktop.enumerations == 2
+    assert desktop.touched == set()
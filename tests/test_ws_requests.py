@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+pytest.importorskip("obsws_python")
+
+from obs_emulator import ObsEmulator
+from obsws_python import ReqClient
+from obsws_python.error import OBSSDKError, OBSSDKRequestError, OBSSDKTimeoutError
+from ws_requests import RequestSession
+
+
+@pytest.fixture
+def obs():
+    emulator = ObsEmulator(port=0)
+    emulator.start()
+    yield emulator
+    emulator.stop()
+
+
+@pytest.fixture
+def session(obs):
+    connections = []
+
+    def connect():
+        client = ReqClient(host="127.0.0.1", port=obs.port, password="", timeout=3)
+        connections.append(client)
+        return client
+
+    session = RequestSession(connect, default_deadline=0.3, deadlines={}, slow_threshold=10)
+    session.connections = connections
+    yield session
+    session.close()
+
+
+def test_timed_out_call_is_not_retried_and_its_late_reply_is_not_seen(obs, session):
+    session.call("GetVersion")
+    obs.set_latency("GetStats", 0.6)
+    started = time.perf_counter()
+    with pytest.raises(OBSSDKTimeoutError):
+        session.call("GetStats")
+    assert time.perf_counter() - started < 0.55  # One deadline, not two
+    assert session.metrics.timeouts == {"GetStats": 1}
+    assert session.metrics.retries == {}
+
+    obs.set_latency("GetStats", 0)
+    time.sleep(0.4)  # The late reply would have arrived by now
+    started = time.perf_counter()
+    assert session.call("GetMonitorList")["monitors"]
+    assert time.perf_counter() - started < 0.3
+    assert len(session.connections) == 2  # Reconnected after the timeout
+
+
+def test_latency_is_recorded_per_request_type(obs, session):
+    obs.set_latency("GetStats", 0.05)
+    for _ in range(5):
+        session.call("GetStats")
+        session.call("GetVersion")
+    rows = {row['request_type']: row for row in session.metrics.summary()}
+    assert rows["GetStats"]['count'] == 5
+    assert rows["GetStats"]['p50_ms'] >= 40
+    assert rows["GetVersion"]['p50_ms'] < rows["GetStats"]['p50_ms']
+
+
+def test_only_idempotent_requests_are_retried_after_a_dropped_connection(obs, session):
+    session.call("GetVersion")
+    obs.drop_next()
+    assert session.call("GetSceneList")["scenes"]
+    assert session.metrics.retries == {"GetSceneList": 1}
+
+    obs.drop_next()
+    with pytest.raises(OBSSDKError):
+        session.call("CreateScene", {"sceneName": "Lobby"})
+    assert "CreateScene" not in session.metrics.retries
+
+
+def test_rejected_request_raises_with_the_status_code(obs, session):
+    obs.set_error("OpenSourceProjector", 600)
+    with pytest.raises(OBSSDKRequestError) as error:
+        session.call("OpenSourceProjector", {"sourceName": "Screen 1", "monitorIndex": 0})
+    assert error.value.code == 600
+    assert session.metrics.errors == {"OpenSourceProjector": 1}
@@ -0,0 +1,115 @@
+import ctypes
+import threading
+from ctypes import wintypes
+
+TITLE_LENGTH = 256
+
+
+class Win32DiscoveryBackend:
+    """
+    The user32 calls needed for window discovery. None of them sends a message to the
+    window: titles come from InternalGetWindowText, which reads the title Windows keeps
+    for the window instead of asking its (possibly hung) thread the way GetWindowText does.
+    """
+
+    def __init__(self):
+        # Created here rather than at import, so WindowDiscovery can be used with other backends off Windows
+        enum_proc = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+        user32 = ctypes.WinDLL("user32", use_last_error=True)
+        user32.EnumWindows.argtypes = [enum_proc, wintypes.LPARAM]
+        user32.EnumThreadWindows.argtypes = [wintypes.DWORD, enum_proc, wintypes.LPARAM]
+        user32.GetWindowThreadProcessId.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.DWORD)]
+        user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+        user32.InternalGetWindowText.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+        user32.GetClassNameW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+        user32.IsWindowVisible.argtypes = [wintypes.HWND]
+        user32.IsWindowVisible.restype = wintypes.BOOL
+        self.user32 = user32
+        # Buffers and the enumeration callback are created once and reused under the lock
+        self._lock = threading.Lock()
+        self._found = []
+        self._collect = enum_proc(self._collect_hwnd)
+        self._pid = wintypes.DWORD()
+        self._text = ctypes.create_unicode_buffer(TITLE_LENGTH)
+
+    def _collect_hwnd(self, hwnd, lparam):
+        self._found.append(hwnd)
+        return True
+
+    def enum_windows(self):
+        with self._lock:
+            self._found = []
+            self.user32.EnumWindows(self._collect, 0)
+            return self._found
+
+    def enum_thread_windows(self, thread_id):
+        with self._lock:
+            self._found = []
+            self.user32.EnumThreadWindows(thread_id, self._collect, 0)
+            return self._found
+
+    def get_window_thread_process_id(self, hwnd):
+        with self._lock:
+            thread_id = self.user32.GetWindowThreadProcessId(hwnd, ctypes.byref(self._pid))
+            return thread_id, self._pid.value
+
+    def is_window_visible(self, hwnd):
+        return bool(self.user32.IsWindowVisible(hwnd))
+
+    def get_window_title(self, hwnd):
+        with self._lock:
+            length = self.user32.InternalGetWindowText(hwnd, self._text, TITLE_LENGTH)
+            return self._text.value[:length]
+
+    def get_class_name(self, hwnd):
+        with self._lock:
+            length = self.user32.GetClassNameW(hwnd, self._text, TITLE_LENGTH)
+            return self._text.value[:length]
+
+
+class WindowDiscovery:
+    """
+    Finds the visible top-level windows of a given process without touching anyone else's.
+
+    The first lookup for a PID walks all top-level windows once, reading only each window's
+    owning thread and process, and remembers which threads of that process own windows.
+    Later lookups enumerate just those threads, so the cost depends on how many windows the
+    process has. If the remembered threads have no windows any more (the process restarted
+    its UI), the threads are learned again on the next lookup.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or Win32DiscoveryBackend()
+        self._threads = {}  # pid -> thread ids owning top-level windows
+
+    def _learn_threads(self, pid):
+        threads = set()
+        for hwnd in self.backend.enum_windows():
+            thread_id, window_pid = self.backend.get_window_thread_process_id(hwnd)
+            if window_pid == pid:
+                threads.add(thread_id)
+        if threads:
+            self._threads[pid] = threads
+        return threads
+
+    def forget(self, pid):
+        self._threads.pop(pid, None)
+
+    def process_windows(self, pid):
+        """Returns [{'hwnd', 'title', 'class'}] for the visible top-level windows owned by `pid`."""
+        threads = self._threads.get(pid) or self._learn_threads(pid)
+        hwnds = [hwnd for thread_id in threads for hwnd in self.backend.enum_thread_windows(thread_id)]
+        if not hwnds:
+            self.forget(pid)
+        return [self._describe(hwnd) for hwnd in hwnds if self.backend.is_window_visible(hwnd)]
+
+    def all_windows(self):
+        """Every visible top-level window, for when the owning process isn't known. Still never blocks."""
+        return [self._describe(hwnd) for hwnd in self.backend.enum_windows() if self.backend.is_window_visible(hwnd)]
+
+    def windows(self, pid):
+        """Windows of `pid`, or of every process if `pid` is None."""
+        return self.process_windows(pid) if pid is not None else self.all_windows()
+
+    def _describe(self, hwnd):
+        return {'hwnd': hwnd, 'title': self.backend.get_window_title(hwnd), 'class': self.backend.get_class_name(hwnd)}
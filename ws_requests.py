@@ -0,0 +1,203 @@
+import itertools
+import json
+import time
+
+from websocket import WebSocketException, WebSocketTimeoutException
+from obsws_python.error import OBSSDKError, OBSSDKRequestError, OBSSDKTimeoutError
+
+from histogram import LogHistogram
+
+# Seconds OBS gets to answer a request before the call gives up
+DEFAULT_DEADLINE = 2.0
+DEADLINES = {
+    "OpenVideoMixProjector": 3.0,
+    "OpenSourceProjector": 3.0,
+    "GetSourceScreenshot": 3.0,
+}
+# Calls slower than this are reported as they happen
+SLOW_CALL_THRESHOLD = 0.5
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+def is_idempotent(request_type):
+    """Get* requests only read state and can safely be sent again. Anything else may have taken effect."""
+    return request_type.startswith("Get")
+
+
+class RequestMetrics:
+    """Latency histograms and failure counts per request type. Shared by successive sessions."""
+
+    def __init__(self):
+        self.latency = {}
+        self.timeouts = {}
+        self.errors = {}
+        self.retries = {}
+
+    def record(self, request_type, seconds):
+        histogram = self.latency.get(request_type)
+        if histogram is None:
+            histogram = self.latency[request_type] = LogHistogram(min_value=0.0001, max_value=60.0)
+        histogram.record(seconds)
+
+    def count(self, table, request_type):
+        table[request_type] = table.get(request_type, 0) + 1
+
+    def summary(self):
+        """One row per request type, latencies in milliseconds."""
+        rows = []
+        for request_type in sorted(set(self.latency) | set(self.timeouts) | set(self.errors)):
+            histogram = self.latency.get(request_type)
+            stats = histogram.summary() if histogram else {}
+            rows.append({
+                'request_type': request_type,
+                'count': stats.get('count', 0),
+                'p50_ms': _ms(stats.get('p50')),
+                'p95_ms': _ms(stats.get('p95')),
+                'p99_ms': _ms(stats.get('p99')),
+                'max_ms': _ms(stats.get('max')),
+                'timeouts': self.timeouts.get(request_type, 0),
+                'errors': self.errors.get(request_type, 0),
+                'retries': self.retries.get(request_type, 0),
+            })
+        return rows
+
+    def print_summary(self):
+        rows = self.summary()
+        if not rows:
+            return
+        print("\n⏱️ OBS request latency:")
+        for row in rows:
+            line = f"  → {row['request_type']}: {row['count']} ok"
+            if row['count']:
+                line += f", p50 {row['p50_ms']} ms / p95 {row['p95_ms']} ms / p99 {row['p99_ms']} ms / max {row['max_ms']} ms"
+            if row['timeouts'] or row['errors'] or row['retries']:
+                line += f", {row['timeouts']} timeouts, {row['errors']} errors, {row['retries']} retries"
+            print(line)
+
+
+class RequestSession:
+    """
+    Sends obs-websocket requests with a deadline per call.
+
+    Requests are written straight to the ReqClient's socket with a unique requestId and
+    the reply is matched by that id, so a stray message is never mistaken for the answer
+    (obsws_python itself assumes the next message is the reply). A call that times out
+    closes the connection, so its late reply can't hold up or skew a later call, and is not
+    retried: an OBS too busy to answer would only make the retry wait out a second deadline.
+    Idempotent (Get*) requests are retried once after a dropped connection; other requests
+    are not, since OBS may already have carried them out. A closed connection is re-opened
+    with `connect` on the next call.
+    """
+
+    def __init__(self, connect, client=None, metrics=None, deadlines=None, default_deadline=DEFAULT_DEADLINE,
+                 retries=1, slow_threshold=SLOW_CALL_THRESHOLD, clock=time.perf_counter):
+        self.connect = connect
+        self.client = client
+        self.metrics = metrics if metrics is not None else RequestMetrics()
+        self.deadlines = DEADLINES if deadlines is None else deadlines
+        self.default_deadline = default_deadline
+        self.retries = retries
+        self.slow_threshold = slow_threshold
+        self.clock = clock
+        self._request_ids = itertools.count(1)
+
+    def call(self, request_type, data=None, deadline=None):
+        """
+        Sends one request and returns its responseData (an empty dict if there is none).
+        Raises OBSSDKRequestError if OBS rejected it, OBSSDKTimeoutError if no reply came
+        within the deadline, and OBSSDKError if the connection failed.
+        """
+        payload = {"requestType": request_type}
+        if data:
+            payload["requestData"] = data
+        response = self._send(6, payload, request_type, is_idempotent(request_type), deadline)
+        status = response["requestStatus"]
+        if not status["result"]:
+            self.metrics.count(self.metrics.errors, request_type)
+            raise OBSSDKRequestError(request_type, status["code"], status.get("comment"))
+        return response.get("responseData", {})
+
+    def call_batch(self, requests, deadline=None, halt_on_failure=False):
+        """
+        Sends several requests in one RequestBatch round trip. `requests` are obs-websocket
+        request dicts ({"requestType", "requestData", "inputVariables", "outputVariables"}).
+        Returns the list of per-request results ({"requestType", "requestStatus", "responseData"});
+        failed requests are reported in their requestStatus rather than raised.
+        """
+        idempotent = all(is_idempotent(request["requestType"]) for request in requests)
+        if deadline is None:
+            deadline = max((self.deadlines.get(r["requestType"], self.default_deadline) for r in requests),
+                           default=self.default_deadline)
+        payload = {"haltOnFailure": halt_on_failure, "executionType": 0, "requests": requests}
+        return self._send(8, payload, "RequestBatch", idempotent, deadline).get("results", [])
+
+    def _send(self, op, payload, request_type, idempotent, deadline):
+        if deadline is None:
+            deadline = self.deadlines.get(request_type, self.default_deadline)
+        attempts = 1 + (self.retries if idempotent else 0)
+        for attempt in range(attempts):
+            if attempt:
+                self.metrics.count(self.metrics.retries, request_type)
+            try:
+                return self._exchange(op, payload, request_type, deadline)
+            except OBSSDKTimeoutError:
+                self.metrics.count(self.metrics.timeouts, request_type)
+                print(f"  🐢 {request_type} got no reply within {deadline:.1f}s")
+                self.abort()
+                raise
+            except (WebSocketException, OSError) as e:
+                self.metrics.count(self.metrics.errors, request_type)
+                self.close()
+                if attempt == attempts - 1:
+                    raise OBSSDKError(f"{request_type} failed: connection lost ({e})") from e
+
+    def _exchange(self, op, payload, request_type, deadline):
+        """Sends one op 6 (Request) or op 8 (RequestBatch) message and returns the matching response's data."""
+        if self.client is None:
+            self.client = self.connect()
+        ws = self.client.base_client.ws
+        request_id = f"obsstart-{next(self._request_ids)}"
+        request = {"op": op, "d": dict(payload, requestId=request_id)}
+
+        started = self.clock()
+        expires = started + deadline
+        try:
+            ws.settimeout(deadline)
+            ws.send(json.dumps(request))
+            while True:
+                ws.settimeout(max(expires - self.clock(), 0.001))
+                try:
+                    message = json.loads(ws.recv())
+                except WebSocketTimeoutException as e:
+                    raise OBSSDKTimeoutError(f"{request_type} timed out after {deadline:.1f}s") from e
+                # Skip late replies to earlier calls, events and anything else that isn't our response
+                if message.get("op") == op + 1 and message["d"].get("requestId") == request_id:
+                    break
+        finally:
+            try: ws.settimeout(self.client.base_client.timeout)
+            except Exception: pass
+
+        elapsed = self.clock() - started
+        self.metrics.record(request_type, elapsed)
+        if elapsed >= self.slow_threshold:
+            print(f"  🐢 Slow OBS reply: {request_type} took {elapsed * 1000:.0f} ms")
+        return message["d"]
+
+    def close(self):
+        client, self.client = self.client, None
+        if client:
+            try: client.disconnect()
+            except Exception: pass
+
+    def abort(self):
+        """Drops the connection without the closing handshake, which an unresponsive OBS wouldn't answer."""
+        client, self.client = self.client, None
+        if client:
+            try: client.base_client.ws.shutdown()
+            except Exception: pass
+
+    def disconnect(self):
+        self.close()